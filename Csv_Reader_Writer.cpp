@@ -1,105 +1,455 @@
-#include "include/TurboCodec.hpp"
-
-#include <iostream>
-#include <fstream>
-#include <string>
-#include <sstream>
-
-void trimNewline(std::string &str) {
-    while (!str.empty() && (str.back() == '\\')) {
-        str.pop_back();
-    }
-}
-
-int main() {
-    TurboCodec codec; // Instantiate the TurboCodec class for encoding/decoding operations.
-    std::string input, encodedOutput, decodedOutput; // Strings to hold the input, encoded, and decoded messages.
-    char option; // Variable to store user menu option.
-    double noiseVariance = 0.5; // Initial noise variance value, representing the noise level in the channel.
-    int maxIterations = 20; // Default maximum number of decoding iterations.
-    double convergenceThreshold = 0.001; // Default threshold for detecting convergence in decoding.
-
-    // Όνομα αρχείου εισόδου και εξόδου
-    const std::string inputFileName = "Turbo_Codes_Data.csv";
-    const std::string outputBCJRFileName = "BCJR_Output.csv";
-    const std::string outputMAPFileName = "MAP_Output.csv";
-    const std::string outputSOVAFileName = "SOVA_Output.csv";
-    const std::string outputHYBRIDFileName = "HYBRID_Output.csv";
-
-    // Άνοιγμα του αρχείου εισόδου για ανάγνωση
-    std::ifstream inputFile(inputFileName);
-    if (!inputFile.is_open()) {
-        std::cerr << "Failed to open input file: " << inputFileName << std::endl;
-        return 1;
-    }
-
-    // Άνοιγμα του αρχείου εξόδου για εγγραφή
-    std::ofstream outputFileBCJR(outputBCJRFileName);
-    if (!outputFileBCJR.is_open()) {
-        std::cerr << "Failed to open output file: " << outputBCJRFileName << std::endl;
-        return 1;
-    }
-
-    // Άνοιγμα του αρχείου εξόδου για εγγραφή
-    std::ofstream outputFileMAP(outputMAPFileName);
-    if (!outputFileMAP.is_open()) {
-        std::cerr << "Failed to open output file: " << outputMAPFileName << std::endl;
-        return 1;
-    }
-
-    // Άνοιγμα του αρχείου εξόδου για εγγραφή
-    std::ofstream outputFileSOVA(outputSOVAFileName);
-    if (!outputFileSOVA.is_open()) {
-        std::cerr << "Failed to open output file: " << outputSOVAFileName << std::endl;
-        return 1;
-    }
-
-    std::ofstream outputFileHYBRID(outputHYBRIDFileName);
-    if (!outputFileHYBRID.is_open()) {
-        std::cerr << "Failed to open output file: " << outputHYBRIDFileName << std::endl;
-        return 1;
-    }
-
-    // Διαβάζουμε γραμμή-γραμμή από το αρχείο εισόδου
-    std::string line;
-    std::string dexodedBCJRline;
-    std::string dexodedMAPline;
-    std::string dexodedSOVAline;
-    std::string dexodedHYBRIDline;
-
-    while (std::getline(inputFile, line)) {
-        size_t commaPos = line.find(',');
-        if (commaPos != std::string::npos) {
-            std::string firstColumn = line.substr(0, commaPos);
-            std::string secondColumn = line.substr(commaPos + 1);
-            for (size_t i = 0; i < 5; i++)
-            {
-                secondColumn.pop_back();
-            }
-            trimNewline(secondColumn);
-
-            codec.decode(secondColumn, dexodedBCJRline, noiseVariance, "BCJR");
-            codec.decode(secondColumn, dexodedMAPline, noiseVariance, "MAP");
-            codec.decode(secondColumn, dexodedSOVAline, noiseVariance, "SOVA");
-            codec.decode(secondColumn, dexodedHYBRIDline, noiseVariance, "HYBRID");
-
-            // Γράφουμε τη γραμμή στο αρχείο εξόδου
-            outputFileBCJR << firstColumn << "," << dexodedBCJRline << '\n';
-            outputFileMAP << firstColumn << "," << dexodedMAPline << '\n';
-            outputFileSOVA << firstColumn << "," << dexodedSOVAline << '\n';
-            outputFileHYBRID << firstColumn << "," << dexodedHYBRIDline << '\n';
-            std::cout << firstColumn << " | " << secondColumn << std::endl;
-        }
-    }
-
-    // Κλείνουμε τα αρχεία
-    inputFile.close();
-    outputFileBCJR.close();
-    outputFileMAP.close();
-    outputFileSOVA.close();
-    outputFileHYBRID.close();
-
-    std::cout << "Data Decoded successfully !!! " << std::endl;
-
-    return 0;
-}
+#include "include/TurboCodec.hpp"
+
+#include <iostream>
+#include <fstream>
+#include <string>
+#include <sstream>
+#include <vector>
+#include <memory>
+#include <thread>
+#include <atomic>
+#include <chrono>
+#include <algorithm>
+#include <cstdlib>
+#include <cstring>
+#include <cmath>
+#include <cctype>
+#include <iomanip>
+
+// Algorithms decoded when no --algorithms flag is given.
+const char* const DEFAULT_ALGORITHMS = "BCJR,MAP,SOVA,HYBRID";
+const char* const DEFAULT_INPUT = "Turbo_Codes_Data.csv";
+const size_t DEFAULT_CHUNK_SIZE = 32;      // Frames per worker thread in every batch.
+const size_t OUTPUT_BUFFER_SIZE = 1 << 20; // Bytes buffered by every output file.
+// Columns of a trace file, as written by decode_trace.py.
+const char* const TRACE_HEADER = "frame,algorithm,symbols,iterations,converged,cached,seconds,"
+                                 "half_iteration_seconds,max_abs_llr";
+
+/**
+ * @brief What is printed while decoding.
+ */
+enum OutputMode {
+    MODE_VERBOSE,  // Every decoded line ("id | frame"), as before.
+    MODE_PROGRESS, // A single progress line, updated after every batch.
+    MODE_QUIET     // Errors only.
+};
+
+/**
+ * @brief Command-line options of the decoder.
+ */
+struct Options {
+    std::string inputFileName = DEFAULT_INPUT;
+    std::string outputDirectory = ".";
+    std::vector<std::string> algorithms;
+    size_t threads = std::max(1u, std::thread::hardware_concurrency());
+    size_t chunkSize = DEFAULT_CHUNK_SIZE;
+    OutputMode mode = MODE_VERBOSE;
+    std::string cachePath;  // Decode cache file (empty = no cache).
+    std::string tracePath;  // Per-frame trace file, .csv or JSON lines (empty = no tracing).
+    bool adaptiveNoise = false; // Estimate the noise variance and iteration budget of every frame.
+    HybridSchedule hybridSchedule = HYBRID_ADAPTIVE;
+};
+
+/**
+ * @brief One input frame: the packet id, the encoded frame (a '0'/'1' line, or soft LLRs
+ *        from a binary frame file) and its decoded text per algorithm.
+ */
+struct Frame {
+    std::string packetId;
+    std::string encoded;
+    std::vector<double> llrs;
+    std::vector<std::string> decoded;
+    std::vector<int> iterations;
+    std::vector<FrameTrace> traces; // One per algorithm, when tracing.
+};
+
+void trimNewline(std::string &str) {
+    while (!str.empty() && (str.back() == '\\')) {
+        str.pop_back();
+    }
+}
+
+/**
+ * @brief Splits a comma-separated list of algorithm names, rejecting unknown ones.
+ * @param list The comma-separated list (e.g. "BCJR,SOVA").
+ * @param algorithms Receives the algorithm names.
+ * @return False if the list names an unsupported algorithm.
+ */
+bool parseAlgorithms(const std::string& list, std::vector<std::string>& algorithms) {
+    std::stringstream stream(list);
+    std::string algorithm;
+    while (std::getline(stream, algorithm, ',')) {
+        if (algorithm != "BCJR" && algorithm != "MAP" && algorithm != "LOGMAP" &&
+            algorithm != "SOVA" && algorithm != "HYBRID") {
+            std::cerr << "Unsupported algorithm: " << algorithm << std::endl;
+            return false;
+        }
+        algorithms.push_back(algorithm);
+    }
+    return !algorithms.empty();
+}
+
+void printUsage(const char* program) {
+    std::cerr << "Usage: " << program << " [options] [input]\n"
+              << "  input                  encoded frames CSV file, or LLR frame file (see llr_frames.py)\n"
+              << "                         (default " << DEFAULT_INPUT << ")\n"
+              << "  -o, --output-dir DIR   directory for the <ALGORITHM>_Output.csv files (default .)\n"
+              << "  -a, --algorithms LIST  comma-separated algorithms to decode (BCJR, MAP, LOGMAP, SOVA, HYBRID),\n"
+              << "                         default " << DEFAULT_ALGORITHMS << "\n"
+              << "  -j, --threads N        number of decoding threads (default: all cores)\n"
+              << "  -c, --chunk-size N     frames per thread in every batch (default " << DEFAULT_CHUNK_SIZE << ")\n"
+              << "  --cache PATH           decode cache file; frames decoded by an earlier run are not decoded again\n"
+              << "  --trace PATH           per-frame decoder trace file (.csv, otherwise JSON lines)\n"
+              << "  --adaptive-noise       estimate the noise variance and iteration budget of every frame\n"
+              << "  --hybrid-schedule S    when HYBRID switches between MAP and SOVA: adaptive (SOVA, then MAP\n"
+              << "                         for the frames that stall; default) or fixed (MAP for the first half)\n"
+              << "  -p, --progress         print a progress line instead of every decoded line\n"
+              << "  -q, --quiet            print errors only" << std::endl;
+}
+
+/**
+ * @brief Parses the command line.
+ * @param argc The number of arguments.
+ * @param argv The arguments.
+ * @param options Receives the options.
+ * @return 0 to go on decoding, otherwise the exit code (after printing the usage).
+ */
+int parseArguments(int argc, char* argv[], Options& options) {
+    std::string algorithmList = DEFAULT_ALGORITHMS;
+    bool inputGiven = false;
+    for (int i = 1; i < argc; ++i) {
+        std::string argument = argv[i];
+        bool hasValue = i + 1 < argc;
+        if ((argument == "-a" || argument == "--algorithms") && hasValue) {
+            algorithmList = argv[++i];
+        } else if ((argument == "-o" || argument == "--output-dir") && hasValue) {
+            options.outputDirectory = argv[++i];
+        } else if ((argument == "-j" || argument == "--threads") && hasValue) {
+            options.threads = std::max(1L, std::atol(argv[++i]));
+        } else if ((argument == "-c" || argument == "--chunk-size") && hasValue) {
+            options.chunkSize = std::max(1L, std::atol(argv[++i]));
+        } else if (argument == "--cache" && hasValue) {
+            options.cachePath = argv[++i];
+        } else if (argument == "--trace" && hasValue) {
+            options.tracePath = argv[++i];
+        } else if (argument == "--adaptive-noise") {
+            options.adaptiveNoise = true;
+        } else if (argument == "--hybrid-schedule" && hasValue) {
+            std::string schedule = argv[++i];
+            if (schedule != "fixed" && schedule != "adaptive") {
+                printUsage(argv[0]);
+                return 1;
+            }
+            options.hybridSchedule = schedule == "fixed" ? HYBRID_FIXED : HYBRID_ADAPTIVE;
+        } else if (argument == "-p" || argument == "--progress") {
+            options.mode = MODE_PROGRESS;
+        } else if (argument == "-q" || argument == "--quiet") {
+            options.mode = MODE_QUIET;
+        } else if (argument == "-h" || argument == "--help") {
+            printUsage(argv[0]);
+            return 2;
+        } else if (!argument.empty() && argument[0] != '-' && !inputGiven) {
+            options.inputFileName = argument;
+            inputGiven = true;
+        } else {
+            printUsage(argv[0]);
+            return 1;
+        }
+    }
+    if (!parseAlgorithms(algorithmList, options.algorithms)) {
+        printUsage(argv[0]);
+        return 1;
+    }
+    return 0;
+}
+
+/**
+ * @brief Reads up to `count` frames from the input file, parsed the same way as before.
+ * @param inputFile The input file.
+ * @param count The maximum number of frames to read.
+ * @param batch Receives the frames (resized to the number read).
+ */
+void readBatch(std::ifstream& inputFile, size_t count, std::vector<Frame>& batch) {
+    batch.clear();
+    std::string line;
+    while (batch.size() < count && std::getline(inputFile, line)) {
+        size_t commaPos = line.find(',');
+        if (commaPos != std::string::npos) {
+            Frame frame;
+            frame.packetId = line.substr(0, commaPos);
+            frame.encoded = line.substr(commaPos + 1);
+            for (size_t i = 0; i < 5 && !frame.encoded.empty(); i++)
+            {
+                frame.encoded.pop_back();
+            }
+            trimNewline(frame.encoded);
+            batch.push_back(std::move(frame));
+        }
+    }
+}
+
+/**
+ * @brief Checks whether a file is a binary LLR frame file rather than a CSV file.
+ * @param fileName The input file.
+ * @return True if the file starts with the LLR frame file magic.
+ */
+bool isLLRFrameFile(const std::string& fileName) {
+    std::ifstream file(fileName, std::ios::binary);
+    char magic[4];
+    return file.read(magic, sizeof(magic)) && std::memcmp(magic, "TLLR", sizeof(magic)) == 0;
+}
+
+/**
+ * @brief Reads up to `count` frames of soft LLRs from a binary frame file.
+ * @param reader The frame file reader.
+ * @param count The maximum number of frames to read.
+ * @param batch Receives the frames (resized to the number read).
+ */
+void readLLRBatch(LLRFrameReader& reader, size_t count, std::vector<Frame>& batch) {
+    batch.clear();
+    Frame frame;
+    while (batch.size() < count && reader.next(frame.packetId, frame.llrs)) {
+        batch.push_back(std::move(frame));
+        frame = Frame();
+    }
+}
+
+/**
+ * @brief Decodes a batch of frames on a pool of threads, one TurboCodec per thread.
+ *        Threads take the next undecoded frame until the batch is done, so slow frames
+ *        do not hold up the others; results stay at their frame's position.
+ * @param batch The frames to decode (their decoded texts are filled in).
+ * @param codecs One codec per thread.
+ * @param algorithms The decoding algorithms to run.
+ * @param noiseVariance The variance of the noise in the channel.
+ */
+void decodeBatch(std::vector<Frame>& batch, std::vector<TurboCodec>& codecs,
+                 const std::vector<std::string>& algorithms, double noiseVariance) {
+    std::atomic<size_t> next(0);
+    auto work = [&](TurboCodec& codec) {
+        for (size_t i = next++; i < batch.size(); i = next++) {
+            if (!batch[i].llrs.empty()) {
+                codec.decodeAllLLR(batch[i].llrs, algorithms, batch[i].decoded, batch[i].iterations);
+            } else {
+                codec.decodeAll(batch[i].encoded, algorithms, batch[i].decoded, batch[i].iterations, noiseVariance);
+            }
+            batch[i].traces = codec.getLastTraces();
+        }
+    };
+
+    // The calling thread works as well, so a single thread spawns nothing.
+    size_t threads = std::min(codecs.size(), std::max<size_t>(batch.size(), 1));
+    std::vector<std::thread> workers;
+    for (size_t t = 1; t < threads; ++t) {
+        workers.emplace_back(work, std::ref(codecs[t]));
+    }
+    work(codecs[0]);
+    for (std::thread& worker : workers) {
+        worker.join();
+    }
+}
+
+/**
+ * @brief Checks whether a trace file is written as CSV rather than JSON lines.
+ * @param fileName The trace file.
+ * @return True if the file name ends with ".csv".
+ */
+bool isCsvTraceFile(const std::string& fileName) {
+    std::string extension = fileName.size() >= 4 ? fileName.substr(fileName.size() - 4) : "";
+    std::transform(extension.begin(), extension.end(), extension.begin(),
+                   [](unsigned char c) { return static_cast<char>(std::tolower(c)); });
+    return extension == ".csv";
+}
+
+/**
+ * @brief Writes one trace record in the layout of decode_trace.py: a CSV row with lists joined
+ *        by ';', or a JSON line with non-finite numbers written as null.
+ * @param output The trace file.
+ * @param csv Whether to write a CSV row (otherwise a JSON line).
+ * @param packetId The packet id of the frame.
+ * @param trace The trace of the frame.
+ */
+void writeTrace(std::ostream& output, bool csv, const std::string& packetId, const FrameTrace& trace) {
+    auto writeList = [&](const std::vector<double>& values) {
+        output << std::setprecision(6);
+        for (size_t i = 0; i < values.size(); ++i) {
+            if (i > 0)
+                output << (csv ? ";" : ", ");
+            if (!csv && !std::isfinite(values[i]))
+                output << "null";
+            else if (std::isnan(values[i]))
+                output << "nan"; // Unsigned, as Python writes it.
+            else
+                output << values[i];
+        }
+        output << std::setprecision(9);
+    };
+    const char* converged = trace.converged ? "true" : "false";
+    const char* cached = trace.cached ? "true" : "false";
+
+    output << std::setprecision(9);
+    if (csv) {
+        output << packetId << ',' << trace.algorithm << ',' << trace.symbols << ',' << trace.iterations << ','
+               << converged << ',' << cached << ',' << trace.seconds << ',';
+        writeList(trace.halfIterationSeconds);
+        output << ',';
+        writeList(trace.maxAbsLLR);
+        output << '\n';
+        return;
+    }
+    std::string id;
+    for (char c : packetId) {
+        if (c == '"' || c == '\\')
+            id += '\\';
+        if (static_cast<unsigned char>(c) >= 0x20)
+            id += c;
+    }
+    output << "{\"frame\": \"" << id << "\", \"algorithm\": \"" << trace.algorithm << "\", \"symbols\": "
+           << trace.symbols << ", \"iterations\": " << trace.iterations << ", \"converged\": " << converged
+           << ", \"cached\": " << cached << ", \"seconds\": " << trace.seconds << ", \"half_iteration_seconds\": [";
+    writeList(trace.halfIterationSeconds);
+    output << "], \"max_abs_llr\": [";
+    writeList(trace.maxAbsLLR);
+    output << "]}\n";
+}
+
+int main(int argc, char* argv[]) {
+    double noiseVariance = 0.5; // Initial noise variance value, representing the noise level in the channel.
+    int maxIterations = 20; // Default maximum number of decoding iterations.
+    double convergenceThreshold = 0.001; // Default threshold for detecting convergence in decoding.
+
+    // Επιλογές από τη γραμμή εντολών
+    Options options;
+    int status = parseArguments(argc, argv, options);
+    if (status != 0) {
+        return status == 2 ? 0 : status;
+    }
+
+    // Κοινή μνήμη αποκωδικοποιημένων πλαισίων για όλα τα νήματα (προαιρετική)
+    std::unique_ptr<DecodeCache> cache;
+    if (!options.cachePath.empty()) {
+        cache.reset(new DecodeCache(options.cachePath));
+        if (!cache->isOpen()) {
+            std::cerr << "Failed to open cache file: " << options.cachePath << std::endl;
+            return 1;
+        }
+    }
+
+    // Ένας κωδικοποιητής ανά νήμα (οι κωδικοποιητές δεν μοιράζονται μεταξύ νημάτων)
+    std::vector<TurboCodec> codecs(options.threads);
+    for (TurboCodec& codec : codecs) {
+        codec.setMaxIterations(maxIterations);
+        codec.setConvergenceThreshold(convergenceThreshold);
+        codec.setDecodeCache(cache.get());
+        codec.setTracing(!options.tracePath.empty());
+        codec.setAdaptiveNoise(options.adaptiveNoise);
+        codec.setHybridSchedule(options.hybridSchedule);
+        codec.setSubBlockThreads(options.threads == 1); // The frames already keep every thread busy.
+    }
+
+    // Άνοιγμα του αρχείου εισόδου για ανάγνωση (CSV ή δυαδικό αρχείο LLR)
+    bool softInput = isLLRFrameFile(options.inputFileName);
+    std::ifstream inputFile(options.inputFileName, softInput ? std::ios::in | std::ios::binary : std::ios::in);
+    if (!inputFile.is_open()) {
+        std::cerr << "Failed to open input file: " << options.inputFileName << std::endl;
+        return 1;
+    }
+    std::unique_ptr<LLRFrameReader> llrReader;
+    if (softInput) {
+        llrReader.reset(new LLRFrameReader(inputFile));
+        if (!llrReader->isValid()) {
+            std::cerr << "Unsupported LLR frame file: " << options.inputFileName << std::endl;
+            return 1;
+        }
+    }
+
+    // Άνοιγμα ενός αρχείου εξόδου <ALGORITHM>_Output.csv ανά αλγόριθμο, με μεγάλο buffer
+    std::vector<std::unique_ptr<std::ofstream>> outputFiles;
+    std::vector<std::vector<char>> outputBuffers(options.algorithms.size(), std::vector<char>(OUTPUT_BUFFER_SIZE));
+    for (size_t i = 0; i < options.algorithms.size(); ++i) {
+        const std::string outputFileName = options.outputDirectory + "/" + options.algorithms[i] + "_Output.csv";
+        outputFiles.emplace_back(new std::ofstream());
+        outputFiles.back()->rdbuf()->pubsetbuf(outputBuffers[i].data(), outputBuffers[i].size());
+        outputFiles.back()->open(outputFileName);
+        if (!outputFiles.back()->is_open()) {
+            std::cerr << "Failed to open output file: " << outputFileName << std::endl;
+            return 1;
+        }
+    }
+
+    // Αρχείο καταγραφής της αποκωδικοποίησης κάθε πλαισίου (προαιρετικό)
+    std::ofstream traceFile;
+    bool csvTrace = isCsvTraceFile(options.tracePath);
+    if (!options.tracePath.empty()) {
+        traceFile.open(options.tracePath);
+        if (!traceFile.is_open()) {
+            std::cerr << "Failed to open trace file: " << options.tracePath << std::endl;
+            return 1;
+        }
+        if (csvTrace)
+            traceFile << TRACE_HEADER << '\n';
+    }
+
+    // Αποκωδικοποίηση ανά παρτίδες: τα νήματα αποκωδικοποιούν, η εγγραφή γίνεται με τη σειρά των γραμμών
+    std::vector<Frame> batch;
+    size_t frameCount = 0;
+    auto start = std::chrono::steady_clock::now();
+    while (true) {
+        if (softInput) {
+            readLLRBatch(*llrReader, options.threads * options.chunkSize, batch);
+        } else {
+            readBatch(inputFile, options.threads * options.chunkSize, batch);
+        }
+        if (batch.empty()) {
+            break;
+        }
+        decodeBatch(batch, codecs, options.algorithms, noiseVariance);
+
+        // Γράφουμε τις γραμμές στα αρχεία εξόδου
+        for (const Frame& frame : batch) {
+            for (size_t i = 0; i < options.algorithms.size(); ++i) {
+                *outputFiles[i] << frame.packetId << "," << frame.decoded[i] << '\n';
+            }
+            for (const FrameTrace& trace : frame.traces) {
+                writeTrace(traceFile, csvTrace, frame.packetId, trace);
+            }
+            if (options.mode == MODE_VERBOSE && softInput) {
+                std::cout << frame.packetId << " | " << frame.llrs.size() << " LLRs\n";
+            } else if (options.mode == MODE_VERBOSE) {
+                std::cout << frame.packetId << " | " << frame.encoded << '\n';
+            }
+        }
+        frameCount += batch.size();
+        if (options.mode == MODE_PROGRESS) {
+            std::cerr << "\rDecoded " << frameCount << " frames" << std::flush;
+        }
+    }
+    double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+    bool malformed = softInput && !llrReader->isValid();
+    if (malformed) {
+        std::cerr << "Truncated or malformed LLR frame file: " << options.inputFileName << " (decoded "
+                  << frameCount << " frames before the bad record)" << std::endl;
+    }
+
+    // Κλείνουμε τα αρχεία
+    inputFile.close();
+    for (auto& outputFile : outputFiles) {
+        outputFile->close();
+    }
+    if (traceFile.is_open()) {
+        traceFile.close();
+    }
+
+    if (options.mode == MODE_PROGRESS) {
+        std::cerr << '\n';
+    }
+    if (malformed) {
+        return 1;
+    }
+    if (options.mode != MODE_QUIET) {
+        std::cout << "Data Decoded successfully !!! " << frameCount << " frames in " << elapsed << " s on "
+                  << options.threads << " threads" << std::endl;
+    }
+
+    return 0;
+}
@@ -1,542 +1,2408 @@
-#include "include/TurboCodec.hpp"
-#include <random>
-#include <cmath>
-#include <algorithm>
-#include <stdexcept>
-#include <iostream>
-
-// Utility functions
-
-/**
- * @brief Computes the absolute value of a number.
- * @tparam T The type of the number (e.g., int, float, double).
- * @param x The input number.
- * @return The absolute value of x.
- */
-template <typename T>
-constexpr T abs(T x) {
-    return (x < 0) ? -x : x;
-}
-
-/**
- * @brief Generates a random interleaver (a permutation of indices).
- *        Used for scrambling input bits in turbo encoding to improve error resilience.
- * @param length The length of the interleaver.
- * @return A vector containing a permutation of indices [0, length-1].
- */
-/**
- * @brief Generates a random interleaver, which is a permutation of indices.
- *        Interleavers are used in turbo coding to scramble the input bits, enhancing
- *        the robustness of the encoded data against burst errors in the channel.
- * @param length The length of the interleaver, i.e., the number of indices to permute.
- * @return A vector containing a permutation of indices [0, length - 1].
- */
-std::vector<size_t> generateInterleaver(size_t length) {
-    // Step 1: Create a vector of indices from 0 to length - 1.
-    std::vector<size_t> indices(length);
-    for (size_t i = 0; i < length; ++i)
-        indices[i] = i;
-
-    // Step 2: Use a random number generator to shuffle the indices.
-    // The seed value (42) ensures that the interleaver is reproducible for testing and debugging.
-    std::mt19937 generator(42); // Mersenne Twister random number generator with a fixed seed.
-    std::shuffle(indices.begin(), indices.end(), generator); // Shuffle the indices randomly.
-
-    // Step 3: Return the permuted indices as the interleaver.
-    return indices;
-}
-
-
-/**
- * @brief Converts a string into a binary representation.
- * @param input The input string.
- * @return A vector of 0s and 1s representing the binary encoding of the string.
- */
-std::vector<uint8_t> stringToBinary(const std::string& input) {
-    std::vector<uint8_t> binary;
-    for (char c : input) {
-        for (int i = 7; i >= 0; --i) {
-            binary.push_back((c >> i) & 1); // Extract each bit of the character.
-        }
-    }
-    return binary;
-}
-
-/**
- * @brief Converts a binary representation back to a string.
- * @param binary A vector of 0s and 1s representing a binary-encoded string.
- * @return The decoded string.
- */
-std::string binaryToString(const std::vector<uint8_t>& binary) {
-    std::string output;
-    for (size_t i = 0; i < binary.size(); i += 8) {
-        char c = 0;
-        for (int j = 0; j < 8; ++j) {
-            c = (c << 1) | binary[i + j]; // Reconstruct the character from bits.
-        }
-        output += c;
-    }
-    return output;
-}
-
-
-// ConvolutionalCode class implementation
-
-/**
- * @brief Constructor for the ConvolutionalCode class.
- * @param n The number of output bits per input bit.
- * @param m The memory size of the encoder.
- * @param gen The generator polynomials defining the code.
- */
-ConvolutionalCode::ConvolutionalCode(uint32_t n, uint32_t m, const std::vector<uint32_t>& gen)
-    : n(n), m(m), generators(gen), state(0) {}
-
-/**
- * @brief Resets the internal state of the encoder to the initial state.
- */
-void ConvolutionalCode::reset() {
-    state = 0;
-}
-
-/**
- * @brief Computes the next state of the encoder based on the current state and input bit.
- * @param currentState The current state of the encoder.
- * @param input The input bit (0 or 1).
- * @return The next state of the encoder.
- */
-uint32_t ConvolutionalCode::computeNextState(uint32_t currentState, bool input) {
-    return ((currentState << 1) | input) & ((1 << m) - 1);
-}
-
-/**
- * @brief Computes the output bits generated by the encoder for a given state and input bit.
- * @param currentState The current state of the encoder.
- * @param input The input bit (0 or 1).
- * @return The output bits as an integer.
- */
-uint8_t ConvolutionalCode::computeNextOutput(uint32_t currentState, bool input) {
-    uint8_t output = 0;
-    for (size_t i = 0; i < n; ++i) {
-        uint32_t temp = currentState & generators[i];
-        if (input)
-            temp |= (1 << (m - 1));
-        output |= (__builtin_popcount(temp) % 2) << i;
-    }
-    return output;
-}
-
-/**
- * @brief Decodes a sequence of received bits using the BCJR algorithm.
- *        The BCJR algorithm computes the log-likelihood ratios (LLRs) for each bit,
- *        enabling efficient decoding in turbo codes.
- * @param systematic The systematic bits received from the channel.
- * @param parity The parity bits received from the channel.
- * @param extrinsic The extrinsic information from previous iterations.
- * @param noiseVariance The variance of the noise in the channel.
- * @return A vector of log-likelihood ratios (LLRs) for the decoded bits.
- */
-std::vector<double> ConvolutionalCode::decodeBCJR(const std::vector<double>& systematic,
-                                                  const std::vector<double>& parity,
-                                                  const std::vector<double>& extrinsic,
-                                                  double noiseVariance) {
-    size_t length = systematic.size(); // Number of bits in the sequence.
-    size_t numStates = 1 << m; // Total number of states in the trellis (2^m, where m is the memory size).
-
-    // Initialize alpha and beta matrices with negative infinity (logarithmic domain).
-    // Alpha represents forward probabilities, and beta represents backward probabilities.
-    std::vector<std::vector<double>> alpha(length + 1, std::vector<double>(numStates, -std::numeric_limits<double>::infinity()));
-    std::vector<std::vector<double>> beta(length + 1, std::vector<double>(numStates, -std::numeric_limits<double>::infinity()));
-    std::vector<double> llr(length, 0.0); // Log-likelihood ratios (LLRs) for the decoded bits.
-
-    alpha[0][0] = 0.0; // Forward recursion starts with the initial state having probability 1 (log(1) = 0).
-    beta[length][0] = 0.0; // Backward recursion starts with the initial state having probability 1 (log(1) = 0).
-
-    // Forward recursion to compute alpha probabilities.
-    for (size_t t = 0; t < length; ++t) {
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                // Scale by noise variance.
-                // Update the alpha value for the next state.
-                alpha[t + 1][nextState] = std::max(alpha[t + 1][nextState], alpha[t][state] + gamma);
-            }
-        }
-    }
-
-    // Backward recursion to compute beta probabilities.
-    for (size_t t = length; t > 0; --t) {
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t - 1] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t - 1] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t - 1] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                    // Scale by noise variance.
-                // Update the beta value for the current state.
-                beta[t - 1][state] = std::max(beta[t - 1][state], beta[t][nextState] + gamma);
-            }
-        }
-    }
-
-    // Compute LLRs (Log-Likelihood Ratios) for each bit in the sequence.
-    for (size_t t = 0; t < length; ++t) {
-        double prob0 = -std::numeric_limits<double>::infinity(); // Probability of bit being 0 (log domain).
-        double prob1 = -std::numeric_limits<double>::infinity(); // Probability of bit being 1 (log domain).
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                // Scale by noise variance.
-                // Compute the full metric for this transition.
-                double metric = alpha[t][state] + gamma + beta[t + 1][nextState];
-                if (!input) // If input is 0, update prob0.
-                    prob0 = std::max(prob0, metric);
-                else // If input is 1, update prob1.
-                    prob1 = std::max(prob1, metric);
-            }
-        }
-        llr[t] = prob1 - prob0; // Compute the LLR as the difference between log probabilities.
-    }
-
-    return llr; // Return the calculated LLRs for the entire sequence.
-}
-
-/**
- * @brief Decodes a sequence of received bits using the MAP (Maximum A Posteriori) algorithm.
- *        The MAP algorithm computes the log-likelihood ratios (LLRs) for each bit, considering
- *        the entire sequence probabilities.
- * @param systematic The systematic bits received from the channel.
- * @param parity The parity bits received from the channel.
- * @param extrinsic The extrinsic information from previous iterations.
- * @param noiseVariance The variance of the noise in the channel.
- * @return A vector of log-likelihood ratios (LLRs) for the decoded bits.
- */
-std::vector<double> ConvolutionalCode::decodeMAP(const std::vector<double>& systematic,
-                                                 const std::vector<double>& parity,
-                                                 const std::vector<double>& extrinsic,
-                                                 double noiseVariance) {
-    size_t length = systematic.size(); // Number of bits in the sequence.
-    size_t numStates = 1 << m; // Total number of states in the trellis (2^m, where m is the memory size).
-
-    // Initialize alpha and beta matrices with negative infinity (logarithmic domain).
-    // Alpha represents forward probabilities, and beta represents backward probabilities.
-    std::vector<std::vector<double>> alpha(length + 1, std::vector<double>(numStates, -std::numeric_limits<double>::infinity()));
-    std::vector<std::vector<double>> beta(length + 1, std::vector<double>(numStates, -std::numeric_limits<double>::infinity()));
-    std::vector<double> llr(length, 0.0); // Log-likelihood ratios (LLRs) for the decoded bits.
-
-    // Initialization of alpha and beta.
-    alpha[0][0] = 0.0; // Forward recursion starts with the initial state having probability 1 (log(1) = 0).
-    beta[length][0] = 0.0; // Backward recursion starts with the initial state having probability 1 (log(1) = 0).
-
-    // Forward recursion to compute alpha probabilities.
-    for (size_t t = 0; t < length; ++t) {
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                // Scale by noise variance.
-                // Update the alpha value for the next state.
-                alpha[t + 1][nextState] = std::max(alpha[t + 1][nextState], alpha[t][state] + gamma);
-            }
-        }
-    }
-
-    // Backward recursion to compute beta probabilities.
-    for (size_t t = length; t > 0; --t) {
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t - 1] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t - 1] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t - 1] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                    // Scale by noise variance.
-                // Update the beta value for the current state.
-                beta[t - 1][state] = std::max(beta[t - 1][state], beta[t][nextState] + gamma);
-            }
-        }
-    }
-
-    // Compute LLRs (Log-Likelihood Ratios) for each bit in the sequence.
-    for (size_t t = 0; t < length; ++t) {
-        double prob0 = -std::numeric_limits<double>::infinity(); // Probability of bit being 0 (log domain).
-        double prob1 = -std::numeric_limits<double>::infinity(); // Probability of bit being 1 (log domain).
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                // Scale by noise variance.
-                // Compute the full metric for this transition.
-                double metric = alpha[t][state] + gamma + beta[t + 1][nextState];
-                if (!input) // If input is 0, update prob0.
-                    prob0 = std::max(prob0, metric);
-                else // If input is 1, update prob1.
-                    prob1 = std::max(prob1, metric);
-            }
-        }
-        llr[t] = prob1 - prob0; // Compute the LLR as the difference between log probabilities.
-    }
-
-    return llr; // Return the calculated LLRs for the entire sequence.
-}
-
-/**
- * @brief Decodes a sequence of received bits using the SOVA (Soft Output Viterbi Algorithm) method.
- *        SOVA combines soft information decoding with traceback for determining the most likely path.
- * @param systematic The systematic bits received from the channel.
- * @param parity The parity bits received from the channel.
- * @param extrinsic The extrinsic information from previous iterations.
- * @param noiseVariance The variance of the noise in the channel.
- * @return A vector of log-likelihood ratios (LLRs) for the decoded bits.
- */
-std::vector<double> ConvolutionalCode::decodeSOVA(const std::vector<double>& systematic,
-                                                  const std::vector<double>& parity,
-                                                  const std::vector<double>& extrinsic,
-                                                  double noiseVariance) {
-    size_t length = systematic.size(); // Number of bits in the sequence.
-    size_t numStates = 1 << m; // Total number of states in the trellis (2^m, where m is the memory size).
-
-    // Path metrics to track the likelihood of paths to each state.
-    std::vector<double> pathMetrics(numStates, -std::numeric_limits<double>::infinity());
-    // Decision table to store the best input bit for each state at each time step.
-    std::vector<std::vector<int>> decisions(length, std::vector<int>(numStates, -1));
-
-    pathMetrics[0] = 0.0; // Initialize the starting state with probability 1 (log(1) = 0).
-
-    // Forward pass: Compute path metrics and decisions for each state at each time step.
-    for (size_t t = 0; t < length; ++t) {
-        std::vector<double> tempPathMetrics(numStates, -std::numeric_limits<double>::infinity()); // Temporary storage.
-
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                // Scale by noise variance.
-
-                double metric = pathMetrics[state] + gamma; // Compute the path metric for the transition.
-                if (metric > tempPathMetrics[nextState]) { // Update if this path is better.
-                    tempPathMetrics[nextState] = metric;
-                    decisions[t][nextState] = input; // Record the decision for the current state.
-                }
-            }
-        }
-
-        pathMetrics = tempPathMetrics; // Update path metrics for the next iteration.
-    }
-
-    // Traceback: Determine the most likely path through the trellis.
-    std::vector<int> mostLikelyPath(length, 0); // Store the most likely input bits.
-    size_t state = std::distance(pathMetrics.begin(), std::max_element(pathMetrics.begin(), pathMetrics.end())); // Start from the most likely final state.
-
-    for (size_t t = length; t > 0; --t) {
-        mostLikelyPath[t - 1] = decisions[t - 1][state]; // Record the input bit leading to the current state.
-        state = computeNextState(state, mostLikelyPath[t - 1]); // Traceback to the previous state.
-    }
-
-    // Compute LLRs (Log-Likelihood Ratios) for each bit in the sequence.
-    std::vector<double> llr(length, 0.0); // Store the LLRs.
-    for (size_t t = 0; t < length; ++t) {
-        double metric0 = -std::numeric_limits<double>::infinity(); // Metric for input bit 0.
-        double metric1 = -std::numeric_limits<double>::infinity(); // Metric for input bit 1.
-
-        for (size_t state = 0; state < numStates; ++state) {
-            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
-                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
-                double gamma = (systematic[t] * (2 * input - 1) + // Contribution of systematic bits.
-                                parity[t] * (2 * input - 1) +    // Contribution of parity bits.
-                                extrinsic[t] * (2 * input - 1))  // Contribution of extrinsic information.
-                                / noiseVariance;                // Scale by noise variance.
-
-                double metric = pathMetrics[state] + gamma; // Compute the metric for this transition.
-                if (!input) // If input is 0, update metric0.
-                    metric0 = std::max(metric0, metric);
-                else // If input is 1, update metric1.
-                    metric1 = std::max(metric1, metric);
-            }
-        }
-
-        llr[t] = metric1 - metric0; // Compute the LLR as the difference between log probabilities.
-    }
-
-    return llr; // Return the calculated LLRs for the entire sequence.
-}
-
-/**
- * @brief Encodes a sequence of input bits using the convolutional encoder.
- * @param input A vector of input bits (0s and 1s).
- * @return A vector of pairs representing systematic and parity bits.
- */
-std::vector<std::pair<uint8_t, uint8_t>> ConvolutionalCode::encode(const std::vector<uint8_t>& input) {
-    std::vector<std::pair<uint8_t, uint8_t>> output;
-    reset(); // Reset the internal state
-
-    for (auto bit : input) {
-        uint8_t systematicBit = bit;
-        uint8_t parityBit = computeNextOutput(state, bit);
-        state = computeNextState(state, bit);
-
-        output.emplace_back(systematicBit, parityBit);
-    }
-
-    return output;
-}
-
-// TurboCodec class implementation
-
-/**
- * @brief Constructor for the TurboCodec class.
- *        Initializes the encoders and sets default values for maxIterations and convergenceThreshold.
- */
-TurboCodec::TurboCodec()
-    : encoder1(2, 3, {0b1011, 0b1111}), encoder2(2, 3, {0b1011, 0b1111}), maxIterations(20), convergenceThreshold(0.001) {}
-
-
-TurboCodec* TurboCodec_new() { return new TurboCodec(); }
-void TurboCodec_delete(TurboCodec* codec) { delete codec; }
-
-
-/**
- * @brief Encodes an input string into a turbo-encoded string.
- *        The Turbo Codec uses two convolutional encoders and an interleaver
- *        to create a robust encoded representation of the input.
- * @param input The input string to encode.
- * @param output The encoded output string.
- */
-void TurboCodec::encode(const std::string& input, std::string& output) {
-    // Step 1: Convert the input string into its binary representation.
-    // Each character in the input is expanded into 8 bits (ASCII encoding).
-    auto binaryInput = stringToBinary(input);
-
-    // Step 2: Generate an interleaver for scrambling the binary input.
-    // The interleaver creates a random permutation of the indices of the input bits.
-    auto interleaver = generateInterleaver(binaryInput.size());
-
-    // Step 3: Encode the binary input using the first convolutional encoder.
-    // This generates systematic and parity bits for the input sequence.
-    auto encoded1 = encoder1.encode(binaryInput);
-
-    // Step 4: Apply the interleaver to the binary input.
-    // The input bits are permuted according to the interleaver indices.
-    std::vector<uint8_t> permutedInput(binaryInput.size());
-    for (size_t i = 0; i < binaryInput.size(); ++i)
-        permutedInput[interleaver[i]] = binaryInput[i];
-
-    // Step 5: Encode the permuted input using the second convolutional encoder.
-    // This generates parity bits for the permuted sequence.
-    auto encoded2 = encoder2.encode(permutedInput);
-
-    // Step 6: Construct the final output by combining the systematic and parity bits.
-    // For each bit in the input sequence:
-    // - Add the systematic bit from the first encoder.
-    // - Add the parity bit from the first encoder.
-    // - Add the parity bit from the second encoder.
-    output.clear();
-    for (size_t i = 0; i < binaryInput.size(); ++i) {
-        output += (encoded1[i].first ? "1" : "0");   // Systematic bit from encoder1.
-        output += (encoded1[i].second ? "1" : "0");  // Parity bit from encoder1.
-        output += (encoded2[i].second ? "1" : "0");  // Parity bit from encoder2.
-    }
-}
-
-/**
- * @brief Decodes a turbo-encoded string using the specified decoding algorithm.
- *        The decoder iteratively exchanges extrinsic information between two decoders
- *        to refine the decoded output until convergence or the maximum number of iterations is reached.
- * @param input The encoded input string (contains systematic and parity bits).
- * @param output The decoded output string.
- * @param noiseVariance The variance of the noise in the channel.
- * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "SOVA", or "HYBRID").
- */
-void TurboCodec::decode(const std::string& input, std::string& output, double noiseVariance, const std::string& algorithm) {
-    // Step 1: Parse the input into systematic and parity bits.
-    size_t length = input.size() / 3; // Each symbol contains one systematic and two parity bits.
-    std::vector<double> systematic(length), parity1(length), parity2(length);
-
-    for (size_t i = 0; i < length; ++i) {
-        systematic[i] = input[i * 3] - '0';    // Extract systematic bit.
-        parity1[i] = input[i * 3 + 1] - '0';  // Extract first parity bit.
-        parity2[i] = input[i * 3 + 2] - '0';  // Extract second parity bit.
-    }
-
-    // Step 2: Initialize extrinsic information vectors.
-    // These vectors store information exchanged between the two decoders during iterations.
-    std::vector<double> extrinsic1(length, 0.0), extrinsic2(length, 0.0);
-
-    int numIterations = 0; // Counter to track the number of decoding iterations.
-
-    // Step 3: Iterative decoding process.
-    for (numIterations = 0; numIterations < maxIterations; ++numIterations) {
-        // Select the appropriate decoding algorithm for each encoder.
-        if (algorithm == "BCJR") {
-            extrinsic1 = encoder1.decodeBCJR(systematic, parity1, extrinsic2, noiseVariance);
-            extrinsic2 = encoder2.decodeBCJR(systematic, parity2, extrinsic1, noiseVariance);
-        } else if (algorithm == "MAP") {
-            extrinsic1 = encoder1.decodeMAP(systematic, parity1, extrinsic2, noiseVariance);
-            extrinsic2 = encoder2.decodeMAP(systematic, parity2, extrinsic1, noiseVariance);
-        } else if (algorithm == "SOVA") {
-            extrinsic1 = encoder1.decodeSOVA(systematic, parity1, extrinsic2, noiseVariance);
-            extrinsic2 = encoder2.decodeSOVA(systematic, parity2, extrinsic1, noiseVariance);
-        } else if (algorithm == "HYBRID") {
-            // Use MAP for the first half of iterations, then switch to SOVA.
-            if (numIterations < maxIterations / 2) {
-                extrinsic1 = encoder1.decodeMAP(systematic, parity1, extrinsic2, noiseVariance);
-                extrinsic2 = encoder2.decodeMAP(systematic, parity2, extrinsic1, noiseVariance);
-            } else {
-                extrinsic1 = encoder1.decodeSOVA(systematic, parity1, extrinsic2, noiseVariance);
-                extrinsic2 = encoder2.decodeSOVA(systematic, parity2, extrinsic1, noiseVariance);
-            }
-        } else {
-            throw std::invalid_argument("Unsupported algorithm."); // Handle invalid algorithm input.
-        }
-
-        // Step 4: Check for convergence.
-        double maxDifference = 0.0; // Tracks the maximum difference between extrinsic and systematic values.
-        for (size_t i = 0; i < length; ++i) {
-            maxDifference = std::max(maxDifference, std::abs(extrinsic1[i] - systematic[i]));
-        }
-
-        if (maxDifference < convergenceThreshold) {
-            // If the maximum difference is below the threshold, stop iterating.
-            break;
-        }
-    }
-
-    // Step 5: Reconstruct the message from the decoded bits.
-    std::vector<uint8_t> reconstructedMessage(length);
-    for (size_t i = 0; i < length; ++i) {
-        // A positive systematic value indicates a bit of 1; otherwise, it's 0.
-        reconstructedMessage[i] = systematic[i] > 0 ? 1 : 0;
-    }
-
-    // Step 6: Convert the reconstructed binary message back to a string.
-    output = binaryToString(reconstructedMessage);
-
-    // Step 7: Output the number of iterations performed (for debugging or display purposes).
-    std::cout << "Number of iterations: " << numIterations << std::endl;
-}
-
-/**
- * @brief Sets the maximum number of decoding iterations.
- * @param iterations The maximum number of iterations.
- */
-void TurboCodec::setMaxIterations(int iterations) {
-    maxIterations = iterations;
-}
-
-/**
- * @brief Sets the convergence threshold for decoding.
- * @param threshold The convergence threshold.
- */
-void TurboCodec::setConvergenceThreshold(double threshold) {
-    convergenceThreshold = threshold;
-}
\ No newline at end of file
+#include "include/TurboCodec.hpp"
+#include <random>
+#include <cmath>
+#include <algorithm>
+#include <stdexcept>
+#include <iostream>
+#include <thread>
+#include <sstream>
+#include <cstdlib>
+#include <cstring>
+#include <chrono>
+
+// Utility functions
+
+/**
+ * @brief Computes the absolute value of a number.
+ * @tparam T The type of the number (e.g., int, float, double).
+ * @param x The input number.
+ * @return The absolute value of x.
+ */
+template <typename T>
+constexpr T abs(T x) {
+    return (x < 0) ? -x : x;
+}
+
+/**
+ * @brief Generates a random interleaver (a permutation of indices).
+ *        Used for scrambling input bits in turbo encoding to improve error resilience.
+ * @param length The length of the interleaver.
+ * @return A vector containing a permutation of indices [0, length-1].
+ */
+/**
+ * @brief Generates a random interleaver, which is a permutation of indices.
+ *        Interleavers are used in turbo coding to scramble the input bits, enhancing
+ *        the robustness of the encoded data against burst errors in the channel.
+ * @param length The length of the interleaver, i.e., the number of indices to permute.
+ * @return A vector containing a permutation of indices [0, length - 1].
+ */
+std::vector<size_t> generateInterleaver(size_t length) {
+    // Step 1: Create a vector of indices from 0 to length - 1.
+    std::vector<size_t> indices(length);
+    for (size_t i = 0; i < length; ++i)
+        indices[i] = i;
+
+    // Step 2: Use a random number generator to shuffle the indices.
+    // The seed value (42) ensures that the interleaver is reproducible for testing and debugging.
+    std::mt19937 generator(42); // Mersenne Twister random number generator with a fixed seed.
+    // An explicit Fisher-Yates shuffle is used instead of std::shuffle, whose algorithm differs
+    // between standard libraries. Each raw 32-bit draw is reduced to [0, i] as
+    // (draw * (i + 1)) >> 32, which the Python codec (random_interleaver) reproduces exactly.
+    for (size_t i = length; i-- > 1;) {
+        size_t j = static_cast<size_t>((static_cast<uint64_t>(generator()) * (i + 1)) >> 32);
+        std::swap(indices[i], indices[j]);
+    }
+
+    // Step 3: Return the permuted indices as the interleaver.
+    return indices;
+}
+
+/**
+ * @brief Computes the coefficients of the QPP interleaver pi(i) = (f1 * i + f2 * i^2) mod length.
+ *        f2 is the product of the distinct prime factors of the length and f1 the first integer
+ *        from ceil(sqrt(length)) that is coprime to it, which makes pi a permutation. The Python
+ *        codec (qpp_coefficients) uses the same rule.
+ * @param length The length of the interleaver.
+ * @param f1 Receives the linear coefficient.
+ * @param f2 Receives the quadratic coefficient.
+ * @throws std::domain_error If the length is squarefree, where f2 would be 0.
+ */
+void qppCoefficients(size_t length, uint64_t& f1, uint64_t& f2) {
+    if (length < 2) {
+        f1 = 1;
+        f2 = 0;
+        return;
+    }
+
+    // Step 1: The radical of the length (product of its distinct prime factors).
+    uint64_t radical = 1, remaining = length;
+    for (uint64_t factor = 2; factor * factor <= remaining; ++factor) {
+        if (remaining % factor == 0) {
+            radical *= factor;
+            while (remaining % factor == 0)
+                remaining /= factor;
+        }
+    }
+    if (remaining > 1)
+        radical *= remaining;
+    if (radical == length)
+        throw std::domain_error("The QPP interleaver needs a frame length with a repeated prime factor.");
+    f2 = radical;
+
+    // Step 2: The first integer from ceil(sqrt(length)) that is coprime to the length.
+    f1 = 1;
+    while (f1 * f1 < length)
+        ++f1;
+    auto gcd = [](uint64_t a, uint64_t b) {
+        while (b != 0) {
+            uint64_t t = a % b;
+            a = b;
+            b = t;
+        }
+        return a;
+    };
+    while (gcd(f1, length) != 1)
+        ++f1;
+}
+
+/**
+ * @brief Computes the QPP-interleaved position of an index.
+ *        The product is split as i * ((f1 + f2 * i) mod length) so that it cannot overflow.
+ * @param i The index to permute.
+ * @param length The length of the interleaver.
+ * @param f1 The linear coefficient from qppCoefficients.
+ * @param f2 The quadratic coefficient from qppCoefficients.
+ * @return The permuted index (f1 * i + f2 * i^2) mod length.
+ */
+size_t qppIndex(size_t i, size_t length, uint64_t f1, uint64_t f2) {
+    return static_cast<size_t>((f1 + f2 * i) % length * i % length);
+}
+
+
+/**
+ * @brief Converts a string into a binary representation.
+ * @param input The input string.
+ * @return A vector of 0s and 1s representing the binary encoding of the string.
+ */
+std::vector<uint8_t> stringToBinary(const std::string& input) {
+    std::vector<uint8_t> binary;
+    for (char c : input) {
+        for (int i = 7; i >= 0; --i) {
+            binary.push_back((c >> i) & 1); // Extract each bit of the character.
+        }
+    }
+    return binary;
+}
+
+/**
+ * @brief Converts a binary representation back to a string.
+ * @param binary A vector of 0s and 1s representing a binary-encoded string.
+ * @return The decoded string.
+ */
+std::string binaryToString(const std::vector<uint8_t>& binary) {
+    std::string output;
+    for (size_t i = 0; i < binary.size(); i += 8) {
+        char c = 0;
+        for (size_t j = 0; j < 8 && i + j < binary.size(); ++j) {
+            c = (c << 1) | binary[i + j]; // Reconstruct the character from bits.
+        }
+        output += c;
+    }
+    return output;
+}
+
+/**
+ * @brief Computes the CRC-16/CCITT-FALSE checksum of a byte string.
+ * @param data The bytes to checksum.
+ * @return The 16-bit CRC.
+ */
+uint16_t crc16(const std::string& data) {
+    uint16_t crc = 0xFFFF; // Initial value.
+    for (unsigned char byte : data) {
+        crc ^= static_cast<uint16_t>(byte) << 8;
+        for (int i = 0; i < 8; ++i)
+            crc = (crc & 0x8000) ? static_cast<uint16_t>((crc << 1) ^ 0x1021) : static_cast<uint16_t>(crc << 1);
+    }
+    return crc;
+}
+
+/**
+ * @brief Checks a payload whose last two bytes carry its big-endian CRC-16/CCITT-FALSE.
+ * @param payload The decoded payload.
+ * @return True if the trailing CRC matches the rest of the payload.
+ */
+bool hasValidCrc16(const std::string& payload) {
+    if (payload.size() < 3)
+        return false;
+    uint16_t expected = (static_cast<unsigned char>(payload[payload.size() - 2]) << 8) |
+                        static_cast<unsigned char>(payload[payload.size() - 1]);
+    return crc16(payload.substr(0, payload.size() - 2)) == expected;
+}
+/**
+ * @brief Computes ln(exp(a) + exp(b)) as max(a, b) plus a Jacobian correction
+ *        ln(1 + exp(-|a - b|)) read from a small lookup table instead of exp/log.
+ * @param a The first log-domain value.
+ * @param b The second log-domain value.
+ * @return The max* of a and b.
+ */
+double maxStar(double a, double b) {
+    constexpr size_t tableSize = 64;   // Number of table entries.
+    constexpr double tableScale = 8.0; // Table entries per unit of |a - b|.
+    // Correction sampled at the bin centres, built once on first use.
+    static const std::vector<double> table = [] {
+        std::vector<double> values(tableSize, 0.0);
+        for (size_t i = 0; i + 1 < tableSize; ++i)
+            values[i] = std::log1p(std::exp(-(i + 0.5) / tableScale));
+        return values;
+    }();
+
+    double maximum = std::max(a, b);
+    double difference = std::abs(a - b);
+    if (!(difference * tableScale < tableSize - 1)) // Large differences, and NaN from -inf - -inf.
+        return maximum;
+    return maximum + table[static_cast<size_t>(difference * tableScale)];
+}
+
+// ConvolutionalCode class implementation
+
+/**
+ * @brief Constructor for the ConvolutionalCode class.
+ * @param n The number of output bits per input bit.
+ * @param m The memory size of the encoder.
+ * @param gen The generator polynomials defining the code.
+ */
+ConvolutionalCode::ConvolutionalCode(uint32_t n, uint32_t m, const std::vector<uint32_t>& gen)
+    : n(n), m(m), generators(gen), state(0), windowSize(0), warmupLength(0),
+      precision(PRECISION_DOUBLE), subBlocks(1), subBlockThreads(true), radix(2), sovaDepth(32) {
+    computeParityFlipWeights();
+
+    branchSymbols.resize(size_t(2) << m); // (state << 1) | input
+    for (uint32_t word = 0; word < branchSymbols.size(); ++word)
+        branchSymbols[word] = static_cast<uint8_t>(2 * (word & 1) + (computeNextOutput(word >> 1, word & 1) != 0));
+}
+
+/**
+ * @brief Fills parityFlipWeights: for every error pattern of weight w in the m + 1 input bits
+ *        a parity bit depends on, adds to entry w the fraction of bit combinations whose parity
+ *        bit (a non-zero output symbol, as the turbo encoder emits it) the pattern changes.
+ */
+void ConvolutionalCode::computeParityFlipWeights() {
+    const uint32_t words = 1u << (m + 1); // (state << 1) | input
+    std::vector<uint8_t> parity(words);
+    for (uint32_t word = 0; word < words; ++word)
+        parity[word] = computeNextOutput(word >> 1, word & 1) != 0;
+
+    parityFlipWeights.assign(m + 2, 0.0);
+    for (uint32_t error = 1; error < words; ++error) {
+        size_t flipped = 0;
+        for (uint32_t word = 0; word < words; ++word)
+            flipped += parity[word] != parity[word ^ error];
+        parityFlipWeights[__builtin_popcount(error)] += static_cast<double>(flipped) / words;
+    }
+}
+
+/**
+ * @brief Resets the internal state of the encoder to the initial state.
+ */
+void ConvolutionalCode::reset() {
+    state = 0;
+}
+
+/**
+ * @brief Enables sliding-window BCJR decoding.
+ * @param window The window length (0 decodes whole frames).
+ * @param warmup The number of backward warm-up steps before each window.
+ */
+void ConvolutionalCode::setSlidingWindow(size_t window, size_t warmup) {
+    windowSize = window;
+    warmupLength = warmup;
+}
+
+/**
+ * @brief Selects double or fixed-point BCJR/MAP decoding.
+ * @param value The decoder precision.
+ */
+void ConvolutionalCode::setPrecision(Precision value) {
+    precision = value;
+}
+
+/**
+ * @brief Splits every frame into sub-blocks that the BCJR decoder recurses concurrently.
+ * @param count The number of sub-blocks (1 decodes serially).
+ */
+void ConvolutionalCode::setSubBlocks(size_t count) {
+    subBlocks = std::max<size_t>(count, 1);
+    resetBoundaryMetrics();
+}
+
+/**
+ * @brief Selects whether the sub-blocks of a frame run on threads of their own or one after another.
+ * @param enabled Whether to start a thread per sub-block.
+ */
+void ConvolutionalCode::setSubBlockThreads(bool enabled) {
+    subBlockThreads = enabled;
+}
+
+/**
+ * @brief Selects radix-2 or radix-4 recursions in the full-frame double BCJR/MAP decoder.
+ * @param value The radix (2 or 4); other values are rejected.
+ */
+void ConvolutionalCode::setRadix(unsigned value) {
+    if (value != 2 && value != 4)
+        throw std::invalid_argument("Unsupported radix.");
+    radix = value;
+}
+
+/**
+ * @brief Sets the register-exchange window of the SOVA decoder.
+ * @param depth The number of trellis steps after which a decision is released (at least 1).
+ */
+void ConvolutionalCode::setSovaDepth(size_t depth) {
+    sovaDepth = std::max<size_t>(depth, 1);
+}
+
+/**
+ * @brief Describes the decoder settings that affect decoded outputs, for use in decode cache keys.
+ * @return The settings as a compact string.
+ */
+std::string ConvolutionalCode::describeSettings() const {
+    std::ostringstream settings;
+    settings << windowSize << ',' << warmupLength << ',' << precision << ',' << subBlocks << ','
+             << radix << ',' << sovaDepth;
+    return settings.str();
+}
+
+/**
+ * @brief Forgets the sub-block boundary metrics kept from the previous iteration.
+ */
+void ConvolutionalCode::resetBoundaryMetrics() {
+    subBlockAlpha.clear();
+    subBlockBeta.clear();
+}
+
+/**
+ * @brief Computes the next state of the encoder based on the current state and input bit.
+ * @param currentState The current state of the encoder.
+ * @param input The input bit (0 or 1).
+ * @return The next state of the encoder.
+ */
+uint32_t ConvolutionalCode::computeNextState(uint32_t currentState, bool input) {
+    return ((currentState << 1) | input) & ((1 << m) - 1);
+}
+
+/**
+ * @brief Computes the output bits generated by the encoder for a given state and input bit.
+ * @param currentState The current state of the encoder.
+ * @param input The input bit (0 or 1).
+ * @return The output bits as an integer.
+ */
+uint8_t ConvolutionalCode::computeNextOutput(uint32_t currentState, bool input) {
+    uint8_t output = 0;
+    for (size_t i = 0; i < n; ++i) {
+        uint32_t temp = currentState & generators[i];
+        if (input)
+            temp |= (1 << (m - 1));
+        output |= (__builtin_popcount(temp) % 2) << i;
+    }
+    return output;
+}
+
+/**
+ * @brief Computes the branch metrics of a frame: entry 4 * t + symbol holds the metric at time step t
+ *        of the branches with channel symbol 2 * input + parity bit (see branchSymbols).
+ * @param systematic The systematic values received from the channel.
+ * @param parity The parity values received from the channel.
+ * @param extrinsic The a-priori (extrinsic) information from the other decoder.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return The branch metrics, four per time step.
+ */
+std::vector<double> ConvolutionalCode::branchMetrics(const std::vector<double>& systematic,
+                                                     const std::vector<double>& parity,
+                                                     const std::vector<double>& extrinsic,
+                                                     double noiseVariance) const {
+    std::vector<double> gamma(4 * systematic.size());
+    for (size_t t = 0; t < systematic.size(); ++t) {
+        double input = (systematic[t] + extrinsic[t]) / noiseVariance; // Systematic and a-priori information.
+        double check = parity[t] / noiseVariance;                       // Parity information.
+        gamma[4 * t + 3] = input + check;
+        gamma[4 * t + 2] = input - check;
+        gamma[4 * t + 1] = -(input - check);
+        gamma[4 * t] = -(input + check);
+    }
+    return gamma;
+}
+
+/**
+ * @brief Decodes a sequence of received bits using the BCJR algorithm.
+ *        The BCJR algorithm computes the a-posteriori log-likelihood ratios (LLRs) for each bit,
+ *        enabling efficient decoding in turbo codes. The encoder starts in state 0 and its trellis
+ *        is not terminated, so every final state is equally likely.
+ * @param systematic The systematic bits received from the channel.
+ * @param parity The parity bits received from the channel.
+ * @param extrinsic The extrinsic information from previous iterations.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+ */
+std::vector<double> ConvolutionalCode::decodeBCJR(const std::vector<double>& systematic,
+                                                  const std::vector<double>& parity,
+                                                  const std::vector<double>& extrinsic,
+                                                  double noiseVariance) {
+    size_t length = systematic.size(); // Number of bits in the sequence.
+    size_t numStates = 1 << m; // Total number of states in the trellis (2^m, where m is the memory size).
+
+    if (precision == PRECISION_FIXED16)
+        return decodeBCJRFixed(systematic, parity, extrinsic, noiseVariance);
+
+    // Long frames are split into sub-blocks decoded concurrently when configured.
+    if (subBlocks > 1 && length >= 2 * subBlocks)
+        return decodeBCJRSubBlocks(systematic, parity, extrinsic, noiseVariance);
+
+    // Long frames are decoded window by window when a sliding window is configured.
+    if (windowSize > 0 && windowSize < length)
+        return decodeBCJRWindowed(systematic, parity, extrinsic, noiseVariance);
+
+    // Initialize alpha and beta matrices with negative infinity (logarithmic domain).
+    // Alpha represents forward probabilities, and beta represents backward probabilities.
+    const double negInf = -std::numeric_limits<double>::infinity();
+    std::vector<std::vector<double>> alpha(length + 1, std::vector<double>(numStates, negInf));
+    std::vector<std::vector<double>> beta(length + 1, std::vector<double>(numStates, negInf));
+    std::vector<double> llr(length, 0.0); // Log-likelihood ratios (LLRs) for the decoded bits.
+
+    alpha[0][0] = 0.0; // Forward recursion starts with the initial state having probability 1 (log(1) = 0).
+    std::fill(beta[length].begin(), beta[length].end(), 0.0); // Backward recursion starts from equiprobable states.
+
+    // Branch metric at time step t of the branch leaving `state` on `input`.
+    const std::vector<double> gammas = branchMetrics(systematic, parity, extrinsic, noiseVariance);
+    auto gamma = [&](size_t t, size_t state, bool input) {
+        return gammas[4 * t + branchSymbols[(state << 1) | input]];
+    };
+    const size_t topState = size_t(1) << (m - 1); // The two predecessors of a state differ in this bit.
+
+    // Radix-4 forward recursion: alpha[t + 1] and alpha[t + 2] are both computed from alpha[t].
+    // Every state takes the best of the four two-stage paths that reach it, and the sums are
+    // formed in the same order as in two radix-2 steps, so the values are identical.
+    size_t t0 = 0; // First step left to the radix-2 recursion.
+    if (radix == 4) {
+        for (; t0 + 2 <= length; t0 += 2) {
+            // Step 1: Intermediate stage, exactly as in the radix-2 recursion.
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool first : {false, true}) {
+                    size_t midState = computeNextState(state, first);
+                    alpha[t0 + 1][midState] = std::max(alpha[t0 + 1][midState], alpha[t0][state] + gamma(t0, state, first));
+                }
+            }
+
+            // Step 2: Second stage directly from alpha[t0], over the two predecessors of both
+            // states that lead into nextState.
+            for (size_t nextState = 0; nextState < numStates; ++nextState) {
+                double metric = negInf;
+                for (size_t midState : {nextState >> 1, (nextState >> 1) | topState}) {
+                    for (size_t state : {midState >> 1, (midState >> 1) | topState}) {
+                        metric = std::max(metric, alpha[t0][state] + gamma(t0, state, midState & 1) +
+                                                      gamma(t0 + 1, midState, nextState & 1));
+                    }
+                }
+                alpha[t0 + 2][nextState] = metric;
+            }
+        }
+    }
+
+    // Forward recursion to compute alpha probabilities.
+    for (size_t t = t0; t < length; ++t) {
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
+                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
+                // Update the alpha value for the next state.
+                alpha[t + 1][nextState] = std::max(alpha[t + 1][nextState], alpha[t][state] + gamma(t, state, input));
+            }
+        }
+    }
+
+    // Radix-4 backward recursion: beta[t - 1] and beta[t - 2] are both computed from beta[t],
+    // every state taking the best of the four two-stage paths that leave it.
+    size_t t1 = length; // Last step left to the radix-2 recursion.
+    if (radix == 4) {
+        for (; t1 >= 2; t1 -= 2) {
+            // Step 1: Intermediate stage, exactly as in the radix-2 recursion.
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool second : {false, true}) {
+                    size_t nextState = computeNextState(state, second);
+                    beta[t1 - 1][state] = std::max(beta[t1 - 1][state], beta[t1][nextState] + gamma(t1 - 1, state, second));
+                }
+            }
+
+            // Step 2: First stage directly from beta[t1].
+            for (size_t state = 0; state < numStates; ++state) {
+                double metric = negInf;
+                for (bool first : {false, true}) {
+                    size_t midState = computeNextState(state, first);
+                    for (bool second : {false, true}) {
+                        size_t nextState = computeNextState(midState, second);
+                        metric = std::max(metric, beta[t1][nextState] + gamma(t1 - 1, midState, second) +
+                                                      gamma(t1 - 2, state, first));
+                    }
+                }
+                beta[t1 - 2][state] = metric;
+            }
+        }
+    }
+
+    // Backward recursion to compute beta probabilities.
+    for (size_t t = t1; t > 0; --t) {
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
+                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
+                // Update the beta value for the current state.
+                beta[t - 1][state] = std::max(beta[t - 1][state], beta[t][nextState] + gamma(t - 1, state, input));
+            }
+        }
+    }
+
+    // Compute LLRs (Log-Likelihood Ratios) for each bit in the sequence.
+    for (size_t t = 0; t < length; ++t) {
+        double prob0 = negInf; // Probability of bit being 0 (log domain).
+        double prob1 = negInf; // Probability of bit being 1 (log domain).
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) { // Evaluate both possible inputs (0 and 1).
+                size_t nextState = computeNextState(state, input); // Compute the next state for the given input.
+                // Compute the full metric for this transition.
+                double metric = alpha[t][state] + gamma(t, state, input) + beta[t + 1][nextState];
+                if (!input) // If input is 0, update prob0.
+                    prob0 = std::max(prob0, metric);
+                else // If input is 1, update prob1.
+                    prob1 = std::max(prob1, metric);
+            }
+        }
+        // The branch metrics carry half the log-likelihood of every bit, so the difference of the
+        // log probabilities is scaled by noiseVariance / 2 into channel-value units.
+        llr[t] = (prob1 - prob0) * (noiseVariance / 2.0);
+    }
+
+    return llr; // Return the calculated LLRs for the entire sequence.
+}
+
+/**
+ * @brief Decodes a sequence of received bits using a sliding-window BCJR algorithm.
+ *        Alpha runs continuously across windows, while the beta recursion of every window
+ *        starts warmupLength steps past its end from equiprobable states (as at the end of
+ *        the frame, whose trellis is not terminated). Only one window of alpha/beta values is
+ *        stored, so memory is O(windowSize x numStates) instead of O(length x numStates).
+ *        With a warm-up of a few constraint lengths the LLR signs match decodeBCJR; if the
+ *        warm-up reaches the end of the frame the output is identical.
+ * @param systematic The systematic bits received from the channel.
+ * @param parity The parity bits received from the channel.
+ * @param extrinsic The extrinsic information from previous iterations.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+ */
+std::vector<double> ConvolutionalCode::decodeBCJRWindowed(const std::vector<double>& systematic,
+                                                          const std::vector<double>& parity,
+                                                          const std::vector<double>& extrinsic,
+                                                          double noiseVariance) {
+    const double negInf = -std::numeric_limits<double>::infinity();
+    size_t length = systematic.size(); // Number of bits in the sequence.
+    size_t numStates = 1 << m; // Total number of states in the trellis.
+
+    // Branch metric at time step t of the branch leaving `state` on `input` (as in decodeBCJR).
+    const std::vector<double> gammas = branchMetrics(systematic, parity, extrinsic, noiseVariance);
+    auto gamma = [&](size_t t, size_t state, bool input) {
+        return gammas[4 * t + branchSymbols[(state << 1) | input]];
+    };
+
+    // One window of alpha and beta values.
+    std::vector<std::vector<double>> alpha(windowSize + 1, std::vector<double>(numStates, negInf));
+    std::vector<std::vector<double>> beta(windowSize + 1, std::vector<double>(numStates, negInf));
+    std::vector<double> boundary(numStates), previous(numStates);
+    std::vector<double> llr(length, 0.0);
+
+    alpha[0][0] = 0.0; // The encoder starts in state 0.
+
+    for (size_t start = 0; start < length; start += windowSize) {
+        size_t end = std::min(start + windowSize, length);
+        size_t steps = end - start;
+        if (start > 0)
+            alpha[0] = alpha[windowSize]; // Continue the forward recursion from the previous window.
+
+        // Forward recursion over the window.
+        for (size_t t = 0; t < steps; ++t) {
+            std::fill(alpha[t + 1].begin(), alpha[t + 1].end(), negInf);
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool input : {false, true}) {
+                    size_t nextState = computeNextState(state, input);
+                    alpha[t + 1][nextState] = std::max(alpha[t + 1][nextState], alpha[t][state] + gamma(start + t, state, input));
+                }
+            }
+        }
+
+        // Backward warm-up from the end of the warm-up region to the end of the window.
+        size_t stop = std::min(end + warmupLength, length);
+        std::fill(boundary.begin(), boundary.end(), 0.0); // Unknown state: all equiprobable.
+        for (size_t t = stop; t > end; --t) {
+            previous.swap(boundary);
+            std::fill(boundary.begin(), boundary.end(), negInf);
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool input : {false, true}) {
+                    size_t nextState = computeNextState(state, input);
+                    boundary[state] = std::max(boundary[state], previous[nextState] + gamma(t - 1, state, input));
+                }
+            }
+        }
+
+        // Backward recursion over the window.
+        beta[steps] = boundary;
+        for (size_t t = steps; t > 0; --t) {
+            std::fill(beta[t - 1].begin(), beta[t - 1].end(), negInf);
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool input : {false, true}) {
+                    size_t nextState = computeNextState(state, input);
+                    beta[t - 1][state] = std::max(beta[t - 1][state], beta[t][nextState] + gamma(start + t - 1, state, input));
+                }
+            }
+        }
+
+        // LLRs for the bits of this window.
+        for (size_t t = 0; t < steps; ++t) {
+            double prob0 = negInf;
+            double prob1 = negInf;
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool input : {false, true}) {
+                    size_t nextState = computeNextState(state, input);
+                    double metric = alpha[t][state] + gamma(start + t, state, input) + beta[t + 1][nextState];
+                    if (!input)
+                        prob0 = std::max(prob0, metric);
+                    else
+                        prob1 = std::max(prob1, metric);
+                }
+            }
+            llr[start + t] = (prob1 - prob0) * (noiseVariance / 2.0);
+        }
+    }
+
+    return llr;
+}
+
+/**
+ * @brief Decodes a sequence of received bits using parallel sub-block BCJR.
+ *        The frame is split into sub-blocks of ceil(length / subBlocks) steps (the last one
+ *        may be shorter), whose forward/backward recursions run concurrently, one thread
+ *        per sub-block. Inner boundaries are initialized from the previous iteration
+ *        ("next iteration initialization"): the alpha of a sub-block starts from the alpha
+ *        the previous sub-block ended with, and its beta from the beta the next sub-block
+ *        started with. In the first iteration of a frame they start equiprobable. Once the
+ *        boundary metrics have settled the LLRs match decodeBCJR.
+ * @param systematic The systematic bits received from the channel.
+ * @param parity The parity bits received from the channel.
+ * @param extrinsic The extrinsic information from previous iterations.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+ */
+std::vector<double> ConvolutionalCode::decodeBCJRSubBlocks(const std::vector<double>& systematic,
+                                                           const std::vector<double>& parity,
+                                                           const std::vector<double>& extrinsic,
+                                                           double noiseVariance) {
+    const double negInf = -std::numeric_limits<double>::infinity();
+    size_t length = systematic.size(); // Number of bits in the sequence.
+    size_t numStates = 1 << m; // Total number of states in the trellis.
+    size_t blockLength = (length + subBlocks - 1) / subBlocks;
+    size_t blocks = (length + blockLength - 1) / blockLength;
+
+    // Boundary metrics of the previous iteration (equiprobable when there are none).
+    if (subBlockAlpha.size() != blocks) {
+        subBlockAlpha.assign(blocks, std::vector<double>(numStates, 0.0));
+        subBlockBeta.assign(blocks, std::vector<double>(numStates, 0.0));
+    }
+    subBlockAlpha[0].assign(numStates, negInf);
+    subBlockAlpha[0][0] = 0.0; // The encoder starts in state 0,
+    subBlockBeta[blocks - 1].assign(numStates, 0.0); // and may end in any state.
+
+    // Branch metric at time step t of the branch leaving `state` on `input` (as in decodeBCJR).
+    const std::vector<double> gammas = branchMetrics(systematic, parity, extrinsic, noiseVariance);
+    auto gamma = [&](size_t t, size_t state, bool input) {
+        return gammas[4 * t + branchSymbols[(state << 1) | input]];
+    };
+
+    std::vector<double> llr(length, 0.0);
+    std::vector<std::vector<double>> alphaEnds(blocks), betaStarts(blocks);
+
+    // Decodes one sub-block; every thread writes only its own LLRs and boundary slots.
+    auto decodeBlock = [&](size_t block) {
+        size_t start = block * blockLength;
+        size_t steps = std::min(start + blockLength, length) - start;
+        std::vector<std::vector<double>> alpha(steps + 1, std::vector<double>(numStates, negInf));
+        std::vector<std::vector<double>> beta(steps + 1, std::vector<double>(numStates, negInf));
+        alpha[0] = subBlockAlpha[block];
+        beta[steps] = subBlockBeta[block];
+
+        // Forward recursion over the sub-block.
+        for (size_t t = 0; t < steps; ++t) {
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool input : {false, true}) {
+                    size_t nextState = computeNextState(state, input);
+                    alpha[t + 1][nextState] = std::max(alpha[t + 1][nextState], alpha[t][state] + gamma(start + t, state, input));
+                }
+            }
+        }
+
+        // Backward recursion over the sub-block.
+        for (size_t t = steps; t > 0; --t) {
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool input : {false, true}) {
+                    size_t nextState = computeNextState(state, input);
+                    beta[t - 1][state] = std::max(beta[t - 1][state], beta[t][nextState] + gamma(start + t - 1, state, input));
+                }
+            }
+        }
+
+        // LLRs for the bits of this sub-block.
+        for (size_t t = 0; t < steps; ++t) {
+            double prob0 = negInf;
+            double prob1 = negInf;
+            for (size_t state = 0; state < numStates; ++state) {
+                for (bool input : {false, true}) {
+                    size_t nextState = computeNextState(state, input);
+                    double metric = alpha[t][state] + gamma(start + t, state, input) + beta[t + 1][nextState];
+                    if (!input)
+                        prob0 = std::max(prob0, metric);
+                    else
+                        prob1 = std::max(prob1, metric);
+                }
+            }
+            llr[start + t] = (prob1 - prob0) * (noiseVariance / 2.0);
+        }
+
+        alphaEnds[block] = std::move(alpha[steps]);
+        betaStarts[block] = std::move(beta[0]);
+    };
+
+    std::vector<std::thread> workers;
+    for (size_t block = 1; block < blocks; ++block) {
+        if (subBlockThreads)
+            workers.emplace_back(decodeBlock, block);
+        else
+            decodeBlock(block);
+    }
+    decodeBlock(0);
+    for (auto& worker : workers)
+        worker.join();
+
+    // Keep the boundary metrics for the next iteration, normalized so their maximum is 0
+    // (metrics whose maximum is infinite are kept as they are).
+    auto normalized = [](std::vector<double> metrics) {
+        double maximum = *std::max_element(metrics.begin(), metrics.end());
+        if (std::isfinite(maximum)) {
+            for (double& metric : metrics)
+                metric -= maximum;
+        }
+        return metrics;
+    };
+    for (size_t block = 1; block < blocks; ++block) {
+        subBlockAlpha[block] = normalized(alphaEnds[block - 1]);
+        subBlockBeta[block - 1] = normalized(betaStarts[block]);
+    }
+
+    return llr;
+}
+
+/**
+ * @brief Decodes a sequence of received bits using a fixed-point BCJR algorithm.
+ *        Channel values scaled by 1/noiseVariance are quantized to saturated int8 LLRs
+ *        (fixedLlrScale steps per unit) and the path metrics are kept in int16. Every
+ *        fixedNormalizeInterval steps the metrics are shifted so their maximum is 0 and
+ *        clamped at fixedMetricFloor (which stands in for -infinity), keeping them well
+ *        inside the int16 range. The LLRs are returned as doubles so that they can be
+ *        exchanged as extrinsic information like those of decodeBCJR.
+ * @param systematic The systematic bits received from the channel.
+ * @param parity The parity bits received from the channel.
+ * @param extrinsic The extrinsic information from previous iterations.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+ */
+std::vector<double> ConvolutionalCode::decodeBCJRFixed(const std::vector<double>& systematic,
+                                                       const std::vector<double>& parity,
+                                                       const std::vector<double>& extrinsic,
+                                                       double noiseVariance) {
+    constexpr double fixedLlrScale = 8.0;         // Quantization steps per unit LLR.
+    constexpr int16_t fixedMetricFloor = -16384;  // Stands in for -infinity.
+    constexpr size_t fixedNormalizeInterval = 8;  // Steps between normalizations.
+    size_t length = systematic.size(); // Number of bits in the sequence.
+    size_t numStates = 1 << m; // Total number of states in the trellis.
+
+    // Quantize a channel value to a saturated int8 LLR.
+    auto quantize = [&](double value) -> int8_t {
+        double scaled = std::nearbyint(value * (fixedLlrScale / noiseVariance));
+        if (std::isnan(scaled))
+            return 0;
+        return static_cast<int8_t>(std::max(-127.0, std::min(127.0, scaled)));
+    };
+
+    // Branch metrics per time step, four per step indexed by channel symbol (see branchMetrics).
+    std::vector<int16_t> gammas(4 * length);
+    for (size_t t = 0; t < length; ++t) {
+        int inputs = quantize(systematic[t]) + quantize(extrinsic[t]);
+        int checks = quantize(parity[t]);
+        gammas[4 * t] = static_cast<int16_t>(-inputs - checks);
+        gammas[4 * t + 1] = static_cast<int16_t>(checks - inputs);
+        gammas[4 * t + 2] = static_cast<int16_t>(inputs - checks);
+        gammas[4 * t + 3] = static_cast<int16_t>(inputs + checks);
+    }
+    auto gamma = [&](size_t t, size_t state, bool input) -> int16_t {
+        return gammas[4 * t + branchSymbols[(state << 1) | input]];
+    };
+
+    // Shift a column of metrics so its maximum is 0 and clamp it at the floor.
+    auto normalize = [&](std::vector<int16_t>& metrics) {
+        int16_t maximum = *std::max_element(metrics.begin(), metrics.end());
+        for (auto& metric : metrics)
+            metric = static_cast<int16_t>(std::max<int>(metric - maximum, fixedMetricFloor));
+    };
+
+    std::vector<std::vector<int16_t>> alpha(length + 1, std::vector<int16_t>(numStates, fixedMetricFloor));
+    std::vector<std::vector<int16_t>> beta(length + 1, std::vector<int16_t>(numStates, fixedMetricFloor));
+    std::vector<double> llr(length, 0.0);
+
+    alpha[0][0] = 0; // The encoder starts in state 0.
+    std::fill(beta[length].begin(), beta[length].end(), int16_t(0)); // The frame may end in any state.
+
+    // Forward recursion.
+    for (size_t t = 0; t < length; ++t) {
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) {
+                size_t nextState = computeNextState(state, input);
+                int16_t metric = static_cast<int16_t>(alpha[t][state] + gamma(t, state, input));
+                alpha[t + 1][nextState] = std::max(alpha[t + 1][nextState], metric);
+            }
+        }
+        if ((t + 1) % fixedNormalizeInterval == 0)
+            normalize(alpha[t + 1]);
+    }
+
+    // Backward recursion.
+    for (size_t t = length; t > 0; --t) {
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) {
+                size_t nextState = computeNextState(state, input);
+                int16_t metric = static_cast<int16_t>(beta[t][nextState] + gamma(t - 1, state, input));
+                beta[t - 1][state] = std::max(beta[t - 1][state], metric);
+            }
+        }
+        if ((length - t + 1) % fixedNormalizeInterval == 0)
+            normalize(beta[t - 1]);
+    }
+
+    // LLRs, accumulated in 32 bits.
+    for (size_t t = 0; t < length; ++t) {
+        int32_t prob0 = std::numeric_limits<int32_t>::min();
+        int32_t prob1 = std::numeric_limits<int32_t>::min();
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) {
+                size_t nextState = computeNextState(state, input);
+                int32_t metric = int32_t(alpha[t][state]) + gamma(t, state, input) + beta[t + 1][nextState];
+                if (!input)
+                    prob0 = std::max(prob0, metric);
+                else
+                    prob1 = std::max(prob1, metric);
+            }
+        }
+        llr[t] = (prob1 - prob0) * (noiseVariance / (2.0 * fixedLlrScale)); // In channel-value units.
+    }
+
+    return llr;
+}
+
+/**
+ * @brief Decodes a sequence of received bits using the MAP (Maximum A Posteriori) algorithm.
+ *        "MAP" is the max-log approximation computed by decodeBCJR, so it simply reuses it;
+ *        see decodeLogMAP for the exact log-domain MAP decoder.
+ * @param systematic The systematic bits received from the channel.
+ * @param parity The parity bits received from the channel.
+ * @param extrinsic The extrinsic information from previous iterations.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+ */
+std::vector<double> ConvolutionalCode::decodeMAP(const std::vector<double>& systematic,
+                                                 const std::vector<double>& parity,
+                                                 const std::vector<double>& extrinsic,
+                                                 double noiseVariance) {
+    return decodeBCJR(systematic, parity, extrinsic, noiseVariance);
+}
+
+/**
+ * @brief Decodes a sequence of received bits using the log-MAP algorithm.
+ *        Same trellis as decodeBCJR, but every max is replaced by the max* operator
+ *        (max plus a table-driven Jacobian correction), giving exact MAP LLRs up to
+ *        the resolution of the correction table.
+ * @param systematic The systematic bits received from the channel.
+ * @param parity The parity bits received from the channel.
+ * @param extrinsic The extrinsic information from previous iterations.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+ */
+std::vector<double> ConvolutionalCode::decodeLogMAP(const std::vector<double>& systematic,
+                                                    const std::vector<double>& parity,
+                                                    const std::vector<double>& extrinsic,
+                                                    double noiseVariance) {
+    const double negInf = -std::numeric_limits<double>::infinity();
+    size_t length = systematic.size(); // Number of bits in the sequence.
+    size_t numStates = 1 << m; // Total number of states in the trellis.
+
+    // Branch metric at time step t of the branch leaving `state` on `input` (as in decodeBCJR).
+    const std::vector<double> gammas = branchMetrics(systematic, parity, extrinsic, noiseVariance);
+    auto gamma = [&](size_t t, size_t state, bool input) {
+        return gammas[4 * t + branchSymbols[(state << 1) | input]];
+    };
+
+    std::vector<std::vector<double>> alpha(length + 1, std::vector<double>(numStates, negInf));
+    std::vector<std::vector<double>> beta(length + 1, std::vector<double>(numStates, negInf));
+    std::vector<double> llr(length, 0.0);
+
+    alpha[0][0] = 0.0; // The encoder starts in state 0.
+    std::fill(beta[length].begin(), beta[length].end(), 0.0); // The frame may end in any state.
+
+    // Forward recursion.
+    for (size_t t = 0; t < length; ++t) {
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) {
+                size_t nextState = computeNextState(state, input);
+                alpha[t + 1][nextState] = maxStar(alpha[t + 1][nextState], alpha[t][state] + gamma(t, state, input));
+            }
+        }
+    }
+
+    // Backward recursion.
+    for (size_t t = length; t > 0; --t) {
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) {
+                size_t nextState = computeNextState(state, input);
+                beta[t - 1][state] = maxStar(beta[t - 1][state], beta[t][nextState] + gamma(t - 1, state, input));
+            }
+        }
+    }
+
+    // LLRs.
+    for (size_t t = 0; t < length; ++t) {
+        double prob0 = negInf;
+        double prob1 = negInf;
+        for (size_t state = 0; state < numStates; ++state) {
+            for (bool input : {false, true}) {
+                size_t nextState = computeNextState(state, input);
+                double metric = alpha[t][state] + gamma(t, state, input) + beta[t + 1][nextState];
+                if (!input)
+                    prob0 = maxStar(prob0, metric);
+                else
+                    prob1 = maxStar(prob1, metric);
+            }
+        }
+        llr[t] = (prob1 - prob0) * (noiseVariance / 2.0); // In channel-value units, as in decodeBCJR.
+    }
+
+    return llr;
+}
+
+/**
+ * @brief Returns the index of the lowest set bit of a non-zero word.
+ * @param word The word.
+ * @return The bit index.
+ */
+static unsigned lowestSetBit(uint64_t word) {
+#if defined(__GNUC__) || defined(__clang__)
+    return static_cast<unsigned>(__builtin_ctzll(word));
+#else
+    unsigned index = 0;
+    for (; !(word & 1); word >>= 1)
+        ++index;
+    return index;
+#endif
+}
+
+/**
+ * @brief Decodes a sequence of received bits using the SOVA (Soft Output Viterbi Algorithm) method.
+ *        SOVA combines soft information decoding with traceback for determining the most likely path.
+ *        The traceback is a register exchange over sovaDepth steps: every state carries the recent
+ *        decisions of its survivor with their reliabilities, and the oldest decision of the best
+ *        state is released at each step, so memory does not grow with the frame length. The
+ *        decisions are packed one bit per step, so the slots a competing path disagrees on are
+ *        found a word at a time and only those reliabilities are touched.
+ * @param systematic The systematic bits received from the channel.
+ * @param parity The parity bits received from the channel.
+ * @param extrinsic The extrinsic information from previous iterations.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+ */
+std::vector<double> ConvolutionalCode::decodeSOVA(const std::vector<double>& systematic,
+                                                  const std::vector<double>& parity,
+                                                  const std::vector<double>& extrinsic,
+                                                  double noiseVariance) {
+    size_t length = systematic.size(); // Number of bits in the sequence.
+    size_t numStates = 1 << m; // Total number of states in the trellis (2^m, where m is the memory size).
+    std::vector<double> llr(length, 0.0); // Store the LLRs.
+    if (length == 0)
+        return llr;
+    size_t depth = std::min(sovaDepth, length); // Decisions are released depth - 1 steps after they are made.
+
+    // Path metrics to track the likelihood of paths to each state.
+    std::vector<double> pathMetrics(numStates, -std::numeric_limits<double>::infinity());
+    std::vector<double> tempPathMetrics(numStates); // Temporary storage.
+    pathMetrics[0] = 0.0; // Initialize the starting state with probability 1 (log(1) = 0).
+
+    // Register exchange: row `state` holds the last `depth` decisions on the survivor into that
+    // state, slot t % depth holding the decision made at step t. The decided inputs are packed
+    // into `words` 64-bit words per row (a set bit is input 1) and their reliabilities are kept
+    // alongside; slots not yet written hold input 1 with infinite reliability.
+    const size_t words = (depth + 63) / 64;
+    std::vector<uint64_t> decisions(numStates * words, ~uint64_t(0));
+    std::vector<uint64_t> tempDecisions(numStates * words);
+    std::vector<double> reliabilities(numStates * depth, std::numeric_limits<double>::infinity());
+    std::vector<double> tempReliabilities(numStates * depth);
+    size_t topState = size_t(1) << (m - 1); // The two predecessors of a state differ in this bit.
+    auto release = [&](size_t state, size_t slot) { // The signed reliability of a decision.
+        bool input = (decisions[state * words + slot / 64] >> (slot % 64)) & 1;
+        return std::copysign(reliabilities[state * depth + slot], input ? 1.0 : -1.0);
+    };
+
+    // Branch metrics of the frame (see branchMetrics).
+    const std::vector<double> gammas = branchMetrics(systematic, parity, extrinsic, noiseVariance);
+
+    for (size_t t = 0; t < length; ++t) {
+        const double* gamma = &gammas[4 * t];
+        const size_t slot = t % depth;
+
+        for (size_t state = 0; state < numStates; ++state) {
+            // Step 1: Add-compare-select between the two paths merging into this state.
+            size_t prev0 = state >> 1;
+            size_t prev1 = prev0 | topState;
+            // Both paths enter the state on the same input, but their branches differ in the parity bit.
+            double metric0 = pathMetrics[prev0] + gamma[branchSymbols[(prev0 << 1) | (state & 1)]];
+            double metric1 = pathMetrics[prev1] + gamma[branchSymbols[(prev1 << 1) | (state & 1)]];
+            size_t survivor = metric1 > metric0 ? prev1 : prev0;
+            size_t competitor = survivor ^ topState;
+            double delta = std::fabs(metric1 - metric0);
+            tempPathMetrics[state] = std::max(metric0, metric1);
+
+            // Step 2: Take over the survivor's window, capping the reliability of every decision the
+            // competitor disagrees on by the metric difference (Hagenauer's rule). NaN and infinite
+            // deltas of unreachable states cap nothing.
+            const uint64_t* survivorWords = &decisions[survivor * words];
+            const uint64_t* competitorWords = &decisions[competitor * words];
+            uint64_t* rowWords = &tempDecisions[state * words];
+            double* row = &tempReliabilities[state * depth];
+            std::copy(survivorWords, survivorWords + words, rowWords);
+            std::copy(&reliabilities[survivor * depth], &reliabilities[survivor * depth] + depth, row);
+            if (delta < std::numeric_limits<double>::infinity()) {
+                for (size_t w = 0; w < words; ++w) {
+                    for (uint64_t differ = survivorWords[w] ^ competitorWords[w]; differ != 0; differ &= differ - 1) {
+                        size_t k = w * 64 + lowestSetBit(differ);
+                        row[k] = std::min(row[k], delta);
+                    }
+                }
+            }
+
+            // Step 3: Append the decision of this step.
+            rowWords[slot / 64] = (rowWords[slot / 64] & ~(uint64_t(1) << (slot % 64))) |
+                                  (uint64_t(state & 1) << (slot % 64));
+            row[slot] = std::numeric_limits<double>::infinity();
+        }
+        pathMetrics.swap(tempPathMetrics);
+        decisions.swap(tempDecisions);
+        reliabilities.swap(tempReliabilities);
+
+        // Step 4: Release the decision made depth - 1 steps ago from the best state.
+        if (t + 1 >= depth && t + 1 < length) {
+            size_t best = std::distance(pathMetrics.begin(), std::max_element(pathMetrics.begin(), pathMetrics.end()));
+            llr[t + 1 - depth] = release(best, (t + 1) % depth);
+        }
+    }
+
+    // Flush the rest of the window. The trellis is not terminated, so the final states compete
+    // with the best one on every decision they disagree on.
+    size_t best = std::distance(pathMetrics.begin(), std::max_element(pathMetrics.begin(), pathMetrics.end()));
+    for (size_t t = length - depth; t < length; ++t) {
+        double value = release(best, t % depth);
+        for (size_t state = 0; state < numStates; ++state) {
+            double delta = pathMetrics[best] - pathMetrics[state];
+            if (std::signbit(release(state, t % depth)) != std::signbit(value) && delta < std::fabs(value))
+                value = std::copysign(delta, value);
+        }
+        llr[t] = value;
+    }
+
+    // Path metric differences carry half the log-likelihood, as in decodeBCJR.
+    for (double& value : llr)
+        value *= noiseVariance / 2.0;
+
+    return llr; // Return the calculated LLRs for the entire sequence.
+}
+
+/**
+ * @brief Encodes a sequence of input bits using the convolutional encoder.
+ * @param input A vector of input bits (0s and 1s).
+ * @return A vector of pairs representing systematic and parity bits.
+ */
+std::vector<std::pair<uint8_t, uint8_t>> ConvolutionalCode::encode(const std::vector<uint8_t>& input) {
+    std::vector<std::pair<uint8_t, uint8_t>> output;
+    reset(); // Reset the internal state
+
+    for (auto bit : input) {
+        uint8_t systematicBit = bit;
+        uint8_t parityBit = computeNextOutput(state, bit);
+        state = computeNextState(state, bit);
+
+        output.emplace_back(systematicBit, parityBit);
+    }
+
+    return output;
+}
+
+/**
+ * @brief Returns the probability that a parity bit disagrees with the re-encoded input bits when
+ *        every received bit is flipped independently with probability `crossover`.
+ * @param crossover The crossover probability of the channel.
+ * @return The parity mismatch probability.
+ */
+double ConvolutionalCode::parityMismatchProbability(double crossover) const {
+    double flips = 0.0;
+    for (size_t w = 0; w < parityFlipWeights.size(); ++w)
+        flips += parityFlipWeights[w] * std::pow(crossover, w) * std::pow(1.0 - crossover, m + 1 - static_cast<double>(w));
+    return crossover + (1.0 - 2.0 * crossover) * flips;
+}
+
+/**
+ * @brief Estimates the crossover probability of a frame from its parity-check agreement.
+ * @param systematicBits The received input bits.
+ * @param parityBits The received parity bits of this encoder.
+ * @return The estimated crossover probability.
+ */
+double ConvolutionalCode::estimateCrossover(const std::vector<uint8_t>& systematicBits,
+                                            const std::vector<uint8_t>& parityBits) {
+    // Step 1: Count the received parity bits the re-encoded input bits disagree with.
+    auto encoded = encode(systematicBits);
+    size_t mismatches = 0;
+    for (size_t i = 0; i < encoded.size(); ++i)
+        mismatches += (encoded[i].second != 0) != (parityBits[i] != 0);
+    double mismatch = static_cast<double>(mismatches) / encoded.size();
+
+    // Step 2: Invert the mismatch probability, which grows with the crossover up to 0.5.
+    double low = 0.0, high = 0.5;
+    for (int step = 0; step < ADAPTIVE_BISECTION_STEPS; ++step) {
+        double middle = (low + high) / 2.0;
+        if (parityMismatchProbability(middle) > mismatch)
+            high = middle;
+        else
+            low = middle;
+    }
+    return low;
+}
+
+// DecodeCache class implementation
+
+/**
+ * @brief Opens a cache file, loading its entries and creating it if needed. Every line holds
+ *        "<16 hex digit hash> <16 hex digit check> <length> <iterations> <decoded output in hex>";
+ *        malformed lines (e.g. one cut short by a crash, or one written before entries carried
+ *        their check hash and length) are skipped.
+ * @param path The path of the cache file.
+ */
+DecodeCache::DecodeCache(const std::string& path) {
+    std::ifstream input(path);
+    std::string line;
+    while (std::getline(input, line)) {
+        // Step 1: Split the line into its five fields.
+        size_t spaces[4];
+        size_t position = 0;
+        bool valid = true;
+        for (size_t& space : spaces) {
+            space = valid ? line.find(' ', position) : std::string::npos;
+            valid = space != std::string::npos;
+            position = space + 1;
+        }
+        if (!valid || spaces[0] != 16 || spaces[1] != 33 || (line.size() - spaces[3] - 1) % 2 != 0)
+            continue;
+
+        // Step 2: Parse the key and the iteration count.
+        char* end = nullptr;
+        uint64_t hash = std::strtoull(line.c_str(), &end, 16);
+        valid = end == line.c_str() + spaces[0];
+        uint64_t check = std::strtoull(line.c_str() + spaces[0] + 1, &end, 16);
+        valid = valid && end == line.c_str() + spaces[1];
+        uint64_t length = std::strtoull(line.c_str() + spaces[1] + 1, &end, 10);
+        valid = valid && end == line.c_str() + spaces[2];
+        long iterations = std::strtol(line.c_str() + spaces[2] + 1, &end, 10);
+        if (!valid || end != line.c_str() + spaces[3] || iterations < 0)
+            continue;
+
+        // Step 3: Decode the hex output, two digits per byte.
+        auto hexValue = [](char digit) {
+            if (digit >= '0' && digit <= '9') return digit - '0';
+            if (digit >= 'a' && digit <= 'f') return digit - 'a' + 10;
+            return -1;
+        };
+        const size_t start = spaces[3] + 1;
+        Entry entry{check, length, std::string((line.size() - start) / 2, '\0'), static_cast<int>(iterations)};
+        for (size_t i = 0; i < entry.output.size() && valid; ++i) {
+            int high = hexValue(line[start + 2 * i]), low = hexValue(line[start + 2 * i + 1]);
+            valid = high >= 0 && low >= 0;
+            entry.output[i] = static_cast<char>(high << 4 | low);
+        }
+        if (valid)
+            entries.emplace(hash, std::move(entry));
+    }
+    // A last line cut short is ended first, so that the next entry starts on a line of its own.
+    input.clear();
+    bool unterminated = input.seekg(-1, std::ios::end) && input.get() != '\n';
+    input.close();
+    file.open(path, std::ios::app);
+    if (unterminated)
+        file << '\n';
+}
+
+/**
+ * @brief Returns whether the cache file could be opened for appending.
+ * @return True if new entries are saved to the file.
+ */
+bool DecodeCache::isOpen() const {
+    return file.is_open();
+}
+
+/**
+ * @brief Looks a key up. An entry with the same hash but another check hash or length
+ *        belongs to a different frame and is not returned.
+ * @param key The cache key.
+ * @param output Receives the cached decoded output.
+ * @param iterations Receives the cached number of iterations.
+ * @return True if the key is in the cache.
+ */
+bool DecodeCache::lookup(const DecodeCacheKey& key, std::string& output, int& iterations) {
+    std::lock_guard<std::mutex> lock(mutex);
+    auto entry = entries.find(key.hash);
+    if (entry == entries.end() || entry->second.check != key.check || entry->second.length != key.length)
+        return false;
+    output = entry->second.output;
+    iterations = entry->second.iterations;
+    return true;
+}
+
+/**
+ * @brief Stores a decoding result and appends it to the cache file.
+ *        A key hash that is already in the cache keeps its first result.
+ * @param key The cache key.
+ * @param output The decoded output.
+ * @param iterations The number of iterations run.
+ */
+void DecodeCache::store(const DecodeCacheKey& key, const std::string& output, int iterations) {
+    std::lock_guard<std::mutex> lock(mutex);
+    if (!entries.emplace(key.hash, Entry{key.check, key.length, output, iterations}).second || !file.is_open())
+        return;
+
+    // One line per entry; the output is written in hex so any byte fits on the line.
+    static const char digits[] = "0123456789abcdef";
+    std::string line(33, ' ');
+    uint64_t hash = key.hash, check = key.check;
+    for (int i = 15; i >= 0; --i, hash >>= 4, check >>= 4) {
+        line[i] = digits[hash & 0xF];
+        line[17 + i] = digits[check & 0xF];
+    }
+    line += ' ' + std::to_string(key.length) + ' ' + std::to_string(iterations) + ' ';
+    for (unsigned char byte : output) {
+        line += digits[byte >> 4];
+        line += digits[byte & 0xF];
+    }
+    file << line << '\n';
+}
+
+/**
+ * @brief Returns the number of cached entries.
+ * @return The number of entries.
+ */
+size_t DecodeCache::size() {
+    std::lock_guard<std::mutex> lock(mutex);
+    return entries.size();
+}
+
+// LLRFrameReader class implementation
+
+/**
+ * @brief Assembles a little-endian unsigned integer.
+ * @param bytes The bytes, least significant first.
+ * @param size The number of bytes (at most 4).
+ * @return The integer.
+ */
+static uint32_t readLittleEndian(const unsigned char* bytes, size_t size) {
+    uint32_t value = 0;
+    for (size_t i = size; i-- > 0;)
+        value = value << 8 | bytes[i];
+    return value;
+}
+
+/**
+ * @brief Reinterprets the bits of an IEEE 754 single-precision number.
+ * @param bits The 32 bits.
+ * @return The float.
+ */
+static float floatFromBits(uint32_t bits) {
+    float value;
+    std::memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+/**
+ * @brief Reads the header of a frame file.
+ * @param input The frame file, opened in binary mode.
+ */
+LLRFrameReader::LLRFrameReader(std::istream& input)
+    : input(input), valid(false), quantized(false), scale(1.0f), end(-1) {
+    // The file size bounds the records, so a corrupt value count is rejected before it is allocated.
+    std::streampos start = input.tellg();
+    if (start != std::streampos(-1) && input.seekg(0, std::ios::end)) {
+        end = static_cast<std::streamoff>(input.tellg());
+        input.seekg(start);
+    }
+    input.clear();
+
+    unsigned char header[12];
+    if (!input.read(reinterpret_cast<char*>(header), sizeof(header)))
+        return;
+    valid = std::memcmp(header, "TLLR", 4) == 0 && header[4] == 1 && header[5] <= 1;
+    quantized = header[5] == 1;
+    scale = floatFromBits(readLittleEndian(header + 8, 4));
+}
+
+/**
+ * @brief Returns whether the file is a valid frame file so far.
+ * @return False if the header is not valid or a record was cut short or runs past the end of the file.
+ */
+bool LLRFrameReader::isValid() const {
+    return valid;
+}
+
+/**
+ * @brief Reads the next frame.
+ * @param packetId Receives the packet id.
+ * @param llrs Receives the channel LLRs.
+ * @return False at the end of the file or on a malformed record (see isValid).
+ */
+bool LLRFrameReader::next(std::string& packetId, std::vector<double>& llrs) {
+    if (!valid)
+        return false;
+
+    // Step 1: Read the record header; a clean end of file ends the frames.
+    unsigned char record[6];
+    input.read(reinterpret_cast<char*>(record), sizeof(record));
+    if (input.gcount() == 0)
+        return false;
+    size_t idLength = readLittleEndian(record, 2);
+    size_t count = readLittleEndian(record + 2, 4);
+    size_t valueBytes = count * (quantized ? 1 : 4);
+    if (input.gcount() != sizeof(record) ||
+        (end >= 0 && static_cast<std::streamoff>(input.tellg()) + static_cast<std::streamoff>(idLength + valueBytes) > end)) {
+        valid = false;
+        return false;
+    }
+
+    // Step 2: Read the packet id and the raw values.
+    packetId.resize(idLength);
+    std::vector<unsigned char> values(valueBytes);
+    if (!input.read(&packetId[0], idLength) ||
+        !input.read(reinterpret_cast<char*>(values.data()), values.size())) {
+        valid = false;
+        return false;
+    }
+
+    // Step 3: Convert them to LLRs (int8 values are steps of 1 / scale).
+    llrs.resize(count);
+    for (size_t i = 0; i < count; ++i) {
+        llrs[i] = quantized ? static_cast<int8_t>(values[i]) / static_cast<double>(scale)
+                            : floatFromBits(readLittleEndian(&values[i * 4], 4));
+    }
+    return true;
+}
+
+// TurboCodec class implementation
+
+/**
+ * @brief Constructor for the TurboCodec class.
+ *        Initializes the encoders and sets default values for maxIterations and convergenceThreshold.
+ */
+TurboCodec::TurboCodec()
+    : encoder1(2, 3, {0b1011, 0b1111}), encoder2(2, 3, {0b1011, 0b1111}), maxIterations(20), convergenceThreshold(0.001),
+      lastIterations(0), stoppingCriteria(STOP_THRESHOLD), signChangeRatio(0.0), payloadValidator(hasValidCrc16),
+      interleaverType(INTERLEAVER_RANDOM), decodeCache(nullptr), tracing(false),
+      adaptiveNoise(false), hybridSchedule(HYBRID_ADAPTIVE) {}
+
+
+/**
+ * @brief Encodes an input string into a turbo-encoded string.
+ *        The Turbo Codec uses two convolutional encoders and an interleaver
+ *        to create a robust encoded representation of the input.
+ * @param input The input string to encode.
+ * @param output The encoded output string.
+ */
+void TurboCodec::encode(const std::string& input, std::string& output) {
+    // Step 1: Convert the input string into its binary representation.
+    // Each character in the input is expanded into 8 bits (ASCII encoding).
+    auto binaryInput = stringToBinary(input);
+
+    // Step 2: Encode the binary input using the first convolutional encoder.
+    // This generates systematic and parity bits for the input sequence.
+    auto encoded1 = encoder1.encode(binaryInput);
+
+    // Step 3: Apply the interleaver to the binary input.
+    // The input bits are permuted either by a random permutation table or by the QPP,
+    // whose positions are computed on the fly without a table.
+    const InterleaverPositions interleaver = interleaverPositions(binaryInput.size());
+    std::vector<uint8_t> permutedInput(binaryInput.size());
+    for (size_t i = 0; i < binaryInput.size(); ++i)
+        permutedInput[interleaver(i)] = binaryInput[i];
+
+    // Step 4: Encode the permuted input using the second convolutional encoder.
+    // This generates parity bits for the permuted sequence.
+    auto encoded2 = encoder2.encode(permutedInput);
+
+    // Step 5: Construct the final output by combining the systematic and parity bits.
+    // For each bit in the input sequence:
+    // - Add the systematic bit from the first encoder.
+    // - Add the parity bit from the first encoder.
+    // - Add the parity bit from the second encoder.
+    output.clear();
+    for (size_t i = 0; i < binaryInput.size(); ++i) {
+        output += (encoded1[i].first ? "1" : "0");   // Systematic bit from encoder1.
+        output += (encoded1[i].second ? "1" : "0");  // Parity bit from encoder1.
+        output += (encoded2[i].second ? "1" : "0");  // Parity bit from encoder2.
+    }
+}
+
+/**
+ * @brief Returns the interleaver positions of a frame for the selected interleaver.
+ * @param length The number of symbols in the frame.
+ * @return The random permutation table, or the QPP coefficients without a table.
+ */
+TurboCodec::InterleaverPositions TurboCodec::interleaverPositions(size_t length) const {
+    InterleaverPositions positions{{}, length, 1, 0};
+    if (interleaverType == INTERLEAVER_QPP)
+        qppCoefficients(length, positions.f1, positions.f2);
+    else
+        positions.table = generateInterleaver(length);
+    return positions;
+}
+
+/**
+ * @brief Checks whether a frame carries parity these encoders did not produce (see the header).
+ * @param systematic The systematic channel values.
+ * @param parity1 The parity values of the first encoder.
+ * @param systematic2 The systematic channel values in interleaved order.
+ * @param parity2 The parity values of the second encoder.
+ * @return True if the parity contradicts the encoders.
+ */
+bool TurboCodec::hasMismatchedParity(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                                     const std::vector<double>& systematic2, const std::vector<double>& parity2) {
+    if (systematic.empty())
+        return false;
+    // Estimate the crossover of each encoder from its parity checks, as estimateChannel does for encoder1.
+    size_t length = systematic.size();
+    std::vector<uint8_t> systematicBits(length), parityBits(length);
+    for (size_t i = 0; i < length; ++i) {
+        systematicBits[i] = systematic[i] > 0;
+        parityBits[i] = parity1[i] > 0;
+    }
+    double crossover = encoder1.estimateCrossover(systematicBits, parityBits);
+    for (size_t i = 0; i < length; ++i) {
+        systematicBits[i] = systematic2[i] > 0;
+        parityBits[i] = parity2[i] > 0;
+    }
+    crossover = std::max(crossover, encoder2.estimateCrossover(systematicBits, parityBits));
+    return crossover >= MISMATCHED_PARITY_CROSSOVER;
+}
+
+/**
+ * @brief Splits a frame of channel LLRs into its systematic and parity values.
+ * @param llrs The channel LLRs, ordered like the encoded bits (trailing values that do not
+ *             fill a symbol are ignored).
+ * @param systematic Receives the systematic values.
+ * @param parity1 Receives the parity values of the first encoder.
+ * @param parity2 Receives the parity values of the second encoder.
+ */
+void TurboCodec::splitLLRFrame(const std::vector<double>& llrs, std::vector<double>& systematic,
+                               std::vector<double>& parity1, std::vector<double>& parity2) {
+    size_t length = llrs.size() / 3;
+    systematic.resize(length);
+    parity1.resize(length);
+    parity2.resize(length);
+
+    for (size_t i = 0; i < length; ++i) {
+        systematic[i] = llrs[i * 3];
+        parity1[i] = llrs[i * 3 + 1];
+        parity2[i] = llrs[i * 3 + 2];
+    }
+}
+
+/**
+ * @brief Parses a turbo-encoded string into its systematic and parity channel values.
+ *        Every bit b becomes the bipolar channel value 2b - 1 (-1 for 0, +1 for 1).
+ * @param input The encoded input string (contains systematic and parity bits).
+ * @param systematic Receives the systematic values.
+ * @param parity1 Receives the parity values of the first encoder.
+ * @param parity2 Receives the parity values of the second encoder.
+ */
+void TurboCodec::parseFrame(const std::string& input, std::vector<double>& systematic,
+                            std::vector<double>& parity1, std::vector<double>& parity2) {
+    size_t length = input.size() / 3; // Each symbol contains one systematic and two parity bits.
+    systematic.resize(length);
+    parity1.resize(length);
+    parity2.resize(length);
+
+    for (size_t i = 0; i < length; ++i) {
+        systematic[i] = 2.0 * (input[i * 3] - '0') - 1.0;    // Extract systematic bit.
+        parity1[i] = 2.0 * (input[i * 3 + 1] - '0') - 1.0;  // Extract first parity bit.
+        parity2[i] = 2.0 * (input[i * 3 + 2] - '0') - 1.0;  // Extract second parity bit.
+    }
+}
+
+/**
+ * @brief Initializes the iteration state of a frame before its first iteration.
+ * @param systematic The systematic channel values of the frame.
+ * @param state The state to reset.
+ */
+void TurboCodec::resetIterationState(const std::vector<double>& systematic, IterationState& state) {
+    size_t length = systematic.size();
+    // These vectors store information exchanged between the two decoders during iterations.
+    state.extrinsic1.assign(length, 0.0);
+    state.extrinsic2.assign(length, 0.0);
+    state.aPosteriori = systematic; // Before the first iteration only the channel is known.
+    state.previousDecisions.assign(length, 0);
+    state.previousAgreement = false;
+    state.iterations = 0;
+    state.converged = false;
+    state.halfIterationSeconds.clear();
+    state.maxAbsLLR.clear();
+    state.escalated = false;
+    state.previousMeanAbsLLR = 0.0;
+}
+
+/**
+ * @brief Checks whether the last SOVA iteration of an adaptive HYBRID frame stopped making progress.
+ * @param aPosteriori The a-posteriori LLRs after the iteration.
+ * @param state The iteration state of the frame (previousMeanAbsLLR is updated).
+ * @return True if the frame should continue with MAP.
+ */
+bool TurboCodec::hasStalled(const std::vector<double>& aPosteriori, IterationState& state) {
+    // Step 1: Count the hard decisions that changed since the previous iteration.
+    size_t changed = 0;
+    double sum = 0.0;
+    for (size_t i = 0; i < aPosteriori.size(); ++i) {
+        changed += (aPosteriori[i] > 0 ? 1 : 0) != state.previousDecisions[i];
+        if (std::isfinite(aPosteriori[i]))
+            sum += std::fabs(aPosteriori[i]); // Diverged values count as 0, like an unreliable bit.
+    }
+
+    // Step 2: Compare the mean |LLR| with that of the previous iteration.
+    double length = static_cast<double>(std::max<size_t>(aPosteriori.size(), 1));
+    double meanAbsLLR = sum / length;
+    bool stalled = changed / length <= HYBRID_STALL_SIGN_CHANGES ||
+                   meanAbsLLR <= state.previousMeanAbsLLR * (1.0 + HYBRID_STALL_LLR_GAIN);
+    state.previousMeanAbsLLR = meanAbsLLR;
+    return stalled;
+}
+
+/**
+ * @brief Builds the trace of a frame from its iteration state.
+ * @param algorithm The decoding algorithm.
+ * @param state The iteration state after decoding.
+ * @return The trace.
+ */
+FrameTrace TurboCodec::makeTrace(const std::string& algorithm, const IterationState& state) {
+    FrameTrace trace;
+    trace.algorithm = algorithm;
+    trace.symbols = state.extrinsic1.size();
+    trace.iterations = state.iterations;
+    trace.converged = state.converged;
+    trace.cached = false;
+    trace.seconds = 0.0;
+    for (double seconds : state.halfIterationSeconds)
+        trace.seconds += seconds;
+    trace.halfIterationSeconds = state.halfIterationSeconds;
+    trace.maxAbsLLR = state.maxAbsLLR;
+    return trace;
+}
+
+/**
+ * @brief Builds the trace of a frame taken from the decode cache.
+ * @param algorithm The decoding algorithm.
+ * @param symbols The number of symbols in the frame.
+ * @param iterations The cached iteration count.
+ * @return The trace.
+ */
+FrameTrace TurboCodec::cachedTrace(const std::string& algorithm, size_t symbols, int iterations) {
+    FrameTrace trace;
+    trace.algorithm = algorithm;
+    trace.symbols = symbols;
+    trace.iterations = iterations;
+    trace.converged = false;
+    trace.cached = true;
+    trace.seconds = 0.0;
+    return trace;
+}
+
+/**
+ * @brief Runs decoding iterations until the stopping criteria fire or `stopAt` iterations have run.
+ *        Can be called again with a larger `stopAt` to continue from where it stopped.
+ * @param systematic The systematic channel values.
+ * @param parity1 The parity values of the first encoder.
+ * @param parity2 The parity values of the second encoder.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+ * @param state The iteration state to continue from (updated).
+ * @param stopAt The total number of iterations after which to stop.
+ */
+void TurboCodec::iterate(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                         const std::vector<double>& parity2, double noiseVariance, const std::string& algorithm,
+                         IterationState& state, int stopAt) {
+    using Decoder = std::vector<double> (ConvolutionalCode::*)(const std::vector<double>&, const std::vector<double>&,
+                                                               const std::vector<double>&, double);
+    std::vector<double>& extrinsic1 = state.extrinsic1;
+    std::vector<double>& extrinsic2 = state.extrinsic2;
+    size_t length = systematic.size();
+
+    // Decoder 2 works on the interleaved sequence, natural position i sitting at interleaved
+    // position interleaver(i) as in encode.
+    const InterleaverPositions interleaver = interleaverPositions(length);
+    std::vector<double> systematic2(length), apriori2(length), current(length);
+    std::vector<uint8_t> decisions1(length);
+    for (size_t i = 0; i < length; ++i)
+        systematic2[interleaver(i)] = systematic[i];
+
+    // Frames these encoders did not produce keep the decisions on their systematic values.
+    if (state.iterations == 0 && hasMismatchedParity(systematic, parity1, systematic2, parity2))
+        return;
+
+    // With tracing, every half-iteration records its time and the largest |LLR| it produced.
+    std::chrono::steady_clock::time_point start;
+    auto traceHalfIteration = [&](const std::vector<double>& extrinsic) {
+        auto end = std::chrono::steady_clock::now();
+        state.halfIterationSeconds.push_back(std::chrono::duration<double>(end - start).count());
+        double peak = 0.0;
+        for (double value : extrinsic) {
+            if (std::isnan(value)) {
+                peak = value; // A diverged decoder is reported as such.
+                break;
+            }
+            peak = std::max(peak, std::fabs(value));
+        }
+        state.maxAbsLLR.push_back(peak);
+        start = std::chrono::steady_clock::now();
+    };
+
+    for (; !state.converged && state.iterations < stopAt; ++state.iterations) {
+        // Select the appropriate decoding algorithm for both encoders.
+        Decoder decoder;
+        if (algorithm == "BCJR") {
+            decoder = &ConvolutionalCode::decodeBCJR;
+        } else if (algorithm == "MAP") {
+            decoder = &ConvolutionalCode::decodeMAP;
+        } else if (algorithm == "LOGMAP") {
+            decoder = &ConvolutionalCode::decodeLogMAP;
+        } else if (algorithm == "SOVA") {
+            decoder = &ConvolutionalCode::decodeSOVA;
+        } else if (algorithm == "HYBRID" && hybridSchedule == HYBRID_FIXED) {
+            // Use MAP for the first half of iterations, then switch to SOVA.
+            decoder = state.iterations < maxIterations / 2 ? &ConvolutionalCode::decodeMAP
+                                                           : &ConvolutionalCode::decodeSOVA;
+        } else if (algorithm == "HYBRID") {
+            // Use SOVA until the frame stalls, then switch to MAP.
+            decoder = state.escalated ? &ConvolutionalCode::decodeMAP : &ConvolutionalCode::decodeSOVA;
+        } else {
+            throw std::invalid_argument("Unsupported algorithm."); // Handle invalid algorithm input.
+        }
+
+        if (tracing)
+            start = std::chrono::steady_clock::now();
+        // Each decoder passes on only what it adds: its a-posteriori LLR minus its systematic
+        // and a-priori inputs.
+        std::vector<double> output = (encoder1.*decoder)(systematic, parity1, extrinsic2, noiseVariance);
+        for (size_t i = 0; i < length; ++i) {
+            decisions1[i] = output[i] > 0 ? 1 : 0;
+            extrinsic1[i] = output[i] - systematic[i] - extrinsic2[i];
+        }
+        if (tracing)
+            traceHalfIteration(extrinsic1);
+        for (size_t i = 0; i < length; ++i)
+            apriori2[interleaver(i)] = extrinsic1[i];
+        output = (encoder2.*decoder)(systematic2, parity2, apriori2, noiseVariance);
+        for (size_t i = 0; i < length; ++i) {
+            size_t j = interleaver(i);
+            extrinsic2[i] = output[j] - systematic2[j] - apriori2[j];
+        }
+        if (tracing)
+            traceHalfIteration(extrinsic2);
+
+        // The a-posteriori LLRs, whose signs are the decisions the decoder returns.
+        for (size_t i = 0; i < length; ++i)
+            current[i] = systematic[i] + extrinsic1[i] + extrinsic2[i];
+
+        // An adaptive HYBRID frame escalates to MAP once its SOVA iterations stall (from the second one).
+        if (decoder == &ConvolutionalCode::decodeSOVA && algorithm == "HYBRID" && hybridSchedule == HYBRID_ADAPTIVE &&
+            hasStalled(current, state) && state.iterations > 0)
+            state.escalated = true;
+
+        // Check the selected stopping criteria.
+        if (hasConverged(state.iterations, current, decisions1, state)) {
+            state.converged = true; // The iteration that converged is still counted.
+        }
+    }
+}
+
+/**
+ * @brief Decodes a turbo-encoded string using the specified decoding algorithm.
+ *        The decoder iteratively exchanges extrinsic information between two decoders
+ *        to refine the decoded output until convergence or the maximum number of iterations is reached.
+ * @param input The encoded input string (contains systematic and parity bits).
+ * @param output The decoded output string.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+ */
+void TurboCodec::decode(const std::string& input, std::string& output, double noiseVariance, const std::string& algorithm) {
+    lastTraces.clear();
+
+    // Step 0: Frames found in the decode cache are not decoded again.
+    DecodeCacheKey key{};
+    if (decodeCache != nullptr) {
+        key = cacheKey(input, noiseVariance, algorithm);
+        if (decodeCache->lookup(key, output, lastIterations)) {
+            if (tracing)
+                lastTraces.push_back(cachedTrace(algorithm, input.size() / 3, lastIterations));
+            return;
+        }
+    }
+
+    // Step 1: Parse the input into systematic and parity bits.
+    std::vector<double> systematic, parity1, parity2;
+    parseFrame(input, systematic, parity1, parity2);
+
+    // Step 2: Initialize the extrinsic information and stopping-criteria state.
+    IterationState state;
+    resetIterationState(systematic, state);
+    encoder1.resetBoundaryMetrics(); // Sub-block boundaries must not carry over from the previous frame.
+    encoder2.resetBoundaryMetrics();
+    int stopAt = maxIterations;
+    if (adaptiveNoise)
+        estimateChannel(systematic, parity1, parity2, false, noiseVariance, stopAt);
+
+    // Step 3: Iterative decoding process.
+    iterate(systematic, parity1, parity2, noiseVariance, algorithm, state, stopAt);
+    lastIterations = state.iterations;
+
+    // Step 4: Reconstruct the message from the signs of the a-posteriori LLRs.
+    output = hardDecisions(state.aPosteriori);
+
+    if (decodeCache != nullptr)
+        decodeCache->store(key, output, lastIterations);
+
+    // Step 5: Keep the trace of the frame (see getLastTraces).
+    if (tracing)
+        lastTraces.push_back(makeTrace(algorithm, state));
+}
+
+/**
+ * @brief Decodes a frame of soft channel LLRs using the specified decoding algorithm.
+ *        The LLRs carry their own reliability (a channel value divided by the noise variance,
+ *        positive favouring 1), so they are decoded with unit noise variance.
+ * @param llrs The channel LLRs, ordered like the encoded bits (systematic, parity 1, parity 2, ...).
+ * @param output The decoded output string.
+ * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+ */
+void TurboCodec::decodeLLR(const std::vector<double>& llrs, std::string& output, const std::string& algorithm) {
+    // Step 1: Split the LLRs into systematic and parity values.
+    std::vector<double> systematic, parity1, parity2;
+    splitLLRFrame(llrs, systematic, parity1, parity2);
+
+    // Step 2: Iterate from fresh extrinsic information, as decode does.
+    IterationState state;
+    resetIterationState(systematic, state);
+    encoder1.resetBoundaryMetrics();
+    encoder2.resetBoundaryMetrics();
+    double noiseVariance = LLR_NOISE_VARIANCE;
+    int stopAt = maxIterations;
+    if (adaptiveNoise)
+        estimateChannel(systematic, parity1, parity2, true, noiseVariance, stopAt);
+    iterate(systematic, parity1, parity2, noiseVariance, algorithm, state, stopAt);
+    lastIterations = state.iterations;
+    lastTraces.clear();
+    if (tracing)
+        lastTraces.push_back(makeTrace(algorithm, state));
+
+    // Step 3: Reconstruct the message from the signs of the a-posteriori LLRs.
+    output = hardDecisions(state.aPosteriori);
+}
+
+/**
+ * @brief Decodes a turbo-encoded string with several algorithms, sharing the work they have in common.
+ *        The frame is parsed once. MAP is the max-log decoder
+ *        computed by BCJR, so both share one run, and with HYBRID_FIXED HYBRID starts from the state
+ *        that run reached after maxIterations / 2 iterations instead of repeating its MAP half.
+ * @param input The encoded input string (contains systematic and parity bits).
+ * @param algorithms The decoding algorithms to run.
+ * @param outputs Receives the decoded output string of every algorithm, in the same order.
+ * @param iterations Receives the number of iterations run by every algorithm, in the same order.
+ * @param noiseVariance The variance of the noise in the channel.
+ */
+void TurboCodec::decodeAll(const std::string& input, const std::vector<std::string>& algorithms,
+                           std::vector<std::string>& outputs, std::vector<int>& iterations, double noiseVariance) {
+    std::vector<double> systematic, parity1, parity2;
+    lastTraces.clear();
+    if (decodeCache == nullptr) {
+        parseFrame(input, systematic, parity1, parity2);
+        decodeAllChannelValues(systematic, parity1, parity2, algorithms, outputs, iterations, noiseVariance, false);
+        return;
+    }
+
+    // Step 1: Take every algorithm found in the decode cache from there.
+    outputs.assign(algorithms.size(), std::string());
+    iterations.assign(algorithms.size(), 0);
+    std::vector<DecodeCacheKey> keys(algorithms.size());
+    std::vector<std::string> missing;
+    std::vector<size_t> missingIndices;
+    for (size_t i = 0; i < algorithms.size(); ++i) {
+        keys[i] = cacheKey(input, noiseVariance, algorithms[i]);
+        if (!decodeCache->lookup(keys[i], outputs[i], iterations[i])) {
+            missing.push_back(algorithms[i]);
+            missingIndices.push_back(i);
+        }
+    }
+
+    // Step 2: Decode the frame with the other algorithms, sharing their work, and cache the results.
+    if (!missing.empty()) {
+        std::vector<std::string> missingOutputs;
+        std::vector<int> missingIterations;
+        parseFrame(input, systematic, parity1, parity2);
+        decodeAllChannelValues(systematic, parity1, parity2, missing, missingOutputs, missingIterations,
+                               noiseVariance, false);
+        for (size_t j = 0; j < missing.size(); ++j) {
+            size_t i = missingIndices[j];
+            outputs[i] = missingOutputs[j];
+            iterations[i] = missingIterations[j];
+            decodeCache->store(keys[i], outputs[i], iterations[i]);
+        }
+    }
+
+    // Step 3: Merge the traces of the decoded algorithms with those of the cached ones.
+    if (tracing) {
+        std::vector<FrameTrace> traces;
+        for (size_t i = 0, j = 0; i < algorithms.size(); ++i) {
+            if (j < missingIndices.size() && missingIndices[j] == i)
+                traces.push_back(lastTraces[j++]);
+            else
+                traces.push_back(cachedTrace(algorithms[i], input.size() / 3, iterations[i]));
+        }
+        lastTraces.swap(traces);
+    }
+    if (!algorithms.empty())
+        lastIterations = iterations.back();
+}
+
+/**
+ * @brief Decodes a frame of soft channel LLRs with several algorithms, sharing the work they have
+ *        in common (see decodeAll). The decode cache is not used.
+ * @param llrs The channel LLRs, ordered like the encoded bits.
+ * @param algorithms The decoding algorithms to run.
+ * @param outputs Receives the decoded output string of every algorithm, in the same order.
+ * @param iterations Receives the number of iterations run by every algorithm, in the same order.
+ */
+void TurboCodec::decodeAllLLR(const std::vector<double>& llrs, const std::vector<std::string>& algorithms,
+                              std::vector<std::string>& outputs, std::vector<int>& iterations) {
+    std::vector<double> systematic, parity1, parity2;
+    splitLLRFrame(llrs, systematic, parity1, parity2);
+    decodeAllChannelValues(systematic, parity1, parity2, algorithms, outputs, iterations, LLR_NOISE_VARIANCE, true);
+}
+
+/**
+ * @brief Runs the constituent decoder of the first encoder once on a frame, with the current
+ *        decoder settings and without iterating.
+ * @param systematic The systematic channel values.
+ * @param parity The parity values of the first encoder.
+ * @param extrinsic The a-priori (extrinsic) information.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", or "SOVA").
+ * @return The a-posteriori LLRs of the decoder.
+ */
+std::vector<double> TurboCodec::decodeConstituent(const std::vector<double>& systematic, const std::vector<double>& parity,
+                                                  const std::vector<double>& extrinsic, double noiseVariance,
+                                                  const std::string& algorithm) {
+    encoder1.resetBoundaryMetrics();
+    if (algorithm == "BCJR")
+        return encoder1.decodeBCJR(systematic, parity, extrinsic, noiseVariance);
+    if (algorithm == "MAP")
+        return encoder1.decodeMAP(systematic, parity, extrinsic, noiseVariance);
+    if (algorithm == "LOGMAP")
+        return encoder1.decodeLogMAP(systematic, parity, extrinsic, noiseVariance);
+    if (algorithm == "SOVA")
+        return encoder1.decodeSOVA(systematic, parity, extrinsic, noiseVariance);
+    throw std::invalid_argument("Unsupported algorithm.");
+}
+
+/**
+ * @brief decodeAll without the decode cache, on parsed channel values.
+ * @param systematic The systematic channel values.
+ * @param parity1 The parity values of the first encoder.
+ * @param parity2 The parity values of the second encoder.
+ * @param algorithms The decoding algorithms to run.
+ * @param outputs Receives the decoded output string of every algorithm, in the same order.
+ * @param iterations Receives the number of iterations run by every algorithm, in the same order.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @param softInput Whether the values are LLRs (for the adaptive channel estimate).
+ */
+void TurboCodec::decodeAllChannelValues(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                                        const std::vector<double>& parity2, const std::vector<std::string>& algorithms,
+                                        std::vector<std::string>& outputs, std::vector<int>& iterations,
+                                        double noiseVariance, bool softInput) {
+    outputs.assign(algorithms.size(), std::string());
+    iterations.assign(algorithms.size(), 0);
+
+    // Step 1: Run the MAP iterations shared by BCJR, MAP and fixed HYBRID, keeping their state halfway.
+    bool needsMAP = false, needsHybrid = false;
+    for (const std::string& algorithm : algorithms) {
+        needsMAP |= algorithm == "BCJR" || algorithm == "MAP";
+        needsHybrid |= algorithm == "HYBRID" && hybridSchedule == HYBRID_FIXED;
+    }
+    int stopAt = maxIterations;
+    if (adaptiveNoise)
+        estimateChannel(systematic, parity1, parity2, softInput, noiseVariance, stopAt);
+    IterationState mapState, hybridState;
+    if (needsMAP || needsHybrid) {
+        resetIterationState(systematic, mapState);
+        encoder1.resetBoundaryMetrics();
+        encoder2.resetBoundaryMetrics();
+        iterate(systematic, parity1, parity2, noiseVariance, "MAP", mapState, std::min(maxIterations / 2, stopAt));
+        if (needsHybrid) {
+            // Step 2: HYBRID continues with SOVA from the halfway state (SOVA keeps no boundary metrics).
+            hybridState = mapState;
+            iterate(systematic, parity1, parity2, noiseVariance, "HYBRID", hybridState, stopAt);
+        }
+        if (needsMAP)
+            iterate(systematic, parity1, parity2, noiseVariance, "MAP", mapState, stopAt);
+    }
+
+    // Step 3: Collect the decisions, iteration counts and traces, running the remaining algorithms on their own.
+    //         The traces of BCJR, MAP and fixed HYBRID all include the MAP half-iterations they share.
+    lastTraces.clear();
+    for (size_t i = 0; i < algorithms.size(); ++i) {
+        if (algorithms[i] == "BCJR" || algorithms[i] == "MAP") {
+            outputs[i] = hardDecisions(mapState.aPosteriori);
+            iterations[i] = mapState.iterations;
+            if (tracing)
+                lastTraces.push_back(makeTrace(algorithms[i], mapState));
+        } else if (algorithms[i] == "HYBRID" && hybridSchedule == HYBRID_FIXED) {
+            outputs[i] = hardDecisions(hybridState.aPosteriori);
+            iterations[i] = hybridState.iterations;
+            if (tracing)
+                lastTraces.push_back(makeTrace(algorithms[i], hybridState));
+        } else {
+            IterationState state;
+            resetIterationState(systematic, state);
+            encoder1.resetBoundaryMetrics();
+            encoder2.resetBoundaryMetrics();
+            iterate(systematic, parity1, parity2, noiseVariance, algorithms[i], state, stopAt);
+            outputs[i] = hardDecisions(state.aPosteriori);
+            iterations[i] = state.iterations;
+            if (tracing)
+                lastTraces.push_back(makeTrace(algorithms[i], state));
+        }
+    }
+    if (!algorithms.empty())
+        lastIterations = iterations.back();
+}
+
+/**
+ * @brief Reconstructs the decoded message from the a-posteriori LLRs.
+ * @param aPosteriori The a-posteriori LLRs of the frame.
+ * @return The decoded string.
+ */
+std::string TurboCodec::hardDecisions(const std::vector<double>& aPosteriori) {
+    std::vector<uint8_t> reconstructedMessage(aPosteriori.size());
+    for (size_t i = 0; i < aPosteriori.size(); ++i) {
+        // A positive LLR indicates a bit of 1; otherwise, it's 0.
+        reconstructedMessage[i] = aPosteriori[i] > 0 ? 1 : 0;
+    }
+    // Convert the reconstructed binary message back to a string.
+    return binaryToString(reconstructedMessage);
+}
+
+/**
+ * @brief Evaluates the selected stopping criteria after a decoding iteration, on the signs of the
+ *        a-posteriori LLRs, which are exactly the decisions the decoder returns.
+ * @param iteration The index of the iteration that just finished.
+ * @param aPosteriori The a-posteriori LLRs after this iteration.
+ * @param decisions1 The hard decisions of the first decoder in this iteration.
+ * @param state The iteration state of the frame (aPosteriori, previousDecisions and
+ *              previousAgreement are updated).
+ * @return True if any selected criterion fires.
+ */
+bool TurboCodec::hasConverged(int iteration, const std::vector<double>& aPosteriori,
+                              const std::vector<uint8_t>& decisions1, IterationState& state) {
+    size_t length = aPosteriori.size();
+    bool converged = false;
+
+    std::vector<uint8_t> decisions(length);
+    for (size_t i = 0; i < length; ++i)
+        decisions[i] = aPosteriori[i] > 0 ? 1 : 0;
+
+    if (stoppingCriteria & STOP_THRESHOLD) {
+        // Maximum change of an a-posteriori LLR since the previous iteration.
+        double maxChange = 0.0;
+        for (size_t i = 0; i < length; ++i) {
+            double change = std::fabs(aPosteriori[i] - state.aPosteriori[i]);
+            if (std::isnan(change)) {
+                maxChange = change; // A diverged decoder never converges.
+                break;
+            }
+            maxChange = std::max(maxChange, change);
+        }
+        converged |= maxChange < convergenceThreshold;
+    }
+    if (stoppingCriteria & STOP_HDA) {
+        // Decoder 1 and the returned decisions must agree in two consecutive iterations.
+        bool agreement = decisions1 == decisions;
+        converged |= agreement && state.previousAgreement;
+        state.previousAgreement = agreement;
+    }
+    if ((stoppingCriteria & STOP_SCR) && iteration > 0 && length > 0) {
+        // Fraction of hard decisions that changed since the previous iteration.
+        size_t changed = 0;
+        for (size_t i = 0; i < length; ++i)
+            changed += decisions[i] != state.previousDecisions[i];
+        converged |= static_cast<double>(changed) / length <= signChangeRatio;
+    }
+    if ((stoppingCriteria & STOP_CRC) && payloadValidator) {
+        converged |= payloadValidator(binaryToString(decisions));
+    }
+
+    state.aPosteriori = aPosteriori;
+    state.previousDecisions.swap(decisions);
+    return converged;
+}
+
+/**
+ * @brief Computes the decode cache key of a frame: a 64-bit FNV-1a hash of the frame and of every
+ *        setting that affects its decoding, plus a second hash and the frame length that the cache
+ *        verifies on lookup. MAP and BCJR share keys, as they share one decoder.
+ * @param input The encoded input string.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @param algorithm The decoding algorithm.
+ * @return The cache key.
+ */
+DecodeCacheKey TurboCodec::cacheKey(const std::string& input, double noiseVariance, const std::string& algorithm) const {
+    // Step 1: Describe the settings; doubles are written in hex so that they are exact.
+    const int version = 3; // Bump when a change alters decoded outputs, so old cache entries stop matching.
+    std::ostringstream settings;
+    settings << std::hexfloat << version << '|' << (algorithm == "MAP" ? "BCJR" : algorithm);
+    if (algorithm == "HYBRID")
+        settings << '/' << (hybridSchedule == HYBRID_FIXED ? "fixed" : "adaptive");
+    settings << '|';
+    if (adaptiveNoise)
+        settings << "adaptive"; // Every frame is decoded with its own estimate.
+    else
+        settings << noiseVariance;
+    settings << '|' << maxIterations << '|' << convergenceThreshold << '|' << stoppingCriteria << '|'
+             << signChangeRatio << '|' << interleaverType << '|' << encoder1.describeSettings() << '|'
+             << encoder2.describeSettings() << '|';
+
+    // Step 2: Hash the settings followed by the frame, with FNV-1a and with a multiply-xorshift
+    //         hash that shares nothing with it, so a collision of one is caught by the other.
+    const std::string prefix = settings.str();
+    uint64_t hash = 14695981039346656037ULL;
+    uint64_t check = 0x243F6A8885A308D3ULL;
+    for (const std::string* part : {&prefix, &input}) {
+        for (unsigned char byte : *part) {
+            hash ^= byte;
+            hash *= 1099511628211ULL;
+            check = (check + byte + 1) * 0x9E3779B97F4A7C15ULL;
+            check ^= check >> 29;
+        }
+    }
+    return DecodeCacheKey{hash, check, input.size()};
+}
+
+/**
+ * @brief Makes decode and decodeAll look frames up in a decode cache first.
+ * @param cache The cache (not owned), or null to disable caching.
+ */
+void TurboCodec::setDecodeCache(DecodeCache* cache) {
+    decodeCache = cache;
+}
+
+/**
+ * @brief Selects the early-termination criteria.
+ * @param criteria A bitwise OR of StoppingCriterion flags.
+ * @param ratio The largest fraction of changed hard decisions accepted by STOP_SCR.
+ */
+void TurboCodec::setStoppingCriteria(int criteria, double ratio) {
+    stoppingCriteria = criteria;
+    signChangeRatio = ratio;
+}
+
+/**
+ * @brief Sets the payload check used by STOP_CRC.
+ * @param validator A function returning true for a valid decoded payload.
+ */
+void TurboCodec::setPayloadValidator(std::function<bool(const std::string&)> validator) {
+    payloadValidator = std::move(validator);
+}
+
+/**
+ * @brief Sets the maximum number of decoding iterations.
+ * @param iterations The maximum number of iterations.
+ */
+void TurboCodec::setMaxIterations(int iterations) {
+    maxIterations = iterations;
+}
+
+/**
+ * @brief Sets the convergence threshold for decoding.
+ * @param threshold The convergence threshold.
+ */
+void TurboCodec::setConvergenceThreshold(double threshold) {
+    convergenceThreshold = threshold;
+}
+/**
+ * @brief Returns the number of iterations run by the most recent call to decode.
+ * @return The number of decoding iterations.
+ */
+int TurboCodec::getLastIterations() const {
+    return lastIterations;
+}
+
+/**
+ * @brief Enables or disables per-frame tracing. While disabled, decodes collect nothing.
+ * @param enabled Whether to record a FrameTrace of every decoded frame.
+ */
+void TurboCodec::setTracing(bool enabled) {
+    tracing = enabled;
+    lastTraces.clear();
+}
+
+/**
+ * @brief Returns the traces of the most recent decode, one per algorithm.
+ * @return The frame traces.
+ */
+const std::vector<FrameTrace>& TurboCodec::getLastTraces() const {
+    return lastTraces;
+}
+
+/**
+ * @brief Decodes every frame with its own estimated noise variance and iteration budget.
+ * @param enabled Whether to estimate the channel of every frame.
+ */
+void TurboCodec::setAdaptiveNoise(bool enabled) {
+    adaptiveNoise = enabled;
+}
+
+/**
+ * @brief Selects when HYBRID switches between MAP and SOVA.
+ * @param value The HYBRID schedule.
+ */
+void TurboCodec::setHybridSchedule(HybridSchedule value) {
+    hybridSchedule = value;
+}
+
+/**
+ * @brief Estimates the noise variance and the iteration budget of a frame (see the header).
+ * @param systematic The systematic channel values.
+ * @param parity1 The parity values of the first encoder.
+ * @param parity2 The parity values of the second encoder.
+ * @param softInput Whether the values are LLRs.
+ * @param noiseVariance Receives the noise variance to decode the frame with.
+ * @param iterationBudget Receives the largest number of iterations to run.
+ */
+void TurboCodec::estimateChannel(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                                 const std::vector<double>& parity2, bool softInput, double& noiseVariance,
+                                 int& iterationBudget) {
+    // Step 1: Estimate the crossover probability from the parity checks of encoder1.
+    std::vector<uint8_t> systematicBits(systematic.size()), parityBits(parity1.size());
+    for (size_t i = 0; i < systematic.size(); ++i) {
+        systematicBits[i] = systematic[i] > 0;
+        parityBits[i] = parity1[i] > 0;
+    }
+    double crossover = encoder1.estimateCrossover(systematicBits, parityBits);
+    double clipped = std::min(std::max(crossover, ADAPTIVE_MIN_CROSSOVER), ADAPTIVE_MAX_CROSSOVER);
+    noiseVariance = 1.0 / std::log((1.0 - clipped) / clipped); // LLR ln((1 - p) / p) per hard bit.
+
+    // Step 2: For LLRs, the moments M2 = E[v^2] and M4 = E[v^4] give the signal power
+    //         sqrt((3 M2^2 - M4) / 2); the noise power is the rest of M2.
+    if (softInput) {
+        double m2 = 0.0, m4 = 0.0, peak = 0.0, lowest = std::numeric_limits<double>::infinity();
+        for (const std::vector<double>* values : {&systematic, &parity1, &parity2}) {
+            for (double value : *values) {
+                m2 += value * value;
+                m4 += value * value * value * value;
+                peak = std::max(peak, std::fabs(value));
+                lowest = std::min(lowest, std::fabs(value));
+            }
+        }
+        double count = 3.0 * systematic.size();
+        m2 = std::max(m2 / count, std::numeric_limits<double>::min());
+        m4 /= count;
+
+        if (peak - lowest <= 1e-6 * peak) {
+            // Hard decisions look noise-free to the moments: keep the BSC noise variance, rescaled.
+            noiseVariance *= peak;
+        } else {
+            double signal = std::sqrt(std::max(3.0 * m2 * m2 - m4, 0.0) / 2.0);
+            double snr = signal / (m2 - signal);
+            if (std::isnan(snr))
+                snr = ADAPTIVE_MIN_SNR;
+            snr = std::min(std::max(snr, ADAPTIVE_MIN_SNR), ADAPTIVE_MAX_SNR);
+            double noise = m2 / (1.0 + snr);
+            noiseVariance = noise / std::sqrt(m2 - noise);
+            crossover = std::max(crossover, 0.5 * std::erfc(std::sqrt(snr / 2.0)));
+        }
+    }
+
+    // Step 3: The iteration budget grows with the crossover probability.
+    double budget = std::ceil(maxIterations * crossover / ADAPTIVE_FULL_BUDGET_CROSSOVER);
+    iterationBudget = std::min(static_cast<int>(std::max<double>(budget, ADAPTIVE_MIN_ITERATIONS)), maxIterations);
+}
+
+/**
+ * @brief Enables sliding-window BCJR decoding in both constituent decoders.
+ * @param window The window length (0 decodes whole frames).
+ * @param warmup The number of backward warm-up steps before each window.
+ */
+void TurboCodec::setSlidingWindow(size_t window, size_t warmup) {
+    encoder1.setSlidingWindow(window, warmup);
+    encoder2.setSlidingWindow(window, warmup);
+}
+
+/**
+ * @brief Selects double or fixed-point BCJR/MAP decoding in both constituent decoders.
+ * @param value The decoder precision.
+ */
+void TurboCodec::setPrecision(Precision value) {
+    encoder1.setPrecision(value);
+    encoder2.setPrecision(value);
+}
+
+/**
+ * @brief Selects the interleaver of the second encoder.
+ * @param value The interleaver type.
+ */
+void TurboCodec::setInterleaver(InterleaverType value) {
+    interleaverType = value;
+}
+
+/**
+ * @brief Enables parallel sub-block BCJR/MAP decoding in both constituent decoders.
+ * @param count The number of sub-blocks per frame (1 decodes serially).
+ */
+void TurboCodec::setSubBlocks(size_t count) {
+    encoder1.setSubBlocks(count);
+    encoder2.setSubBlocks(count);
+}
+
+/**
+ * @brief Selects whether the sub-blocks run on threads of their own in both constituent decoders.
+ * @param enabled Whether to start a thread per sub-block.
+ */
+void TurboCodec::setSubBlockThreads(bool enabled) {
+    encoder1.setSubBlockThreads(enabled);
+    encoder2.setSubBlockThreads(enabled);
+}
+
+/**
+ * @brief Selects radix-2 or radix-4 BCJR/MAP recursions in both constituent decoders.
+ * @param value The radix (2 or 4).
+ */
+void TurboCodec::setRadix(unsigned value) {
+    encoder1.setRadix(value);
+    encoder2.setRadix(value);
+}
+
+/**
+ * @brief Sets the SOVA register-exchange depth of both constituent decoders.
+ * @param depth The number of trellis steps after which a decision is released.
+ */
+void TurboCodec::setSovaDepth(size_t depth) {
+    encoder1.setSovaDepth(depth);
+    encoder2.setSovaDepth(depth);
+}
+
+// C interface implementation
+
+TurboCodec* TurboCodec_new() { return new TurboCodec(); }
+void TurboCodec_delete(TurboCodec* codec) { delete codec; }
+
+int64_t TurboCodec_encode(TurboCodec* codec, const char* input, size_t inputLength,
+                          char* output, size_t outputCapacity) {
+    if (outputCapacity < inputLength * 24)
+        return TURBO_CODEC_ERROR_BUFFER_TOO_SMALL; // 8 bits per byte, 3 encoded bits per bit.
+
+    std::string encoded;
+    try {
+        codec->encode(std::string(input, inputLength), encoded);
+    } catch (const std::domain_error&) {
+        return TURBO_CODEC_ERROR_UNSUPPORTED_LENGTH;
+    }
+    std::copy(encoded.begin(), encoded.end(), output);
+    return static_cast<int64_t>(encoded.size());
+}
+
+int64_t TurboCodec_decode(TurboCodec* codec, const char* input, size_t inputLength,
+                          char* output, size_t outputCapacity,
+                          double noiseVariance, const char* algorithm) {
+    if (outputCapacity < (inputLength / 3 + 7) / 8)
+        return TURBO_CODEC_ERROR_BUFFER_TOO_SMALL;
+
+    std::string decoded;
+    try {
+        codec->decode(std::string(input, inputLength), decoded, noiseVariance, algorithm);
+    } catch (const std::invalid_argument&) {
+        return TURBO_CODEC_ERROR_UNSUPPORTED_ALGORITHM; // Exceptions must not cross the C boundary.
+    } catch (const std::domain_error&) {
+        return TURBO_CODEC_ERROR_UNSUPPORTED_LENGTH;
+    }
+    std::copy(decoded.begin(), decoded.end(), output);
+    return static_cast<int64_t>(decoded.size());
+}
+
+int64_t TurboCodec_decodeLLR(TurboCodec* codec, const float* llrs, size_t count,
+                             char* output, size_t outputCapacity, const char* algorithm) {
+    if (outputCapacity < (count / 3 + 7) / 8)
+        return TURBO_CODEC_ERROR_BUFFER_TOO_SMALL;
+
+    std::string decoded;
+    try {
+        codec->decodeLLR(std::vector<double>(llrs, llrs + count), decoded, algorithm);
+    } catch (const std::invalid_argument&) {
+        return TURBO_CODEC_ERROR_UNSUPPORTED_ALGORITHM;
+    } catch (const std::domain_error&) {
+        return TURBO_CODEC_ERROR_UNSUPPORTED_LENGTH;
+    }
+    std::copy(decoded.begin(), decoded.end(), output);
+    return static_cast<int64_t>(decoded.size());
+}
+
+int64_t TurboCodec_decodeConstituent(TurboCodec* codec, const double* systematic, const double* parity,
+                                     const double* extrinsic, size_t length, double noiseVariance,
+                                     const char* algorithm, double* llrs) {
+    std::vector<double> output;
+    try {
+        output = codec->decodeConstituent(std::vector<double>(systematic, systematic + length),
+                                          std::vector<double>(parity, parity + length),
+                                          std::vector<double>(extrinsic, extrinsic + length), noiseVariance, algorithm);
+    } catch (const std::invalid_argument&) {
+        return TURBO_CODEC_ERROR_UNSUPPORTED_ALGORITHM;
+    }
+    std::copy(output.begin(), output.end(), llrs);
+    return static_cast<int64_t>(output.size());
+}
+
+void TurboCodec_setMaxIterations(TurboCodec* codec, int iterations) {
+    codec->setMaxIterations(iterations);
+}
+
+void TurboCodec_setConvergenceThreshold(TurboCodec* codec, double threshold) {
+    codec->setConvergenceThreshold(threshold);
+}
+
+void TurboCodec_setStoppingCriteria(TurboCodec* codec, int criteria, double ratio) {
+    codec->setStoppingCriteria(criteria, ratio);
+}
+
+void TurboCodec_setPayloadValidator(TurboCodec* codec, int (*validator)(const char* payload, size_t length)) {
+    if (validator == nullptr) {
+        codec->setPayloadValidator(hasValidCrc16);
+        return;
+    }
+    codec->setPayloadValidator([validator](const std::string& payload) {
+        return validator(payload.data(), payload.size()) != 0;
+    });
+}
+
+void TurboCodec_setSlidingWindow(TurboCodec* codec, size_t window, size_t warmup) {
+    codec->setSlidingWindow(window, warmup);
+}
+
+void TurboCodec_setPrecision(TurboCodec* codec, int precision) {
+    codec->setPrecision(static_cast<Precision>(precision));
+}
+
+void TurboCodec_setInterleaver(TurboCodec* codec, int interleaver) {
+    codec->setInterleaver(static_cast<InterleaverType>(interleaver));
+}
+
+void TurboCodec_setSubBlocks(TurboCodec* codec, size_t count) {
+    codec->setSubBlocks(count);
+}
+
+void TurboCodec_setRadix(TurboCodec* codec, unsigned radix) {
+    codec->setRadix(radix);
+}
+
+void TurboCodec_setSovaDepth(TurboCodec* codec, size_t depth) {
+    codec->setSovaDepth(depth);
+}
+
+int TurboCodec_getLastIterations(const TurboCodec* codec) {
+    return codec->getLastIterations();
+}
+
+void TurboCodec_setTracing(TurboCodec* codec, int enabled) {
+    codec->setTracing(enabled != 0);
+}
+
+void TurboCodec_setAdaptiveNoise(TurboCodec* codec, int enabled) {
+    codec->setAdaptiveNoise(enabled != 0);
+}
+
+void TurboCodec_setHybridSchedule(TurboCodec* codec, int schedule) {
+    codec->setHybridSchedule(static_cast<HybridSchedule>(schedule));
+}
+
+int64_t TurboCodec_getLastTrace(const TurboCodec* codec, double* halfIterationSeconds, double* maxAbsLLR,
+                                size_t capacity, int* status) {
+    const std::vector<FrameTrace>& traces = codec->getLastTraces();
+    if (traces.empty())
+        return TURBO_CODEC_ERROR_NO_TRACE;
+    const FrameTrace& trace = traces.back();
+    if (capacity < trace.halfIterationSeconds.size())
+        return TURBO_CODEC_ERROR_BUFFER_TOO_SMALL;
+    std::copy(trace.halfIterationSeconds.begin(), trace.halfIterationSeconds.end(), halfIterationSeconds);
+    std::copy(trace.maxAbsLLR.begin(), trace.maxAbsLLR.end(), maxAbsLLR);
+    *status = trace.cached ? 2 : trace.converged ? 1 : 0;
+    return static_cast<int64_t>(trace.halfIterationSeconds.size());
+}
@@ -0,0 +1,325 @@
+# benchmark.py
+"""Throughput benchmark of the turbo decoders: turbo_codec.py, the C++ codec and Csv_Reader_Writer.
+
+Every case (backend, algorithm, workload, iteration limit) runs in a fresh process
+and reports frames/s, decoded bits/s, time per iteration and peak memory. The
+workloads are frames recorded in Turbo_Codes_Data.csv and synthetic frames of
+chosen payload lengths (random bytes, turbo-encoded and sent through a binary
+symmetric channel with a fixed seed). HYBRID runs once per schedule (see
+TurboCodec.set_hybrid_schedule) and the average decode time per frame of the adaptive
+schedule is reported against the fixed one. Results are saved as JSON; --compare
+reports the cases that got slower than in an earlier results file.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import resource  # Peak memory (Unix only)
+except ImportError:
+    resource = None
+
+from ber_simulation import CHANNEL_BSC, channel_llrs
+from frame_csv import read_frames
+from turbo_codec import HYBRID_ADAPTIVE, HYBRID_FIXED, HYBRID_SCHEDULES, TurboCodec, bytes_to_bits
+
+BACKEND_PYTHON = "python"  # turbo_codec.TurboCodec.decode_batch
+BACKEND_NATIVE = "native"  # The C++ codec through turbo_codec_native
+BACKEND_CLI = "cli"        # The Csv_Reader_Writer executable, including process start-up and file I/O
+BACKENDS = [BACKEND_PYTHON, BACKEND_NATIVE, BACKEND_CLI]
+ALGORITHMS = ["BCJR", "MAP", "SOVA", "HYBRID"]
+CLI_MAX_ITERATIONS = 20  # Csv_Reader_Writer always decodes with 20 iterations
+DEFAULT_INPUT = "Turbo_Codes_Data.csv"
+DEFAULT_CLI = "./Csv_Reader_Writer"
+
+# Keys that identify a case when comparing two results files
+CASE_KEYS = ("backend", "algorithm", "workload", "max_iterations", "hybrid_schedule")
+
+
+def recorded_workload(path: str, count: int) -> List[str]:
+    """Returns the first `count` encoded frames of a recorded log."""
+    frames = []
+    for _, frame in read_frames(path):
+        if len(frames) == count:
+            break
+        frames.append(frame)
+    return frames
+
+
+def synthetic_workload(payload_length: int, count: int, ebn0_db: float, seed: int) -> List[str]:
+    """Returns `count` encoded '0'/'1' frames of random printable payloads received through a BSC."""
+    rng = np.random.default_rng(seed)
+    codec = TurboCodec()
+    payloads = rng.integers(32, 127, (count, payload_length), dtype=np.uint8)
+    encoded = np.array([bytes_to_bits(codec.encode_packed(payload)) for payload in payloads])
+    received = (channel_llrs(encoded, ebn0_db, CHANNEL_BSC, rng) > 0).astype(np.uint8)
+    return [(row + ord("0")).tobytes().decode("ascii") for row in received]
+
+
+def _peak_rss_bytes(pid: str = "self") -> Optional[int]:
+    """Returns the peak resident set size of a process, or None when it cannot be read.
+
+    On Linux this is VmHWM, which starts afresh in every executed program; ru_maxrss
+    would also count the memory of the Python process that started it.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if pid != "self" or resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def _decode_all(codec, groups: List[List[str]], noise_variance: float, algorithm: str) -> int:
+    """Decodes every frame group once, returning the total number of iterations run."""
+    iterations = 0
+    for group in groups:
+        iterations += sum(codec.decode_batch(group, noise_variance, algorithm)[1])
+    return iterations
+
+
+def run_case(case: Dict[str, object]) -> Dict[str, object]:
+    """Runs one benchmark case in the current process, returning its result row.
+
+    The frames are decoded once to warm up, then `repeats` times; the fastest run is
+    reported. Memory is the peak resident set size of the process and its growth over
+    the size before the first decode, plus (Python backend) the peak of the Python
+    allocations in one traced run.
+    """
+    backend, algorithm, frames = case["backend"], case["algorithm"], case["frames"]
+    noise_variance, repeats = case["noise_variance"], case["repeats"]
+    if backend == BACKEND_NATIVE:
+        import turbo_codec_native
+        codec = turbo_codec_native.TurboCodec()
+    else:
+        codec = TurboCodec()
+    codec.set_max_iterations(case["max_iterations"])
+    if case["hybrid_schedule"] is not None:
+        codec.set_hybrid_schedule(case["hybrid_schedule"])
+
+    # Frames of the same length are decoded together, as parallel_decode does
+    by_length: Dict[int, List[str]] = {}
+    for frame in frames:
+        by_length.setdefault(len(frame), []).append(frame)
+    groups = list(by_length.values())
+
+    rss_before = _peak_rss_bytes()
+    _decode_all(codec, groups, noise_variance, algorithm)
+    best, iterations = float("inf"), 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        iterations = _decode_all(codec, groups, noise_variance, algorithm)
+        best = min(best, time.perf_counter() - start)
+    rss_peak = _peak_rss_bytes()
+
+    traced_peak = None
+    if backend == BACKEND_PYTHON:
+        tracemalloc.start()
+        _decode_all(codec, groups, noise_variance, algorithm)
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    rss_growth = rss_peak - rss_before if rss_peak is not None else None
+    return _result_row(case, best, iterations, rss_peak, rss_growth, traced_peak)
+
+
+def run_cli_case(case: Dict[str, object], cli: str) -> Dict[str, object]:
+    """Runs Csv_Reader_Writer on a workload `repeats` times, returning the result row of the fastest run."""
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "frames.csv")
+        with open(input_path, "wb") as input_file:
+            for i, frame in enumerate(case["frames"]):
+                # The same line layout as the recorded logs: "<id>,<frame>\r\n'" and a CRLF
+                input_file.write(f"{i},{frame}\\r\\n'\r\n".encode("ascii"))
+        command = [cli, "-q", "-j", "1", "-a", case["algorithm"], "-o", directory, input_path]
+        if case["hybrid_schedule"] is not None:
+            command[-1:-1] = ["--hybrid-schedule", case["hybrid_schedule"]]
+        best = float("inf")
+        for _ in range(case["repeats"]):
+            start = time.perf_counter()
+            returncode = subprocess.call(command)
+            if returncode != 0:
+                raise RuntimeError(f"{cli} exited with status {returncode}")
+            best = min(best, time.perf_counter() - start)
+
+        # One more, untimed, run samples the peak memory of the executable while it runs
+        peak = None
+        process = subprocess.Popen(command)
+        while process.poll() is None:
+            peak = max(peak or 0, _peak_rss_bytes(str(process.pid)) or 0) or None
+            time.sleep(0.001)
+    return _result_row(case, best, None, peak, None, None)
+
+
+def _result_row(case: Dict[str, object], seconds: float, iterations: Optional[int], peak_rss_bytes: Optional[int],
+                rss_growth_bytes: Optional[int], peak_traced_bytes: Optional[int]) -> Dict[str, object]:
+    frames = case["frames"]
+    bits = sum(len(frame) // 3 for frame in frames)  # One decoded bit per symbol
+    return {"backend": case["backend"], "algorithm": case["algorithm"], "workload": case["workload"],
+            "max_iterations": case["max_iterations"], "hybrid_schedule": case["hybrid_schedule"],
+            "frames": len(frames), "frame_bits": bits // max(len(frames), 1), "seconds": seconds,
+            "seconds_per_frame": seconds / len(frames), "frames_per_s": len(frames) / seconds,
+            "bits_per_s": bits / seconds,
+            "iterations_per_frame": iterations / len(frames) if iterations is not None else None,
+            "seconds_per_iteration": seconds / iterations if iterations else None,
+            "peak_rss_bytes": peak_rss_bytes, "rss_growth_bytes": rss_growth_bytes,
+            "peak_traced_bytes": peak_traced_bytes}
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _native_available() -> bool:
+    try:
+        import turbo_codec_native
+        turbo_codec_native.TurboCodec()
+        return True
+    except OSError:
+        return False
+
+
+def compare_results(old: Dict[str, object], new: Dict[str, object], tolerance: float) -> List[str]:
+    """Returns a line per case whose frames/s dropped by more than `tolerance` against an earlier run."""
+    # Results saved before HYBRID had schedules lack hybrid_schedule; they ran the fixed one
+    old_rows = {}
+    for row in old["results"]:
+        row.setdefault("hybrid_schedule", HYBRID_FIXED if row["algorithm"] == "HYBRID" else None)
+        old_rows[tuple(row[key] for key in CASE_KEYS)] = row
+    regressions = []
+    for row in new["results"]:
+        previous = old_rows.get(tuple(row[key] for key in CASE_KEYS))
+        if previous is not None and row["frames_per_s"] < previous["frames_per_s"] * (1 - tolerance):
+            algorithm = f"{row['algorithm']}/{row['hybrid_schedule']}" if row["hybrid_schedule"] else row["algorithm"]
+            regressions.append(f"{row['backend']} {algorithm} {row['workload']} "
+                               f"({row['max_iterations']} iterations): {previous['frames_per_s']:.2f} -> "
+                               f"{row['frames_per_s']:.2f} frames/s")
+    return regressions
+
+
+def hybrid_schedule_report(results: List[Dict[str, object]]) -> List[str]:
+    """Returns a line per case comparing the average decode time per frame of the adaptive and fixed HYBRID schedules."""
+    schedules: Dict[tuple, Dict[str, Dict[str, object]]] = {}
+    for row in results:
+        if row["hybrid_schedule"] is not None:
+            case = (row["backend"], row["workload"], row["max_iterations"])
+            schedules.setdefault(case, {})[row["hybrid_schedule"]] = row
+    lines = []
+    for (backend, workload, max_iterations), rows in schedules.items():
+        if HYBRID_ADAPTIVE in rows and HYBRID_FIXED in rows:
+            adaptive, fixed = rows[HYBRID_ADAPTIVE], rows[HYBRID_FIXED]
+            lines.append(f"{backend} {workload} ({max_iterations} iterations): "
+                         f"{adaptive['seconds_per_frame'] * 1000:.3f} ms/frame adaptive, "
+                         f"{fixed['seconds_per_frame'] * 1000:.3f} ms/frame fixed "
+                         f"({adaptive['seconds_per_frame'] / fixed['seconds_per_frame']:.2f}x)")
+    return lines
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput benchmark of the turbo decoders.")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=ALGORITHMS, default=ALGORITHMS)
+    parser.add_argument("--input", default=DEFAULT_INPUT, help="recorded frames CSV file ('' to skip)")
+    parser.add_argument("--frames", type=int, default=16, help="frames per workload")
+    parser.add_argument("--lengths", nargs="*", type=int, default=[16, 64],
+                        help="payload lengths (bytes) of the synthetic workloads")
+    parser.add_argument("--iterations", nargs="+", type=int, default=[5, 20],
+                        help="maximum iteration counts (Csv_Reader_Writer always uses 20)")
+    parser.add_argument("--hybrid-schedules", nargs="+", choices=HYBRID_SCHEDULES, default=list(HYBRID_SCHEDULES),
+                        help="HYBRID schedules to run")
+    parser.add_argument("--ebn0", type=float, default=4.0, help="Eb/N0 (dB) of the synthetic frames")
+    parser.add_argument("--noise-variance", type=float, default=0.5, help="noise variance given to the decoders")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per case (the fastest is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cli", default=DEFAULT_CLI, help="Csv_Reader_Writer executable")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="results JSON file")
+    parser.add_argument("--compare", default=None, help="earlier results JSON file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="frames/s drop reported as a regression")
+    args = parser.parse_args(argv)
+
+    workloads = {}
+    if args.input:
+        if not os.path.exists(args.input):
+            print(f"Failed to open input file: {args.input}", file=sys.stderr)
+            return 1
+        workloads["recorded"] = recorded_workload(args.input, args.frames)
+    for length in args.lengths:
+        workloads[f"synthetic-{length}"] = synthetic_workload(length, args.frames, args.ebn0, args.seed + length)
+
+    backends = list(args.backends)
+    if BACKEND_NATIVE in backends and not _native_available():
+        print("Skipping the native backend: the TurboCodec shared library could not be loaded.", file=sys.stderr)
+        backends.remove(BACKEND_NATIVE)
+    if BACKEND_CLI in backends and not os.access(args.cli, os.X_OK):
+        print(f"Skipping the cli backend: {args.cli} is not executable.", file=sys.stderr)
+        backends.remove(BACKEND_CLI)
+
+    # Every case runs in a fresh process, so no case inherits the memory or caches of another
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for backend in backends:
+        for workload, frames in workloads.items():
+            for algorithm in args.algorithms:
+                iteration_counts = [CLI_MAX_ITERATIONS] if backend == BACKEND_CLI else args.iterations
+                schedules = args.hybrid_schedules if algorithm == "HYBRID" else [None]
+                for max_iterations in iteration_counts:
+                    for schedule in schedules:
+                        case = {"backend": backend, "algorithm": algorithm, "workload": workload, "frames": frames,
+                                "max_iterations": max_iterations, "hybrid_schedule": schedule,
+                                "noise_variance": args.noise_variance, "repeats": args.repeats}
+                        if backend == BACKEND_CLI:
+                            row = run_cli_case(case, args.cli)
+                        else:
+                            with context.Pool(1) as pool:
+                                row = pool.apply(run_case, (case,))
+                        results.append(row)
+                        peak = (f"{row['peak_rss_bytes'] / 2 ** 20:.1f} MiB" if row["peak_rss_bytes"] is not None
+                                else "n/a")
+                        name = f"{algorithm}/{schedule}" if schedule else algorithm
+                        print(f"{backend:>6} {name:>15} {workload:>14} {max_iterations:>3} it: "
+                              f"{row['frames_per_s']:9.2f} frames/s {row['bits_per_s'] / 1000:9.1f} kbit/s  "
+                              f"peak {peak}", flush=True)
+
+    report = {"metadata": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "revision": _git_revision(),
+                           "python": platform.python_version(), "numpy": np.__version__,
+                           "platform": platform.platform(), "processor": platform.processor(),
+                           "cpu_count": os.cpu_count(), "seed": args.seed, "frames": args.frames,
+                           "ebn0_db": args.ebn0, "noise_variance": args.noise_variance, "repeats": args.repeats},
+              "results": results}
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"Results saved to {args.output}")
+    for line in hybrid_schedule_report(results):
+        print(f"HYBRID schedule: {line}")
+
+    if args.compare:
+        with open(args.compare) as previous_file:
+            regressions = compare_results(json.load(previous_file), report, args.tolerance)
+        for line in regressions:
+            print(f"Regression: {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
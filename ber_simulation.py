@@ -0,0 +1,271 @@
+# ber_simulation.py
+"""Monte Carlo BER/FER simulation of the turbo codec.
+
+Random payloads shaped like the CanSat telemetry strings are turbo-encoded, sent
+through a BPSK AWGN channel (soft LLRs) or a binary symmetric channel (hard bits,
+BPSK hard decisions at the same Eb/N0), and decoded with every selected algorithm.
+Batches run across a process pool; every algorithm decodes the same noisy frames.
+An (algorithm, Eb/N0) point stops once it has collected enough frame errors or
+reached the frame limit. Every point also counts the errors of hard decisions on the
+received systematic bits (the uncoded BER); from CODING_GAIN_MIN_EBN0 on, the decoded
+BER must be below it (see coding_gain_failures). Results are exported as CSV and, with
+matplotlib, as plots.
+"""
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from turbo_codec import (STOP_THRESHOLD, STOPPING_CRITERIA, TurboCodec, bytes_to_bits, canonical_algorithm,
+                         hard_bits_to_llr, string_to_bytes)
+
+ALGORITHMS = ["BCJR", "MAP", "SOVA", "HYBRID"]
+ALL_ALGORITHMS = ALGORITHMS + ["LOGMAP"]
+CHANNEL_AWGN = "awgn"
+CHANNEL_BSC = "bsc"
+CODE_RATE = 1 / 3  # One systematic and two parity bits per payload bit
+CODING_GAIN_MIN_EBN0 = 2.0  # Eb/N0 (dB) from which every algorithm must beat the uncoded BER
+
+RESULT_FIELDS = ["algorithm", "channel", "ebn0_db", "frames", "frame_errors", "bits", "bit_errors", "ber", "fer",
+                 "uncoded_bit_errors", "uncoded_ber", "iterations_per_frame", "decode_seconds", "throughput_bps"]
+
+# Codec of the current worker process, set once by the pool initializer
+_worker_codec = None
+
+
+def random_telemetry(rng: np.random.Generator, count: int, first_packet: int = 0) -> List[str]:
+    """Generates telemetry strings shaped like the CanSat packets.
+
+    "<packet>,<lat>,<lon>,<d>/<m>/<yyyy>,<h>:<m>:<s>,<speed>,<altitude>,<vertical speed>,<satellites>,<pressure>,<temperature>"
+    """
+    latitude = 38.3835 + rng.normal(0.0, 0.01, count)
+    longitude = 21.8188 + rng.normal(0.0, 0.01, count)
+    day, month = rng.integers(1, 29, count), rng.integers(1, 13, count)
+    seconds = rng.integers(0, 24 * 3600, count)
+    speed = rng.uniform(0.0, 30.0, count)
+    altitude = rng.uniform(0.0, 1000.0, count)
+    vertical_speed = rng.normal(-5.0, 3.0, count)
+    satellites = rng.integers(0, 13, count)
+    pressure = rng.uniform(900.0, 1030.0, count)
+    temperature = rng.normal(18.0, 5.0, count)
+    return [f"{first_packet + i},{latitude[i]:.6f},{longitude[i]:.6f},{day[i]}/{month[i]}/2025,"
+            f"{seconds[i] // 3600}:{seconds[i] // 60 % 60}:{seconds[i] % 60},{speed[i]:.2f},{altitude[i]:.2f},"
+            f"{vertical_speed[i]:.2f},{satellites[i]},{pressure[i]:.2f},{temperature[i]:.2f}"
+            for i in range(count)]
+
+
+def noise_variance_for(ebn0_db: float) -> float:
+    """Returns the BPSK noise variance N0 / 2 per channel bit at an Eb/N0 (unit symbol energy)."""
+    return 1.0 / (2.0 * CODE_RATE * 10.0 ** (ebn0_db / 10.0))
+
+
+def channel_llrs(bits: np.ndarray, ebn0_db: float, channel: str, rng: np.random.Generator) -> np.ndarray:
+    """Sends an N x L array of channel bits through the channel, returning the received LLRs."""
+    noise_variance = noise_variance_for(ebn0_db)
+    if channel == CHANNEL_AWGN:
+        received = 2.0 * bits - 1.0 + rng.normal(0.0, math.sqrt(noise_variance), bits.shape)
+        return received / noise_variance
+    if channel == CHANNEL_BSC:
+        crossover = 0.5 * math.erfc(math.sqrt(1.0 / (2.0 * noise_variance)))
+        return hard_bits_to_llr(bits ^ (rng.random(bits.shape) < crossover), noise_variance)
+    raise ValueError(f"Unsupported channel: {channel}")
+
+
+def _init_worker(max_iterations: int, convergence_threshold: float, stopping_criteria: List[str],
+                 sign_change_ratio: float):
+    global _worker_codec
+    _worker_codec = TurboCodec()
+    _worker_codec.set_max_iterations(max_iterations)
+    _worker_codec.set_convergence_threshold(convergence_threshold)
+    _worker_codec.set_stopping_criteria(stopping_criteria, sign_change_ratio)
+
+
+def simulate_batch(job: Tuple[List[str], str, float, int, Tuple[int, ...]]) -> Dict[str, List[float]]:
+    """Simulates one batch of frames with every requested algorithm.
+
+    Returns [frames, frame errors, bits, bit errors, uncoded bit errors, iterations, decode seconds]
+    per algorithm. The decoded bits are the signs of the a-posteriori LLRs; the uncoded bit
+    errors are those of the signs of the received systematic LLRs.
+    """
+    algorithms, channel, ebn0_db, batch_size, seed = job
+    codec = _worker_codec
+    rng = np.random.default_rng(np.random.SeedSequence(seed))
+    payloads = random_telemetry(rng, batch_size)
+    totals = {algorithm: [0, 0, 0, 0, 0, 0, 0.0] for algorithm in algorithms}
+
+    # Frames of the same length are encoded, sent and decoded together
+    by_length: Dict[int, List[str]] = {}
+    for payload in payloads:
+        by_length.setdefault(len(payload), []).append(payload)
+    for group in by_length.values():
+        sent = np.array([bytes_to_bits(string_to_bytes(payload)) for payload in group])
+        encoded = np.array([bytes_to_bits(codec.encode_packed(string_to_bytes(payload))) for payload in group])
+        llrs = channel_llrs(encoded, ebn0_db, channel, rng)
+        uncoded_errors = int(np.count_nonzero((llrs[:, 0::3] > 0) != sent))
+
+        computed = {}  # Aliased algorithms (MAP) reuse the result of the one that computes them
+        for algorithm in algorithms:
+            canonical = canonical_algorithm(algorithm)
+            if canonical not in computed:
+                start = time.perf_counter()
+                decoded, iterations = codec.decode_llr_batch(llrs, canonical)
+                seconds = time.perf_counter() - start
+                received = np.array([bytes_to_bits(string_to_bytes(text)) for text in decoded])
+                errors = np.count_nonzero(received != sent, axis=1)
+                computed[canonical] = (len(group), int(np.count_nonzero(errors)), sent.size, int(errors.sum()),
+                                       uncoded_errors, sum(iterations), seconds)
+            for i, value in enumerate(computed[canonical]):
+                totals[algorithm][i] += value
+    return totals
+
+
+def _result_row(algorithm: str, channel: str, ebn0_db: float, totals: Sequence[float]) -> Dict[str, object]:
+    frames, frame_errors, bits, bit_errors, uncoded_bit_errors, iterations, seconds = totals
+    return {"algorithm": algorithm, "channel": channel, "ebn0_db": ebn0_db, "frames": frames,
+            "frame_errors": frame_errors, "bits": bits, "bit_errors": bit_errors,
+            "ber": bit_errors / max(bits, 1), "fer": frame_errors / max(frames, 1),
+            "uncoded_bit_errors": uncoded_bit_errors, "uncoded_ber": uncoded_bit_errors / max(bits, 1),
+            "iterations_per_frame": iterations / max(frames, 1), "decode_seconds": seconds,
+            "throughput_bps": bits / seconds if seconds > 0 else 0.0}
+
+
+def simulate(ebn0_values: Sequence[float], algorithms: List[str] = None, channel: str = CHANNEL_AWGN,
+             workers: int = None, batch_size: int = 32, target_frame_errors: int = 100, max_frames: int = 10000,
+             seed: int = 0, max_iterations: int = 20, convergence_threshold: float = 0.001,
+             stopping_criteria: List[str] = None, sign_change_ratio: float = 0.0,
+             verbose: bool = False) -> List[Dict[str, object]]:
+    """Runs the simulation over a range of Eb/N0 values (in dB).
+
+    Batches are handed to the pool a round (one batch per worker) at a time; after every
+    round, the algorithms that reached `target_frame_errors` or `max_frames` stop at that
+    Eb/N0. Returns one result row (see RESULT_FIELDS) per algorithm and Eb/N0. The
+    throughput is the number of payload bits decoded per second of decoding time.
+    """
+    algorithms = algorithms or ALGORITHMS
+    workers = workers or os.cpu_count() or 1
+    stopping_criteria = stopping_criteria or [STOP_THRESHOLD]
+    rows = []
+    with Pool(workers, initializer=_init_worker,
+              initargs=(max_iterations, convergence_threshold, stopping_criteria, sign_change_ratio)) as pool:
+        for point, ebn0_db in enumerate(ebn0_values):
+            totals = {algorithm: [0, 0, 0, 0, 0, 0, 0.0] for algorithm in algorithms}
+            active = list(algorithms)
+            batch = 0
+            while active:
+                # Seeds depend only on the seed, the point and the batch index, so runs are reproducible
+                jobs = [(active, channel, ebn0_db, batch_size, (seed, point, batch + i)) for i in range(workers)]
+                batch += workers
+                for result in pool.map(simulate_batch, jobs):
+                    for algorithm, values in result.items():
+                        totals[algorithm] = [total + value for total, value in zip(totals[algorithm], values)]
+                active = [algorithm for algorithm in active
+                          if totals[algorithm][1] < target_frame_errors and totals[algorithm][0] < max_frames]
+            for algorithm in algorithms:
+                rows.append(_result_row(algorithm, channel, ebn0_db, totals[algorithm]))
+                if verbose:
+                    row = rows[-1]
+                    print(f"{ebn0_db:5.2f} dB {algorithm:>6}: BER {row['ber']:.3e} (uncoded {row['uncoded_ber']:.3e})  "
+                          f"FER {row['fer']:.3e}  "
+                          f"({row['frames']} frames, {row['iterations_per_frame']:.2f} iterations/frame, "
+                          f"{row['throughput_bps'] / 1000:.1f} kbit/s)", flush=True)
+    return rows
+
+
+def coding_gain_failures(rows: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Returns the result rows from CODING_GAIN_MIN_EBN0 on whose decoded BER is not below the uncoded BER.
+
+    There the decoder always corrects more errors than it makes, so any such row points
+    at a broken decoder rather than at an unlucky batch.
+    """
+    return [row for row in rows if row["ebn0_db"] >= CODING_GAIN_MIN_EBN0 and row["uncoded_bit_errors"] > 0
+            and row["bit_errors"] >= row["uncoded_bit_errors"]]
+
+
+def write_results_csv(path: str, rows: List[Dict[str, object]]):
+    """Writes simulation result rows to a CSV file."""
+    with open(path, "w", newline="") as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def plot_results(path: str, rows: List[Dict[str, object]]):
+    """Plots BER, FER and throughput versus Eb/N0 per algorithm into an image file (needs matplotlib)."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, axes = plt.subplots(1, 3, figsize=(15, 4.5))
+    for algorithm in dict.fromkeys(row["algorithm"] for row in rows):
+        points = [row for row in rows if row["algorithm"] == algorithm]
+        ebn0 = [row["ebn0_db"] for row in points]
+        # Points without errors cannot be drawn on a log scale
+        for axis, key in ((axes[0], "ber"), (axes[1], "fer")):
+            axis.semilogy([x for x, row in zip(ebn0, points) if row[key] > 0],
+                          [row[key] for row in points if row[key] > 0], marker="o", label=algorithm)
+        axes[2].plot(ebn0, [row["throughput_bps"] / 1000 for row in points], marker="o", label=algorithm)
+    for axis, label in zip(axes, ("BER", "FER", "Throughput (kbit/s)")):
+        axis.set_xlabel("Eb/N0 (dB)")
+        axis.set_ylabel(label)
+        axis.grid(True, which="both", alpha=0.3)
+        axis.legend()
+    figure.suptitle(f"Turbo codec, {rows[0]['channel'].upper()} channel" if rows else "Turbo codec")
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Monte Carlo BER/FER simulation of the turbo codec.")
+    parser.add_argument("--ebn0", nargs=3, type=float, default=[0.0, 4.0, 1.0], metavar=("START", "STOP", "STEP"),
+                        help="Eb/N0 range in dB (STOP included)")
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=ALL_ALGORITHMS, default=ALGORITHMS)
+    parser.add_argument("--channel", choices=[CHANNEL_AWGN, CHANNEL_BSC], default=CHANNEL_AWGN)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-b", "--batch-size", type=int, default=32, help="frames per worker task")
+    parser.add_argument("--frame-errors", type=int, default=100, help="frame errors that end an Eb/N0 point")
+    parser.add_argument("--max-frames", type=int, default=10000, help="frames that end an Eb/N0 point")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-iterations", type=int, default=20)
+    parser.add_argument("--convergence-threshold", type=float, default=0.001)
+    parser.add_argument("--stop", nargs="+", choices=STOPPING_CRITERIA, default=[STOP_THRESHOLD],
+                        help="early-termination criteria (stop when any fires)")
+    parser.add_argument("--sign-change-ratio", type=float, default=0.0,
+                        help="largest fraction of changed hard decisions accepted by SCR")
+    parser.add_argument("-o", "--output", default="ber_results.csv", help="results CSV file")
+    parser.add_argument("--plot", default=None, help="BER/FER/throughput plot image (needs matplotlib)")
+    args = parser.parse_args(argv)
+
+    start, stop, step = args.ebn0
+    if step <= 0:
+        parser.error("the Eb/N0 step must be positive")
+    if args.plot:
+        try:
+            import matplotlib  # Checked before the simulation rather than after it
+        except ImportError:
+            parser.error("--plot needs matplotlib")
+    ebn0_values = [round(start + i * step, 6) for i in range(int(math.floor((stop - start) / step + 1e-9)) + 1)]
+    began = time.perf_counter()
+    rows = simulate(ebn0_values, args.algorithms, args.channel, args.workers, args.batch_size, args.frame_errors,
+                    args.max_frames, args.seed, args.max_iterations, args.convergence_threshold, args.stop,
+                    args.sign_change_ratio, verbose=True)
+    write_results_csv(args.output, rows)
+    print(f"Simulated {len(ebn0_values)} Eb/N0 points in {time.perf_counter() - began:.1f} s; results in {args.output}")
+    if args.plot:
+        plot_results(args.plot, rows)
+        print(f"Plot saved to {args.plot}")
+    failures = coding_gain_failures(rows)
+    for row in failures:
+        print(f"Sanity check failed: {row['algorithm']} at {row['ebn0_db']} dB decodes with BER {row['ber']:.3e}, "
+              f"not below the uncoded BER {row['uncoded_ber']:.3e}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# decode_cache.py
+"""Persistent cache of decoded turbo frames.
+
+Entries live in a local SQLite database and are keyed by a content hash of the
+encoded frame together with every setting that affects its decoding (see
+turbo_codec.TurboCodec.cache_key), so re-running a decode over the same or an
+extended log only decodes the frames it has not seen before.
+"""
+import sqlite3
+from typing import Dict, Iterable, Tuple
+
+DEFAULT_CACHE_PATH = "turbo_decode_cache.sqlite"
+QUERY_CHUNK_SIZE = 500  # Keys per lookup query (SQLite limits the number of parameters)
+
+
+# DecodeCache class
+class DecodeCache:
+    """Maps cache keys to (decoded string, iterations) in a SQLite database.
+
+    Several processes can share one database: writes are serialized by SQLite
+    (in WAL mode), and a key that is stored twice keeps its first result.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")  # No fsync per commit; WAL keeps the file consistent
+        self.connection.execute("CREATE TABLE IF NOT EXISTS decoded ("
+                                "key TEXT PRIMARY KEY, output BLOB NOT NULL, iterations INTEGER NOT NULL)")
+        self.connection.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[str, int]]:
+        """Returns the cached (decoded string, iterations) of every key that is present."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+            chunk = keys[start:start + QUERY_CHUNK_SIZE]
+            rows = self.connection.execute(
+                f"SELECT key, output, iterations FROM decoded WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            for key, output, iterations in rows:
+                found[key] = (bytes(output).decode("latin-1"), iterations)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, str, int]]):
+        """Stores (key, decoded string, iterations) entries."""
+        self.connection.executemany("INSERT OR IGNORE INTO decoded (key, output, iterations) VALUES (?, ?, ?)",
+                                    ((key, output.encode("latin-1"), iterations) for key, output, iterations in entries))
+        self.connection.commit()
+
+    def get(self, key: str):
+        """Returns the cached (decoded string, iterations) of a key, or None."""
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, output: str, iterations: int):
+        """Stores the decoded string and iteration count of a key."""
+        self.put_many([(key, output, iterations)])
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM decoded").fetchone()[0]
+
+    def close(self):
+        """Closes the database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
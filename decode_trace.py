@@ -0,0 +1,70 @@
+# decode_trace.py
+"""Sidecar files of per-frame decoder traces.
+
+A trace record describes how one frame was decoded with one algorithm:
+
+    frame                   packet id, or the decode order of the frame
+    algorithm               decoding algorithm
+    symbols                 decoded bits (trellis steps) in the frame
+    iterations              iterations run
+    converged               a stopping criterion fired (false: the iteration cap was hit)
+    cached                  the result came from the decode cache (no timings)
+    seconds                 decoding time of the frame
+    half_iteration_seconds  time of every half-iteration (one constituent decoder run)
+    max_abs_llr             largest |LLR| after every half-iteration
+
+Records are written as CSV (lists joined with ';') or as JSON lines (non-finite
+numbers as null); Csv_Reader_Writer --trace writes the same layout.
+"""
+import csv
+import json
+import math
+from typing import Dict, Optional
+
+TRACE_FIELDS = ["frame", "algorithm", "symbols", "iterations", "converged", "cached", "seconds",
+                "half_iteration_seconds", "max_abs_llr"]
+FORMAT_CSV = "csv"
+FORMAT_JSONL = "jsonl"
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    return value if math.isfinite(value) else None
+
+
+# TraceWriter class
+class TraceWriter:
+    """Writes trace records to a CSV or JSON-lines file; use its write method as a trace sink."""
+
+    def __init__(self, path: str, trace_format: Optional[str] = None):
+        self.format = trace_format or (FORMAT_CSV if path.lower().endswith(".csv") else FORMAT_JSONL)
+        if self.format not in (FORMAT_CSV, FORMAT_JSONL):
+            raise ValueError(f"Unsupported trace format: {self.format}")
+        self.file = open(path, "w", newline="")
+        self.csv_writer = None
+        if self.format == FORMAT_CSV:
+            self.csv_writer = csv.writer(self.file)
+            self.csv_writer.writerow(TRACE_FIELDS)
+
+    def write(self, record: Dict[str, object]):
+        """Writes one trace record."""
+        if self.csv_writer is not None:
+            self.csv_writer.writerow([";".join(f"{value:.6g}" for value in record[field])
+                                      if isinstance(record[field], list)
+                                      else str(record[field]).lower() if isinstance(record[field], bool)
+                                      else record[field]
+                                      for field in TRACE_FIELDS])
+        else:
+            record = {field: [_finite_or_none(value) for value in record[field]]
+                      if isinstance(record[field], list) else record[field]
+                      for field in TRACE_FIELDS}
+            self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        """Closes the trace file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
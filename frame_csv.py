@@ -0,0 +1,20 @@
+# frame_csv.py
+"""Reader for the encoded frame CSV files written by the CanSat ground station.
+
+Every line of a file such as Turbo_Codes_Data.csv holds a packet id and the
+turbo-encoded frame as a string of '0'/'1' characters, followed by a literal
+"\\r\\n'" suffix. The frames are parsed the same way as Csv_Reader_Writer parses them.
+"""
+from typing import Iterator, Tuple
+
+
+def read_frames(path: str) -> Iterator[Tuple[str, str]]:
+    """Yields (packet id, encoded frame) pairs, parsed the same way as Csv_Reader_Writer."""
+    with open(path, "rb") as input_file:
+        for raw_line in input_file:
+            line = raw_line.rstrip(b"\n").decode("latin-1")
+            if "," not in line:
+                continue
+            first_column, second_column = line.split(",", 1)
+            # Drop the literal "\r\n'" suffix and the carriage return, then any trailing backslashes
+            yield first_column, second_column[:-5].rstrip("\\")
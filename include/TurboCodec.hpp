@@ -1,178 +1,1127 @@
-#ifndef TURBO_CODEC_H
-#define TURBO_CODEC_H
-
-#include <vector>
-#include <string>
-#include <cstdint>
-#include <limits>
-
-// Utility functions
-
-/**
- * @brief Computes the absolute value of a number.
- * @tparam T The type of the number (e.g., int, float, double).
- * @param x The input number.
- * @return The absolute value of x.
- */
-template <typename T>
-constexpr T abs(T x);
-
-/**
- * @brief Generates a random interleaver, which is a permutation of indices.
- *        Used for scrambling input bits in turbo encoding to improve error resilience.
- * @param length The length of the interleaver.
- * @return A vector containing a permutation of indices [0, length-1].
- */
-std::vector<size_t> generateInterleaver(size_t length);
-
-/**
- * @brief Converts a string into a binary representation.
- * @param input The input string.
- * @return A vector of 0s and 1s representing the binary encoding of the string.
- */
-std::vector<uint8_t> stringToBinary(const std::string& input);
-
-/**
- * @brief Converts a binary representation back to a string.
- * @param binary A vector of 0s and 1s representing a binary-encoded string.
- * @return The decoded string.
- */
-std::string binaryToString(const std::vector<uint8_t>& binary);
-
-// ConvolutionalCode class
-/**
- * @brief A class representing a recursive systematic convolutional (RSC) encoder and decoder.
- *        It handles both the encoding of input bits and decoding using algorithms such as BCJR, MAP, and SOVA.
- */
-class ConvolutionalCode {
-private:
-    uint32_t n;                           // Number of output bits per input bit (rate = 1/n).
-    uint32_t m;                           // Memory size of the encoder (number of shift registers).
-    uint32_t state;                       // Current state of the encoder.
-    std::vector<uint32_t> generators;     // Generator polynomials defining the code.
-
-    /**
-     * @brief Computes the next state of the encoder based on the current state and input bit.
-     * @param currentState The current state of the encoder.
-     * @param input The input bit (0 or 1).
-     * @return The next state of the encoder.
-     */
-    uint32_t computeNextState(uint32_t currentState, bool input);
-
-    /**
-     * @brief Computes the output bits generated by the encoder for a given state and input bit.
-     * @param currentState The current state of the encoder.
-     * @param input The input bit (0 or 1).
-     * @return The output bits as an integer.
-     */
-    uint8_t computeNextOutput(uint32_t currentState, bool input);
-
-public:
-    /**
-     * @brief Constructor for the ConvolutionalCode class.
-     * @param n The number of output bits per input bit.
-     * @param m The memory size of the encoder.
-     * @param gen The generator polynomials defining the code.
-     */
-    ConvolutionalCode(uint32_t n, uint32_t m, const std::vector<uint32_t>& gen);
-
-    /**
-     * @brief Resets the internal state of the encoder to the initial state.
-     */
-    void reset();
-
-    /**
-     * @brief Encodes a sequence of input bits using the convolutional encoder.
-     * @param input A vector of input bits (0s and 1s).
-     * @return A vector of pairs representing systematic and parity bits.
-     */
-    std::vector<std::pair<uint8_t, uint8_t>> encode(const std::vector<uint8_t>& input);
-
-    /**
-     * @brief Decodes a sequence of received bits using the BCJR algorithm.
-     * @param systematic The systematic bits received.
-     * @param parity The parity bits received.
-     * @param extrinsic The extrinsic information from previous iterations.
-     * @param noiseVariance The variance of the noise in the channel.
-     * @return A vector of log-likelihood ratios (LLRs) for the decoded bits.
-     */
-    std::vector<double> decodeBCJR(const std::vector<double>& systematic,
-                                   const std::vector<double>& parity,
-                                   const std::vector<double>& extrinsic,
-                                   double noiseVariance);
-
-    /**
-     * @brief Decodes a sequence of received bits using the MAP algorithm.
-     * @param systematic The systematic bits received.
-     * @param parity The parity bits received.
-     * @param extrinsic The extrinsic information from previous iterations.
-     * @param noiseVariance The variance of the noise in the channel.
-     * @return A vector of log-likelihood ratios (LLRs) for the decoded bits.
-     */
-    std::vector<double> decodeMAP(const std::vector<double>& systematic,
-                                  const std::vector<double>& parity,
-                                  const std::vector<double>& extrinsic,
-                                  double noiseVariance);
-
-    /**
-     * @brief Decodes a sequence of received bits using the SOVA algorithm.
-     * @param systematic The systematic bits received.
-     * @param parity The parity bits received.
-     * @param extrinsic The extrinsic information from previous iterations.
-     * @param noiseVariance The variance of the noise in the channel.
-     * @return A vector of log-likelihood ratios (LLRs) for the decoded bits.
-     */
-    std::vector<double> decodeSOVA(const std::vector<double>& systematic,
-                                   const std::vector<double>& parity,
-                                   const std::vector<double>& extrinsic,
-                                   double noiseVariance);
-};
-
-// TurboCodec class
-/**
- * @brief A class representing the Turbo Codec system, including turbo encoding and decoding.
- *        This class integrates two convolutional encoders and supports various decoding algorithms.
- */
-class TurboCodec {
-private:
-    ConvolutionalCode encoder1, encoder2; // Two convolutional encoders used in parallel.
-    int maxIterations;                   // Maximum number of decoding iterations.
-    double convergenceThreshold;         // Threshold for convergence during iterative decoding.
-
-public:
-    /**
-     * @brief Constructor for the TurboCodec class.
-     *        Initializes the encoders and sets default values for maxIterations and convergenceThreshold.
-     */
-    TurboCodec();
-
-    /**
-     * @brief Encodes an input string into a turbo-encoded string.
-     * @param input The input string to encode.
-     * @param output The encoded output string.
-     */
-    void encode(const std::string& input, std::string& output);
-
-    /**
-     * @brief Decodes a turbo-encoded string using the specified decoding algorithm.
-     * @param input The encoded input string.
-     * @param output The decoded output string.
-     * @param noiseVariance The variance of the noise in the channel.
-     * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "SOVA", or "HYBRID").
-     */
-    void decode(const std::string& input, std::string& output, double noiseVariance, const std::string& algorithm);
-
-    /**
-     * @brief Sets the maximum number of decoding iterations.
-     * @param iterations The maximum number of iterations.
-     */
-    void setMaxIterations(int iterations);
-
-    /**
-     * @brief Sets the convergence threshold for decoding.
-     * @param threshold The convergence threshold.
-     */
-    void setConvergenceThreshold(double threshold);
-};
-
-#endif // TURBO_CODEC_H
+#ifndef TURBO_CODEC_H
+#define TURBO_CODEC_H
+
+#include <vector>
+#include <string>
+#include <cstdint>
+#include <limits>
+#include <functional>
+#include <fstream>
+#include <istream>
+#include <mutex>
+#include <unordered_map>
+
+// Utility functions
+
+/**
+ * @brief Computes the absolute value of a number.
+ * @tparam T The type of the number (e.g., int, float, double).
+ * @param x The input number.
+ * @return The absolute value of x.
+ */
+template <typename T>
+constexpr T abs(T x);
+
+/**
+ * @brief Generates a random interleaver, which is a permutation of indices.
+ *        Used for scrambling input bits in turbo encoding to improve error resilience.
+ * @param length The length of the interleaver.
+ * @return A vector containing a permutation of indices [0, length-1].
+ */
+std::vector<size_t> generateInterleaver(size_t length);
+
+/**
+ * @brief Computes the coefficients of the quadratic permutation polynomial (QPP) interleaver
+ *        pi(i) = (f1 * i + f2 * i^2) mod length for a frame length.
+ * @param length The length of the interleaver.
+ * @param f1 Receives the linear coefficient.
+ * @param f2 Receives the quadratic coefficient.
+ * @throws std::domain_error If the length is squarefree (30, 210, ...): every QPP of such a
+ *         length reduces to a linear permutation.
+ */
+void qppCoefficients(size_t length, uint64_t& f1, uint64_t& f2);
+
+/**
+ * @brief Computes the QPP-interleaved position of an index in O(1), without a table.
+ * @param i The index to permute.
+ * @param length The length of the interleaver.
+ * @param f1 The linear coefficient from qppCoefficients.
+ * @param f2 The quadratic coefficient from qppCoefficients.
+ * @return The permuted index (f1 * i + f2 * i^2) mod length.
+ */
+size_t qppIndex(size_t i, size_t length, uint64_t f1, uint64_t f2);
+
+/**
+ * @brief Converts a string into a binary representation.
+ * @param input The input string.
+ * @return A vector of 0s and 1s representing the binary encoding of the string.
+ */
+std::vector<uint8_t> stringToBinary(const std::string& input);
+
+/**
+ * @brief Converts a binary representation back to a string.
+ * @param binary A vector of 0s and 1s representing a binary-encoded string.
+ * @return The decoded string.
+ */
+std::string binaryToString(const std::vector<uint8_t>& binary);
+
+/**
+ * @brief Computes ln(exp(a) + exp(b)) as max(a, b) plus a table-driven Jacobian correction.
+ * @param a The first log-domain value.
+ * @param b The second log-domain value.
+ * @return The max* of a and b.
+ */
+double maxStar(double a, double b);
+
+/**
+ * @brief Computes the CRC-16/CCITT-FALSE checksum of a byte string.
+ * @param data The bytes to checksum.
+ * @return The 16-bit CRC.
+ */
+uint16_t crc16(const std::string& data);
+
+/**
+ * @brief Checks a payload whose last two bytes carry its big-endian CRC-16/CCITT-FALSE.
+ * @param payload The decoded payload.
+ * @return True if the trailing CRC matches the rest of the payload.
+ */
+bool hasValidCrc16(const std::string& payload);
+
+/**
+ * @brief Early-termination criteria of TurboCodec::decode. Criteria can be combined
+ *        with a bitwise OR; decoding stops as soon as any selected criterion fires.
+ */
+enum StoppingCriterion {
+    STOP_THRESHOLD = 1, // max change of an a-posteriori LLR since the last iteration below the threshold.
+    STOP_HDA = 2,       // Decoder 1 agrees with the a-posteriori decisions in two consecutive iterations.
+    STOP_SCR = 4,       // Fraction of hard decisions that changed sign since the last iteration.
+    STOP_CRC = 8        // The decoded payload passes its CRC/parity check.
+};
+
+/**
+ * @brief Interleaver applied to the input of the second encoder.
+ */
+enum InterleaverType {
+    INTERLEAVER_RANDOM = 0, // Seeded random permutation (generateInterleaver).
+    INTERLEAVER_QPP = 1     // Quadratic permutation polynomial (qppIndex), no table.
+};
+
+/**
+ * @brief Arithmetic precision of the BCJR/MAP decoder.
+ */
+enum Precision {
+    PRECISION_DOUBLE = 0, // double path metrics and LLRs.
+    PRECISION_FIXED16 = 1 // int8 channel LLRs and int16 path metrics.
+};
+
+/**
+ * @brief When HYBRID switches between its MAP and SOVA iterations (see TurboCodec::setHybridSchedule).
+ */
+enum HybridSchedule {
+    HYBRID_FIXED = 0,   // MAP for the first maxIterations / 2 iterations, then SOVA.
+    HYBRID_ADAPTIVE = 1 // SOVA until the LLR statistics of the frame stall, then MAP.
+};
+
+/**
+ * @brief Stall test of the adaptive HYBRID schedule (the same values as turbo_codec.py): a SOVA
+ *        iteration stalls when at most HYBRID_STALL_SIGN_CHANGES of the hard decisions changed sign,
+ *        or the mean finite |LLR| grew by at most HYBRID_STALL_LLR_GAIN.
+ */
+constexpr double HYBRID_STALL_SIGN_CHANGES = 0.0;
+constexpr double HYBRID_STALL_LLR_GAIN = 0.05;
+
+/**
+ * @brief Noise variance used to decode channel LLRs, which already are a channel value divided by
+ *        the noise variance of the channel.
+ */
+constexpr double LLR_NOISE_VARIANCE = 1.0;
+
+/**
+ * @brief Limits of the per-frame channel estimates of TurboCodec::setAdaptiveNoise
+ *        (the same values as turbo_codec.py).
+ */
+constexpr double ADAPTIVE_MIN_CROSSOVER = 1e-3;        // Estimated crossover probabilities are clipped to this range.
+constexpr double ADAPTIVE_MAX_CROSSOVER = 0.45;
+constexpr double ADAPTIVE_MIN_SNR = 1e-2;              // Soft-input SNR estimates are clipped to this range.
+constexpr double ADAPTIVE_MAX_SNR = 1e2;
+constexpr int ADAPTIVE_MIN_ITERATIONS = 2;             // Smallest per-frame iteration budget.
+// Crossover probability from which a frame gets maxIterations; the budgets only vary on cleaner channels.
+constexpr double ADAPTIVE_FULL_BUDGET_CROSSOVER = 0.1;
+constexpr int ADAPTIVE_BISECTION_STEPS = 50;
+
+/**
+ * @brief Frames whose parity of either encoder estimates at least this crossover are taken for frames
+ *        these encoders did not produce and are not decoded (the same value as turbo_codec.py, which
+ *        documents how it was chosen). Every frame of Turbo_Codes_Data.csv, written by another
+ *        encoder, estimates above it; noisy codewords only reach it below about 2 dB Eb/N0.
+ */
+constexpr double MISMATCHED_PARITY_CROSSOVER = 0.3;
+
+/**
+ * @brief Record of how one algorithm decoded one frame, collected when tracing is enabled
+ *        (see TurboCodec::setTracing).
+ */
+struct FrameTrace {
+    std::string algorithm;                    // Decoding algorithm.
+    size_t symbols;                           // Decoded bits (trellis steps) in the frame.
+    int iterations;                           // Iterations run.
+    bool converged;                           // Whether a stopping criterion fired (false: the iteration cap was hit).
+    bool cached;                              // Whether the result came from the decode cache (no timings).
+    double seconds;                           // Decoding time of the frame.
+    std::vector<double> halfIterationSeconds; // Time of every half-iteration (one constituent decoder run).
+    std::vector<double> maxAbsLLR;            // Largest |LLR| after every half-iteration.
+};
+
+// ConvolutionalCode class
+/**
+ * @brief A class representing a recursive systematic convolutional (RSC) encoder and decoder.
+ *        It handles both the encoding of input bits and decoding using algorithms such as BCJR, MAP, and SOVA.
+ */
+class ConvolutionalCode {
+private:
+    uint32_t n;                           // Number of output bits per input bit (rate = 1/n).
+    uint32_t m;                           // Memory size of the encoder (number of shift registers).
+    uint32_t state;                       // Current state of the encoder.
+    std::vector<uint32_t> generators;     // Generator polynomials defining the code.
+    size_t windowSize;                    // Sliding-window length of the BCJR decoder (0 = full frame).
+    size_t warmupLength;                  // Backward warm-up steps before each window.
+    Precision precision;                  // Arithmetic of the BCJR/MAP decoder.
+    size_t subBlocks;                     // Sub-blocks of a frame decoded concurrently by BCJR (1 = serial).
+    bool subBlockThreads;                 // Whether every sub-block runs on its own thread (else one after another).
+    unsigned radix;                       // Trellis stages per recursion step of BCJR (2 or 4).
+    size_t sovaDepth;                     // Register-exchange window of SOVA, in trellis steps.
+    std::vector<std::vector<double>> subBlockAlpha; // Alpha each sub-block starts from (previous iteration).
+    std::vector<std::vector<double>> subBlockBeta;  // Beta each sub-block ends with (previous iteration).
+    std::vector<double> parityFlipWeights; // Per error weight, the summed fraction of parity bits an error pattern flips.
+    std::vector<uint8_t> branchSymbols;   // Channel symbol 2 * input + parity bit of every branch, indexed (state << 1) | input.
+
+    /**
+     * @brief Fills parityFlipWeights: for every error pattern of weight w in the m + 1 input bits
+     *        a parity bit depends on, adds to entry w the fraction of bit combinations whose parity
+     *        bit (a non-zero output symbol, as the turbo encoder emits it) the pattern changes.
+     */
+    void computeParityFlipWeights();
+
+    /**
+     * @brief Computes the next state of the encoder based on the current state and input bit.
+     * @param currentState The current state of the encoder.
+     * @param input The input bit (0 or 1).
+     * @return The next state of the encoder.
+     */
+    uint32_t computeNextState(uint32_t currentState, bool input);
+
+    /**
+     * @brief Computes the output bits generated by the encoder for a given state and input bit.
+     * @param currentState The current state of the encoder.
+     * @param input The input bit (0 or 1).
+     * @return The output bits as an integer.
+     */
+    uint8_t computeNextOutput(uint32_t currentState, bool input);
+
+    /**
+     * @brief Computes the branch metrics of a frame: entry 4 * t + symbol holds the metric at time
+     *        step t of the branches with that channel symbol (see branchSymbols). The systematic
+     *        plus a-priori value and the parity value, scaled by 1 / noiseVariance, count positive
+     *        for a 1 bit and negative for a 0 bit.
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The noise variance of the channel.
+     * @return The branch metrics, four per time step.
+     */
+    std::vector<double> branchMetrics(const std::vector<double>& systematic, const std::vector<double>& parity,
+                                      const std::vector<double>& extrinsic, double noiseVariance) const;
+
+    /**
+     * @brief Sliding-window BCJR decoding, keeping alpha/beta for one window at a time.
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+     */
+    std::vector<double> decodeBCJRWindowed(const std::vector<double>& systematic,
+                                           const std::vector<double>& parity,
+                                           const std::vector<double>& extrinsic,
+                                           double noiseVariance);
+
+    /**
+     * @brief Fixed-point BCJR decoding with int8 channel LLRs and int16 path metrics.
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+     */
+    std::vector<double> decodeBCJRFixed(const std::vector<double>& systematic,
+                                        const std::vector<double>& parity,
+                                        const std::vector<double>& extrinsic,
+                                        double noiseVariance);
+
+    /**
+     * @brief Parallel sub-block BCJR decoding, one thread per sub-block (see setSubBlockThreads),
+     *        with boundary metrics initialized from the previous iteration.
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+     */
+    std::vector<double> decodeBCJRSubBlocks(const std::vector<double>& systematic,
+                                            const std::vector<double>& parity,
+                                            const std::vector<double>& extrinsic,
+                                            double noiseVariance);
+
+public:
+    /**
+     * @brief Constructor for the ConvolutionalCode class.
+     * @param n The number of output bits per input bit.
+     * @param m The memory size of the encoder.
+     * @param gen The generator polynomials defining the code.
+     */
+    ConvolutionalCode(uint32_t n, uint32_t m, const std::vector<uint32_t>& gen);
+
+    /**
+     * @brief Resets the internal state of the encoder to the initial state.
+     */
+    void reset();
+
+    /**
+     * @brief Enables sliding-window BCJR decoding.
+     * @param window The window length (0 decodes whole frames).
+     * @param warmup The number of backward warm-up steps before each window.
+     */
+    void setSlidingWindow(size_t window, size_t warmup);
+
+    /**
+     * @brief Selects double or fixed-point BCJR/MAP decoding.
+     * @param value The decoder precision.
+     */
+    void setPrecision(Precision value);
+
+    /**
+     * @brief Splits every frame into sub-blocks that the BCJR decoder recurses concurrently.
+     *        Takes precedence over the sliding window; fixed-point decoding stays serial.
+     * @param count The number of sub-blocks (1 decodes serially).
+     */
+    void setSubBlocks(size_t count);
+
+    /**
+     * @brief Selects whether the sub-blocks of a frame run on threads of their own (the default)
+     *        or one after another on the calling thread. Callers that already decode frames on
+     *        a pool of threads should run them serially, rather than start a thread per sub-block
+     *        on every half-iteration. The LLRs are the same either way.
+     * @param enabled Whether to start a thread per sub-block.
+     */
+    void setSubBlockThreads(bool enabled);
+
+    /**
+     * @brief Selects radix-2 (one trellis stage per step) or radix-4 (two stages per step)
+     *        recursions in the full-frame double BCJR/MAP decoder.
+     * @param value The radix (2 or 4).
+     */
+    void setRadix(unsigned value);
+
+    /**
+     * @brief Sets the register-exchange window of the SOVA decoder. Decisions are released
+     *        depth - 1 steps after they are made, so memory is O(depth x states) per frame;
+     *        about five constraint lengths loses nothing against a full-frame traceback.
+     * @param depth The window length in trellis steps (at least 1).
+     */
+    void setSovaDepth(size_t depth);
+
+    /**
+     * @brief Describes the decoder settings that affect decoded outputs (window, precision,
+     *        sub-blocks, radix and SOVA depth), for use in decode cache keys.
+     * @return The settings as a compact string.
+     */
+    std::string describeSettings() const;
+
+    /**
+     * @brief Forgets the sub-block boundary metrics kept from the previous iteration.
+     *        Called before the first iteration of every frame.
+     */
+    void resetBoundaryMetrics();
+
+    /**
+     * @brief Encodes a sequence of input bits using the convolutional encoder.
+     * @param input A vector of input bits (0s and 1s).
+     * @return A vector of pairs representing systematic and parity bits.
+     */
+    std::vector<std::pair<uint8_t, uint8_t>> encode(const std::vector<uint8_t>& input);
+
+    /**
+     * @brief Decodes a sequence of received bits using the BCJR algorithm.
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+     */
+    std::vector<double> decodeBCJR(const std::vector<double>& systematic,
+                                   const std::vector<double>& parity,
+                                   const std::vector<double>& extrinsic,
+                                   double noiseVariance);
+
+    /**
+     * @brief Decodes a sequence of received bits using the MAP algorithm.
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+     */
+    std::vector<double> decodeMAP(const std::vector<double>& systematic,
+                                  const std::vector<double>& parity,
+                                  const std::vector<double>& extrinsic,
+                                  double noiseVariance);
+
+    /**
+     * @brief Decodes a sequence of received bits using the log-MAP algorithm (max* with Jacobian table).
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+     */
+    std::vector<double> decodeLogMAP(const std::vector<double>& systematic,
+                                     const std::vector<double>& parity,
+                                     const std::vector<double>& extrinsic,
+                                     double noiseVariance);
+
+    /**
+     * @brief Decodes a sequence of received bits using the SOVA algorithm.
+     * @param systematic The systematic bits received.
+     * @param parity The parity bits received.
+     * @param extrinsic The extrinsic information from previous iterations.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @return A vector of a-posteriori LLRs for the decoded bits, in channel-value units.
+     */
+    std::vector<double> decodeSOVA(const std::vector<double>& systematic,
+                                   const std::vector<double>& parity,
+                                   const std::vector<double>& extrinsic,
+                                   double noiseVariance);
+
+    /**
+     * @brief Returns the probability that a parity bit disagrees with the re-encoded input bits when
+     *        every received bit is flipped independently with probability `crossover`. The encoder
+     *        has no feedback, so a parity bit depends only on the last m + 1 input bits.
+     * @param crossover The crossover probability of the channel.
+     * @return The parity mismatch probability.
+     */
+    double parityMismatchProbability(double crossover) const;
+
+    /**
+     * @brief Estimates the crossover probability of a frame from its parity-check agreement: the
+     *        received input bits are re-encoded, and the fraction of received parity bits they
+     *        disagree with is inverted through parityMismatchProbability (by bisection).
+     * @param systematicBits The received input bits.
+     * @param parityBits The received parity bits of this encoder.
+     * @return The estimated crossover probability.
+     */
+    double estimateCrossover(const std::vector<uint8_t>& systematicBits, const std::vector<uint8_t>& parityBits);
+};
+
+/**
+ * @brief The decode cache key of a frame (see TurboCodec::cacheKey). The hash indexes the
+ *        cache; the length and the check hash are stored with the entry and must match on
+ *        lookup, so two frames whose hashes collide are not mistaken for one another.
+ */
+struct DecodeCacheKey {
+    uint64_t hash;   // FNV-1a hash of the decoder settings and the frame.
+    uint64_t check;  // A second, independent hash of the same bytes.
+    uint64_t length; // The length of the frame.
+};
+
+// DecodeCache class
+/**
+ * @brief A persistent cache of decoded frames, which any number of TurboCodec instances
+ *        (and threads) can share. Every entry is appended to a text file as one line,
+ *        "<hash> <check> <length> <iterations> <decoded output in hex>", and the file is
+ *        loaded back when the cache is opened, so a later run only decodes the frames it
+ *        has not seen.
+ */
+class DecodeCache {
+private:
+    /**
+     * @brief A cached decoding result.
+     */
+    struct Entry {
+        uint64_t check;     // Check hash of the key (see DecodeCacheKey).
+        uint64_t length;    // Frame length of the key.
+        std::string output; // Decoded output string.
+        int iterations;     // Iterations run to decode it.
+    };
+
+    std::unordered_map<uint64_t, Entry> entries; // Entries by key hash (see TurboCodec::cacheKey).
+    std::ofstream file;                          // The cache file, opened for appending.
+    std::mutex mutex;                            // Guards entries and file.
+
+public:
+    /**
+     * @brief Opens a cache file, loading its entries and creating it if needed.
+     *        Malformed lines (e.g. one cut short by a crash) are skipped.
+     * @param path The path of the cache file.
+     */
+    explicit DecodeCache(const std::string& path);
+
+    /**
+     * @brief Returns whether the cache file could be opened for appending.
+     * @return True if new entries are saved to the file.
+     */
+    bool isOpen() const;
+
+    /**
+     * @brief Looks a key up. An entry with the same hash but another check hash or length
+     *        belongs to a different frame and is not returned.
+     * @param key The cache key.
+     * @param output Receives the cached decoded output.
+     * @param iterations Receives the cached number of iterations.
+     * @return True if the key is in the cache.
+     */
+    bool lookup(const DecodeCacheKey& key, std::string& output, int& iterations);
+
+    /**
+     * @brief Stores a decoding result and appends it to the cache file. A key hash that is
+     *        already in the cache keeps its first result.
+     * @param key The cache key.
+     * @param output The decoded output.
+     * @param iterations The number of iterations run.
+     */
+    void store(const DecodeCacheKey& key, const std::string& output, int iterations);
+
+    /**
+     * @brief Returns the number of cached entries.
+     * @return The number of entries.
+     */
+    size_t size();
+};
+
+// LLRFrameReader class
+/**
+ * @brief Reads binary frame files of soft channel LLRs (written by llr_frames.py). All fields
+ *        are little-endian: a 12-byte header ("TLLR", version 1, value type 0 = float32 or
+ *        1 = int8, 2 reserved bytes, float32 int8 steps per unit LLR), then one record per frame
+ *        (uint16 packet id length, uint32 value count, the packet id, the values).
+ */
+class LLRFrameReader {
+private:
+    std::istream& input; // The frame file.
+    bool valid;          // Whether the header was valid and no record has been cut short.
+    bool quantized;      // Whether values are stored as int8 (otherwise float32).
+    float scale;         // int8 steps per unit LLR.
+    std::streamoff end;  // The size of the file, or -1 if the stream cannot tell.
+
+public:
+    /**
+     * @brief Reads the header of a frame file.
+     * @param input The frame file, opened in binary mode.
+     */
+    explicit LLRFrameReader(std::istream& input);
+
+    /**
+     * @brief Returns whether the file is a valid frame file so far.
+     * @return False if the header is not valid or a record was cut short or runs past the end of the file.
+     */
+    bool isValid() const;
+
+    /**
+     * @brief Reads the next frame.
+     * @param packetId Receives the packet id.
+     * @param llrs Receives the channel LLRs.
+     * @return False at the end of the file or on a malformed record (see isValid).
+     */
+    bool next(std::string& packetId, std::vector<double>& llrs);
+};
+
+// TurboCodec class
+/**
+ * @brief A class representing the Turbo Codec system, including turbo encoding and decoding.
+ *        This class integrates two convolutional encoders and supports various decoding algorithms.
+ */
+class TurboCodec {
+private:
+    ConvolutionalCode encoder1, encoder2; // Two convolutional encoders used in parallel.
+    int maxIterations;                   // Maximum number of decoding iterations.
+    double convergenceThreshold;         // Threshold for convergence during iterative decoding.
+    int lastIterations;                  // Number of iterations run by the most recent decode.
+    int stoppingCriteria;                // Selected StoppingCriterion flags.
+    double signChangeRatio;              // Maximum fraction of sign changes accepted by STOP_SCR.
+    std::function<bool(const std::string&)> payloadValidator; // Payload check used by STOP_CRC.
+    InterleaverType interleaverType;     // Interleaver of the second encoder.
+    DecodeCache* decodeCache;            // Cache of decoded frames (not owned, may be null).
+    bool tracing;                        // Whether decodes record a FrameTrace per algorithm.
+    bool adaptiveNoise;                  // Whether every frame gets its own noise variance and iteration budget.
+    HybridSchedule hybridSchedule;       // When HYBRID switches between MAP and SOVA.
+    std::vector<FrameTrace> lastTraces;  // Traces of the most recent decode, when tracing.
+
+    /**
+     * @brief State of the iterative decoder of one frame, kept between calls to iterate.
+     */
+    struct IterationState {
+        std::vector<double> extrinsic1, extrinsic2; // Extrinsic information of both decoders, in natural order.
+        std::vector<double> aPosteriori;            // A-posteriori LLRs after the last iteration.
+        std::vector<uint8_t> previousDecisions;     // Returned hard decisions of the last iteration.
+        bool previousAgreement;                     // Whether decoder 1 agreed with them in the last iteration.
+        int iterations;                             // Iterations run so far.
+        bool converged;                             // Whether a stopping criterion has fired.
+        std::vector<double> halfIterationSeconds;   // Time of every half-iteration so far, when tracing.
+        std::vector<double> maxAbsLLR;              // Largest |LLR| after every half-iteration, when tracing.
+        bool escalated;                             // Whether an adaptive HYBRID frame switched to MAP.
+        double previousMeanAbsLLR;                  // Mean finite |LLR| of its last SOVA iteration.
+    };
+
+    /**
+     * @brief Checks whether the last SOVA iteration of an adaptive HYBRID frame stopped making
+     *        progress: its hard decisions no longer change or its mean finite |LLR| no longer grows.
+     *        Must be called before hasConverged replaces the decisions of the previous iteration.
+     * @param aPosteriori The a-posteriori LLRs after the iteration.
+     * @param state The iteration state of the frame (previousMeanAbsLLR is updated).
+     * @return True if the frame should continue with MAP.
+     */
+    static bool hasStalled(const std::vector<double>& aPosteriori, IterationState& state);
+
+    /**
+     * @brief Builds the trace of a frame from its iteration state.
+     * @param algorithm The decoding algorithm.
+     * @param state The iteration state after decoding.
+     * @return The trace.
+     */
+    static FrameTrace makeTrace(const std::string& algorithm, const IterationState& state);
+
+    /**
+     * @brief Builds the trace of a frame taken from the decode cache.
+     * @param algorithm The decoding algorithm.
+     * @param symbols The number of symbols in the frame.
+     * @param iterations The cached iteration count.
+     * @return The trace.
+     */
+    static FrameTrace cachedTrace(const std::string& algorithm, size_t symbols, int iterations);
+
+    /**
+     * @brief Splits a frame of channel LLRs into its systematic and parity values.
+     * @param llrs The channel LLRs, ordered like the encoded bits.
+     * @param systematic Receives the systematic values.
+     * @param parity1 Receives the parity values of the first encoder.
+     * @param parity2 Receives the parity values of the second encoder.
+     */
+    static void splitLLRFrame(const std::vector<double>& llrs, std::vector<double>& systematic,
+                              std::vector<double>& parity1, std::vector<double>& parity2);
+
+    /**
+     * @brief Parses a turbo-encoded string into its systematic and parity channel values.
+     * @param input The encoded input string.
+     * @param systematic Receives the systematic values.
+     * @param parity1 Receives the parity values of the first encoder.
+     * @param parity2 Receives the parity values of the second encoder.
+     */
+    static void parseFrame(const std::string& input, std::vector<double>& systematic,
+                           std::vector<double>& parity1, std::vector<double>& parity2);
+
+    /**
+     * @brief Initializes the iteration state of a frame before its first iteration.
+     * @param systematic The systematic channel values of the frame.
+     * @param state The state to reset.
+     */
+    static void resetIterationState(const std::vector<double>& systematic, IterationState& state);
+
+    /**
+     * @brief The interleaver positions of a frame: natural position i is interleaved to position
+     *        positions(i), as in encode. The random permutation is a table; QPP positions are
+     *        computed by qppIndex when asked for, so long frames need no interleaver memory.
+     */
+    struct InterleaverPositions {
+        std::vector<size_t> table; // The random permutation (empty for the QPP).
+        size_t length;             // The number of symbols in the frame.
+        uint64_t f1, f2;           // The QPP coefficients.
+
+        size_t operator()(size_t i) const { return table.empty() ? qppIndex(i, length, f1, f2) : table[i]; }
+    };
+
+    /**
+     * @brief Returns the interleaver positions of a frame for the selected interleaver.
+     * @param length The number of symbols in the frame.
+     * @return The interleaver positions.
+     */
+    InterleaverPositions interleaverPositions(size_t length) const;
+
+    /**
+     * @brief Checks whether a frame carries parity these encoders did not produce: the received
+     *        systematic bits are re-encoded by both encoders and the crossover estimated from
+     *        either parity sequence reaches MISMATCHED_PARITY_CROSSOVER. Such frames are not
+     *        decoded; they keep the decisions on their systematic values.
+     * @param systematic The systematic channel values.
+     * @param parity1 The parity values of the first encoder.
+     * @param systematic2 The systematic channel values in interleaved order.
+     * @param parity2 The parity values of the second encoder.
+     * @return True if the parity contradicts the encoders.
+     */
+    bool hasMismatchedParity(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                             const std::vector<double>& systematic2, const std::vector<double>& parity2);
+
+    /**
+     * @brief Runs decoding iterations until the stopping criteria fire or `stopAt` iterations have run.
+     *        Decoder 2 works on the interleaved sequence; the extrinsic information each decoder
+     *        passes on is its a-posteriori LLR minus its systematic and a-priori inputs. A frame
+     *        with mismatched parity (see hasMismatchedParity) runs no iterations.
+     * @param systematic The systematic channel values.
+     * @param parity1 The parity values of the first encoder.
+     * @param parity2 The parity values of the second encoder.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @param algorithm The decoding algorithm to use.
+     * @param state The iteration state to continue from (updated).
+     * @param stopAt The total number of iterations after which to stop.
+     */
+    void iterate(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                 const std::vector<double>& parity2, double noiseVariance, const std::string& algorithm,
+                 IterationState& state, int stopAt);
+
+    /**
+     * @brief Reconstructs the decoded message from the a-posteriori LLRs.
+     * @param aPosteriori The a-posteriori LLRs of the frame.
+     * @return The decoded string.
+     */
+    static std::string hardDecisions(const std::vector<double>& aPosteriori);
+
+    /**
+     * @brief decodeAll without the decode cache, on parsed channel values.
+     * @param systematic The systematic channel values.
+     * @param parity1 The parity values of the first encoder.
+     * @param parity2 The parity values of the second encoder.
+     * @param algorithms The decoding algorithms to run.
+     * @param outputs Receives the decoded output string of every algorithm, in the same order.
+     * @param iterations Receives the number of iterations run by every algorithm, in the same order.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @param softInput Whether the values are LLRs (for the adaptive channel estimate).
+     */
+    void decodeAllChannelValues(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                                const std::vector<double>& parity2, const std::vector<std::string>& algorithms,
+                                std::vector<std::string>& outputs, std::vector<int>& iterations, double noiseVariance,
+                                bool softInput);
+
+    /**
+     * @brief Evaluates the selected stopping criteria after a decoding iteration, on the signs of
+     *        the a-posteriori LLRs, which are exactly the decisions the decoder returns.
+     * @param iteration The index of the iteration that just finished.
+     * @param aPosteriori The a-posteriori LLRs after this iteration.
+     * @param decisions1 The hard decisions of the first decoder in this iteration.
+     * @param state The iteration state of the frame (aPosteriori, previousDecisions and
+     *              previousAgreement are updated).
+     * @return True if any selected criterion fires.
+     */
+    bool hasConverged(int iteration, const std::vector<double>& aPosteriori,
+                      const std::vector<uint8_t>& decisions1, IterationState& state);
+
+public:
+    /**
+     * @brief Constructor for the TurboCodec class.
+     *        Initializes the encoders and sets default values for maxIterations and convergenceThreshold.
+     */
+    TurboCodec();
+
+    /**
+     * @brief Encodes an input string into a turbo-encoded string.
+     * @param input The input string to encode.
+     * @param output The encoded output string.
+     */
+    void encode(const std::string& input, std::string& output);
+
+    /**
+     * @brief Decodes a turbo-encoded string using the specified decoding algorithm.
+     * @param input The encoded input string.
+     * @param output The decoded output string.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+     */
+    void decode(const std::string& input, std::string& output, double noiseVariance, const std::string& algorithm);
+
+    /**
+     * @brief Decodes a turbo-encoded string with several algorithms, sharing the work they have in common.
+     *        The frame is parsed once, MAP and BCJR share one run, and with HYBRID_FIXED HYBRID
+     *        continues from the state of that run after maxIterations / 2 iterations.
+     * @param input The encoded input string.
+     * @param algorithms The decoding algorithms to run ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+     * @param outputs Receives the decoded output string of every algorithm, in the same order.
+     * @param iterations Receives the number of iterations run by every algorithm, in the same order.
+     * @param noiseVariance The variance of the noise in the channel.
+     */
+    void decodeAll(const std::string& input, const std::vector<std::string>& algorithms,
+                   std::vector<std::string>& outputs, std::vector<int>& iterations, double noiseVariance);
+
+    /**
+     * @brief Decodes a frame of soft channel LLRs using the specified decoding algorithm.
+     * @param llrs The channel LLRs (channel value / noise variance, positive favouring 1),
+     *             ordered like the encoded bits: systematic, parity 1, parity 2, ...
+     * @param output The decoded output string.
+     * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+     */
+    void decodeLLR(const std::vector<double>& llrs, std::string& output, const std::string& algorithm);
+
+    /**
+     * @brief Runs the constituent decoder of the first encoder once on a frame, with the current
+     *        decoder settings and without iterating, e.g. to compare its soft outputs with those
+     *        of turbo_codec.py.
+     * @param systematic The systematic channel values.
+     * @param parity The parity values of the first encoder.
+     * @param extrinsic The a-priori (extrinsic) information.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", or "SOVA").
+     * @return The a-posteriori LLRs of the decoder.
+     */
+    std::vector<double> decodeConstituent(const std::vector<double>& systematic, const std::vector<double>& parity,
+                                          const std::vector<double>& extrinsic, double noiseVariance,
+                                          const std::string& algorithm);
+
+    /**
+     * @brief Decodes a frame of soft channel LLRs with several algorithms, sharing the work they
+     *        have in common (see decodeAll). The decode cache is not used.
+     * @param llrs The channel LLRs, ordered like the encoded bits.
+     * @param algorithms The decoding algorithms to run.
+     * @param outputs Receives the decoded output string of every algorithm, in the same order.
+     * @param iterations Receives the number of iterations run by every algorithm, in the same order.
+     */
+    void decodeAllLLR(const std::vector<double>& llrs, const std::vector<std::string>& algorithms,
+                      std::vector<std::string>& outputs, std::vector<int>& iterations);
+
+    /**
+     * @brief Computes the decode cache key of a frame: a 64-bit FNV-1a hash of the frame and of
+     *        every setting that affects its decoding, plus a second hash and the frame length that
+     *        the cache verifies on lookup. A custom payload validator is not part of the key, so
+     *        keep one cache file per validator when decoding with STOP_CRC.
+     * @param input The encoded input string.
+     * @param noiseVariance The variance of the noise in the channel.
+     * @param algorithm The decoding algorithm.
+     * @return The cache key.
+     */
+    DecodeCacheKey cacheKey(const std::string& input, double noiseVariance, const std::string& algorithm) const;
+
+    /**
+     * @brief Makes decode and decodeAll look frames up in a decode cache first and store the
+     *        frames they decode in it.
+     * @param cache The cache (not owned; it must outlive the codec), or null to disable caching.
+     */
+    void setDecodeCache(DecodeCache* cache);
+
+    /**
+     * @brief Sets the maximum number of decoding iterations.
+     * @param iterations The maximum number of iterations.
+     */
+    void setMaxIterations(int iterations);
+
+    /**
+     * @brief Sets the convergence threshold for decoding.
+     * @param threshold The convergence threshold.
+     */
+    void setConvergenceThreshold(double threshold);
+
+    /**
+     * @brief Selects the early-termination criteria.
+     * @param criteria A bitwise OR of StoppingCriterion flags.
+     * @param ratio The largest fraction of changed hard decisions accepted by STOP_SCR.
+     */
+    void setStoppingCriteria(int criteria, double ratio);
+
+    /**
+     * @brief Sets the payload check used by STOP_CRC (hasValidCrc16 by default).
+     * @param validator A function returning true for a valid decoded payload.
+     */
+    void setPayloadValidator(std::function<bool(const std::string&)> validator);
+
+    /**
+     * @brief Enables sliding-window BCJR decoding in both constituent decoders.
+     * @param window The window length (0 decodes whole frames).
+     * @param warmup The number of backward warm-up steps before each window.
+     */
+    void setSlidingWindow(size_t window, size_t warmup);
+
+    /**
+     * @brief Selects double or fixed-point BCJR/MAP decoding in both constituent decoders.
+     * @param value The decoder precision.
+     */
+    void setPrecision(Precision value);
+
+    /**
+     * @brief Selects the interleaver of the second encoder.
+     * @param value The interleaver type.
+     */
+    void setInterleaver(InterleaverType value);
+
+    /**
+     * @brief Enables parallel sub-block BCJR/MAP decoding in both constituent decoders.
+     * @param count The number of sub-blocks per frame (1 decodes serially).
+     */
+    void setSubBlocks(size_t count);
+
+    /**
+     * @brief Selects whether the sub-blocks run on threads of their own in both constituent
+     *        decoders (see ConvolutionalCode::setSubBlockThreads).
+     * @param enabled Whether to start a thread per sub-block.
+     */
+    void setSubBlockThreads(bool enabled);
+
+    /**
+     * @brief Selects radix-2 or radix-4 BCJR/MAP recursions in both constituent decoders.
+     * @param value The radix (2 or 4).
+     */
+    void setRadix(unsigned value);
+
+    /**
+     * @brief Sets the SOVA register-exchange depth of both constituent decoders.
+     * @param depth The number of trellis steps after which a decision is released.
+     */
+    void setSovaDepth(size_t depth);
+
+    /**
+     * @brief Returns the number of iterations run by the most recent call to decode.
+     * @return The number of decoding iterations.
+     */
+    int getLastIterations() const;
+
+    /**
+     * @brief Enables or disables per-frame tracing. While disabled, decodes collect nothing.
+     * @param enabled Whether to record a FrameTrace of every decoded frame.
+     */
+    void setTracing(bool enabled);
+
+    /**
+     * @brief Returns the traces of the most recent decode, decodeLLR, decodeAll or decodeAllLLR,
+     *        one per algorithm in the order they were requested (empty unless tracing is enabled).
+     * @return The frame traces.
+     */
+    const std::vector<FrameTrace>& getLastTraces() const;
+
+    /**
+     * @brief Decodes every frame with its own estimated noise variance and iteration budget
+     *        (see estimateChannel). The noise variance passed to the decode methods is then ignored.
+     * @param enabled Whether to estimate the channel of every frame.
+     */
+    void setAdaptiveNoise(bool enabled);
+
+    /**
+     * @brief Selects when HYBRID switches between MAP and SOVA. HYBRID_ADAPTIVE (the default) runs the
+     *        cheaper SOVA first and escalates to MAP only the frames whose SOVA iterations stall;
+     *        HYBRID_FIXED runs MAP for the first maxIterations / 2 iterations and SOVA after that, and
+     *        shares its MAP iterations with MAP in decodeAll. turbo_codec.TurboCodec.set_hybrid_schedule
+     *        records the measured trade-off.
+     * @param value The HYBRID schedule.
+     */
+    void setHybridSchedule(HybridSchedule value);
+
+    /**
+     * @brief Estimates the noise variance and the iteration budget of a frame. The crossover
+     *        probability comes from the agreement of the received encoder1 parity with the
+     *        re-encoded systematic bits (encoder1 does not depend on the interleaver). Hard frames
+     *        are decoded with the noise variance of a BSC with that crossover, and so are LLR frames
+     *        whose values all have one magnitude, rescaled to that magnitude. Other LLR frames take
+     *        their noise variance, and the worse of the two crossover estimates, from the M2M4
+     *        moment estimator. The budget grows with the crossover from ADAPTIVE_MIN_ITERATIONS
+     *        to maxIterations at ADAPTIVE_FULL_BUDGET_CROSSOVER.
+     * @param systematic The systematic channel values.
+     * @param parity1 The parity values of the first encoder.
+     * @param parity2 The parity values of the second encoder.
+     * @param softInput Whether the values are LLRs.
+     * @param noiseVariance Receives the noise variance to decode the frame with.
+     * @param iterationBudget Receives the largest number of iterations to run.
+     */
+    void estimateChannel(const std::vector<double>& systematic, const std::vector<double>& parity1,
+                         const std::vector<double>& parity2, bool softInput, double& noiseVariance,
+                         int& iterationBudget);
+};
+
+// C interface
+/**
+ * @brief Plain C entry points for loading the codec as a shared library (e.g. through ctypes).
+ *        All buffers are owned by the caller. Functions that write into a buffer return the
+ *        number of bytes written, or a negative TURBO_CODEC_ERROR_* code on failure.
+ */
+extern "C" {
+
+#define TURBO_CODEC_ERROR_BUFFER_TOO_SMALL (-1)
+#define TURBO_CODEC_ERROR_UNSUPPORTED_ALGORITHM (-2)
+#define TURBO_CODEC_ERROR_NO_TRACE (-3)
+#define TURBO_CODEC_ERROR_UNSUPPORTED_LENGTH (-4) // The QPP interleaver has no permutation of the frame length.
+
+/**
+ * @brief Creates a new TurboCodec instance.
+ * @return A pointer to the codec, to be released with TurboCodec_delete.
+ */
+TurboCodec* TurboCodec_new();
+
+/**
+ * @brief Releases a TurboCodec instance created by TurboCodec_new.
+ * @param codec The codec to release.
+ */
+void TurboCodec_delete(TurboCodec* codec);
+
+/**
+ * @brief Turbo-encodes a byte buffer into a buffer of '0'/'1' characters.
+ * @param codec The codec instance.
+ * @param input The bytes to encode.
+ * @param inputLength The number of input bytes.
+ * @param output The output buffer (needs 24 bytes per input byte).
+ * @param outputCapacity The size of the output buffer.
+ * @return The number of bytes written, or a negative error code.
+ */
+int64_t TurboCodec_encode(TurboCodec* codec, const char* input, size_t inputLength,
+                          char* output, size_t outputCapacity);
+
+/**
+ * @brief Decodes a buffer of '0'/'1' characters into bytes.
+ * @param codec The codec instance.
+ * @param input The encoded characters.
+ * @param inputLength The number of encoded characters.
+ * @param output The output buffer (needs one byte per 24 encoded characters, rounded up).
+ * @param outputCapacity The size of the output buffer.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+ * @return The number of bytes written, or a negative error code.
+ */
+int64_t TurboCodec_decode(TurboCodec* codec, const char* input, size_t inputLength,
+                          char* output, size_t outputCapacity,
+                          double noiseVariance, const char* algorithm);
+
+/**
+ * @brief Decodes a frame of soft channel LLRs into bytes.
+ * @param codec The codec instance.
+ * @param llrs The channel LLRs, ordered like the encoded bits.
+ * @param count The number of LLRs.
+ * @param output The output buffer (needs one byte per 24 LLRs, rounded up).
+ * @param outputCapacity The size of the output buffer.
+ * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", "SOVA", or "HYBRID").
+ * @return The number of bytes written, or a negative error code.
+ */
+int64_t TurboCodec_decodeLLR(TurboCodec* codec, const float* llrs, size_t count,
+                             char* output, size_t outputCapacity, const char* algorithm);
+
+/**
+ * @brief Runs the constituent decoder of the first encoder once (see TurboCodec::decodeConstituent).
+ * @param codec The codec instance.
+ * @param systematic The systematic channel values.
+ * @param parity The parity values of the first encoder.
+ * @param extrinsic The a-priori (extrinsic) information.
+ * @param length The number of values in each of the three arrays.
+ * @param noiseVariance The variance of the noise in the channel.
+ * @param algorithm The decoding algorithm to use ("BCJR", "MAP", "LOGMAP", or "SOVA").
+ * @param llrs The output buffer (needs length values).
+ * @return The number of LLRs written, or a negative error code.
+ */
+int64_t TurboCodec_decodeConstituent(TurboCodec* codec, const double* systematic, const double* parity,
+                                     const double* extrinsic, size_t length, double noiseVariance,
+                                     const char* algorithm, double* llrs);
+
+/**
+ * @brief Sets the maximum number of decoding iterations.
+ * @param codec The codec instance.
+ * @param iterations The maximum number of iterations.
+ */
+void TurboCodec_setMaxIterations(TurboCodec* codec, int iterations);
+
+/**
+ * @brief Sets the convergence threshold for decoding.
+ * @param codec The codec instance.
+ * @param threshold The convergence threshold.
+ */
+void TurboCodec_setConvergenceThreshold(TurboCodec* codec, double threshold);
+
+/**
+ * @brief Selects the early-termination criteria.
+ * @param codec The codec instance.
+ * @param criteria A bitwise OR of StoppingCriterion flags.
+ * @param ratio The largest fraction of changed hard decisions accepted by STOP_SCR.
+ */
+void TurboCodec_setStoppingCriteria(TurboCodec* codec, int criteria, double ratio);
+
+/**
+ * @brief Sets the payload check used by STOP_CRC.
+ * @param codec The codec instance.
+ * @param validator A function returning non-zero for a valid payload (NULL restores hasValidCrc16).
+ */
+void TurboCodec_setPayloadValidator(TurboCodec* codec, int (*validator)(const char* payload, size_t length));
+
+/**
+ * @brief Enables sliding-window BCJR decoding.
+ * @param codec The codec instance.
+ * @param window The window length (0 decodes whole frames).
+ * @param warmup The number of backward warm-up steps before each window.
+ */
+void TurboCodec_setSlidingWindow(TurboCodec* codec, size_t window, size_t warmup);
+
+/**
+ * @brief Selects double or fixed-point BCJR/MAP decoding.
+ * @param codec The codec instance.
+ * @param precision A Precision value.
+ */
+void TurboCodec_setPrecision(TurboCodec* codec, int precision);
+
+/**
+ * @brief Selects the interleaver of the second encoder.
+ * @param codec The codec instance.
+ * @param interleaver An InterleaverType value.
+ */
+void TurboCodec_setInterleaver(TurboCodec* codec, int interleaver);
+
+/**
+ * @brief Enables parallel sub-block BCJR/MAP decoding.
+ * @param codec The codec instance.
+ * @param count The number of sub-blocks per frame (1 decodes serially).
+ */
+void TurboCodec_setSubBlocks(TurboCodec* codec, size_t count);
+
+/**
+ * @brief Selects radix-2 or radix-4 BCJR/MAP recursions.
+ * @param codec The codec instance.
+ * @param radix The radix (2 or 4).
+ */
+void TurboCodec_setRadix(TurboCodec* codec, unsigned radix);
+
+/**
+ * @brief Sets the SOVA register-exchange depth.
+ * @param codec The codec instance.
+ * @param depth The number of trellis steps after which a decision is released.
+ */
+void TurboCodec_setSovaDepth(TurboCodec* codec, size_t depth);
+
+/**
+ * @brief Returns the number of iterations run by the most recent decode.
+ * @param codec The codec instance.
+ * @return The number of decoding iterations.
+ */
+int TurboCodec_getLastIterations(const TurboCodec* codec);
+
+/**
+ * @brief Enables or disables per-frame tracing.
+ * @param codec The codec instance.
+ * @param enabled Non-zero to record a trace of every decoded frame.
+ */
+void TurboCodec_setTracing(TurboCodec* codec, int enabled);
+
+/**
+ * @brief Copies the trace of the most recent decode (its last algorithm).
+ * @param codec The codec instance.
+ * @param halfIterationSeconds Receives the time of every half-iteration.
+ * @param maxAbsLLR Receives the largest |LLR| after every half-iteration.
+ * @param capacity The capacity of both buffers.
+ * @param status Receives 1 if a stopping criterion fired, 2 if the result was cached, otherwise 0.
+ * @return The number of half-iterations, TURBO_CODEC_ERROR_BUFFER_TOO_SMALL, or
+ *         TURBO_CODEC_ERROR_NO_TRACE if tracing is disabled.
+ */
+int64_t TurboCodec_getLastTrace(const TurboCodec* codec, double* halfIterationSeconds, double* maxAbsLLR,
+                                size_t capacity, int* status);
+
+/**
+ * @brief Enables or disables per-frame noise variance and iteration budget estimation.
+ * @param codec The codec instance.
+ * @param enabled Non-zero to estimate the channel of every frame.
+ */
+void TurboCodec_setAdaptiveNoise(TurboCodec* codec, int enabled);
+
+/**
+ * @brief Selects when HYBRID switches between MAP and SOVA.
+ * @param codec The codec instance.
+ * @param schedule A HybridSchedule value.
+ */
+void TurboCodec_setHybridSchedule(TurboCodec* codec, int schedule);
+
+}
+
+#endif // TURBO_CODEC_H
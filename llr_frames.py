@@ -0,0 +1,103 @@
+# llr_frames.py
+"""Binary frame files of soft channel values (LLRs) for turbo decoding.
+
+A file starts with a 12-byte header and holds one record per frame, all
+little-endian:
+
+    header:  magic b"TLLR", version (uint8), value type (uint8: 0 float32, 1 int8),
+             reserved (uint16), scale (float32, int8 steps per unit LLR)
+    record:  packet id length (uint16), value count (uint32), packet id (UTF-8),
+             values (one per channel bit: systematic, parity 1, parity 2, ...)
+
+LLRs follow the decoder convention: a positive value favours bit 1, and a channel
+value y received with noise variance s2 has the LLR y / s2. The C++ LLRFrameReader
+reads the same format.
+"""
+import argparse
+import struct
+import sys
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from frame_csv import read_frames
+from turbo_codec import FIXED_LLR_SCALE, hard_bits_to_llr
+
+LLR_FILE_MAGIC = b"TLLR"
+LLR_FILE_VERSION = 1
+LLR_FLOAT32 = "float32"
+LLR_INT8 = "int8"  # Saturated at +/-127 steps of 1 / scale
+LLR_TYPES = {LLR_FLOAT32: 0, LLR_INT8: 1}
+
+HEADER = struct.Struct("<4sBBHf")
+RECORD = struct.Struct("<HI")
+
+
+def write_llr_frames(path: str, frames: Iterable[Tuple[str, np.ndarray]], value_type: str = LLR_FLOAT32,
+                     scale: float = FIXED_LLR_SCALE) -> int:
+    """Writes (packet id, LLR array) pairs to a frame file, returning the number of frames written."""
+    if value_type not in LLR_TYPES:
+        raise ValueError(f"Unsupported LLR type: {value_type}")
+    count = 0
+    with open(path, "wb") as output_file:
+        output_file.write(HEADER.pack(LLR_FILE_MAGIC, LLR_FILE_VERSION, LLR_TYPES[value_type], 0, scale))
+        for packet_id, llrs in frames:
+            llrs = np.asarray(llrs, dtype=np.float64).reshape(-1)
+            if value_type == LLR_INT8:
+                values = np.clip(np.rint(np.nan_to_num(llrs * scale)), -127, 127).astype("<i1")
+            else:
+                values = llrs.astype("<f4")
+            packet_id = packet_id.encode("utf-8")
+            output_file.write(RECORD.pack(len(packet_id), len(values)))
+            output_file.write(packet_id)
+            output_file.write(values.tobytes())
+            count += 1
+    return count
+
+
+def read_llr_frames(path: str) -> Iterator[Tuple[str, np.ndarray]]:
+    """Yields (packet id, float64 LLR array) pairs from a frame file."""
+    with open(path, "rb") as input_file:
+        header = input_file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"Not an LLR frame file: {path}")
+        magic, version, type_code, _, scale = HEADER.unpack(header)
+        if magic != LLR_FILE_MAGIC or version != LLR_FILE_VERSION or type_code not in LLR_TYPES.values():
+            raise ValueError(f"Not an LLR frame file: {path}")
+        dtype = np.dtype("<i1") if type_code == LLR_TYPES[LLR_INT8] else np.dtype("<f4")
+
+        while True:
+            record = input_file.read(RECORD.size)
+            if not record:
+                break
+            if len(record) < RECORD.size:
+                raise ValueError(f"Truncated LLR frame file: {path}")
+            id_length, count = RECORD.unpack(record)
+            packet_id = input_file.read(id_length)
+            data = input_file.read(count * dtype.itemsize)
+            if len(packet_id) < id_length or len(data) < count * dtype.itemsize:
+                raise ValueError(f"Truncated LLR frame file: {path}")
+            llrs = np.frombuffer(data, dtype=dtype).astype(np.float64)
+            if type_code == LLR_TYPES[LLR_INT8]:
+                llrs /= scale
+            yield packet_id.decode("utf-8"), llrs
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Converts a CSV log of hard-bit turbo frames into an LLR frame file.")
+    parser.add_argument("input", help="encoded frames CSV file")
+    parser.add_argument("output", help="LLR frame file to write")
+    parser.add_argument("--noise-variance", type=float, default=0.5)
+    parser.add_argument("--type", choices=list(LLR_TYPES), default=LLR_FLOAT32, help="stored value type")
+    parser.add_argument("--scale", type=float, default=FIXED_LLR_SCALE, help="int8 steps per unit LLR")
+    args = parser.parse_args(argv)
+
+    frames = ((packet_id, hard_bits_to_llr([frame], args.noise_variance)[0])
+              for packet_id, frame in read_frames(args.input))
+    count = write_llr_frames(args.output, frames, args.type, args.scale)
+    print(f"Wrote {count} frames to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+# parallel_decode.py
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from decode_cache import DecodeCache
+from decode_trace import TraceWriter
+from frame_csv import read_frames
+from turbo_codec import (HYBRID_ADAPTIVE, HYBRID_SCHEDULES, PRECISION_FIXED, PRECISION_FLOAT, STOP_THRESHOLD,
+                         STOPPING_CRITERIA, TurboCodec, canonical_algorithm)
+
+ALGORITHMS = ["BCJR", "MAP", "SOVA", "HYBRID"]
+ALL_ALGORITHMS = ALGORITHMS + ["LOGMAP"]
+DEFAULT_INPUT = "Turbo_Codes_Data.csv"
+
+# Codec and noise variance of the current worker process, set once by the pool initializer
+_worker_codec = None
+_worker_noise_variance = 0.5
+_worker_traces: Optional[List[Dict[str, object]]] = None  # Trace records of the current batch, when tracing
+
+
+def chunked(items: Iterator, size: int) -> Iterator[List]:
+    """Groups an iterator into lists of at most `size` items."""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker(noise_variance: float, max_iterations: int, convergence_threshold: float,
+                 window_size: int, warmup_length: int, stopping_criteria: List[str], sign_change_ratio: float,
+                 precision: str, cache_path: Optional[str], trace: bool = False, adaptive_noise: bool = False,
+                 hybrid_schedule: str = HYBRID_ADAPTIVE):
+    global _worker_codec, _worker_noise_variance, _worker_traces
+    _worker_codec = TurboCodec()
+    _worker_codec.set_max_iterations(max_iterations)
+    _worker_codec.set_convergence_threshold(convergence_threshold)
+    _worker_codec.set_sliding_window(window_size, warmup_length)
+    _worker_codec.set_stopping_criteria(stopping_criteria, sign_change_ratio)
+    _worker_codec.set_precision(precision)
+    _worker_codec.set_adaptive_noise(adaptive_noise)
+    _worker_codec.set_hybrid_schedule(hybrid_schedule)
+    if cache_path:
+        _worker_codec.set_decode_cache(DecodeCache(cache_path))
+    _worker_noise_variance = noise_variance
+    if trace:
+        _worker_traces = []
+        _worker_codec.set_trace_sink(_worker_traces.append)
+
+
+def decode_chunk(job: Tuple[List[Tuple[str, str]], List[str]]) -> List[Tuple[str, Dict[str, str], Dict[str, int],
+                                                                             Dict[str, Dict[str, object]]]]:
+    """Decodes a chunk of frames with every requested algorithm, keeping the chunk order.
+
+    Returns (packet id, decoded text per algorithm, iterations per algorithm, trace record
+    per algorithm) for each frame; the trace records are empty unless the worker traces.
+    """
+    frames, algorithms = job
+    codec = _worker_codec
+    results: List[Dict[str, str]] = [{} for _ in frames]
+    iterations: List[Dict[str, int]] = [{} for _ in frames]
+    traces: List[Dict[str, Dict[str, object]]] = [{} for _ in frames]
+
+    # Frames of the same length are decoded together as one batch
+    by_length: Dict[int, List[int]] = {}
+    for index, (_, frame) in enumerate(frames):
+        by_length.setdefault(len(frame), []).append(index)
+    for indices in by_length.values():
+        batch = [frames[i][1] for i in indices]
+        computed = {}  # Aliased algorithms (MAP) reuse the result of the one that computes them
+        for algorithm in algorithms:
+            canonical = canonical_algorithm(algorithm)
+            if canonical not in computed:
+                decoded, frame_iterations = codec.decode_batch(batch, _worker_noise_variance, canonical)
+                # decode_batch emits one trace record per frame, in batch order
+                computed[canonical] = (decoded, frame_iterations, list(_worker_traces or ()))
+                if _worker_traces is not None:
+                    _worker_traces.clear()
+            decoded, frame_iterations, batch_traces = computed[canonical]
+            for i, text, count in zip(indices, decoded, frame_iterations):
+                results[i][algorithm] = text
+                iterations[i][algorithm] = count
+            for i, record in zip(indices, batch_traces):
+                traces[i][algorithm] = dict(record, frame=frames[i][0], algorithm=algorithm)
+
+    return [(packet_id, result, counts, frame_traces)
+            for (packet_id, _), result, counts, frame_traces in zip(frames, results, iterations, traces)]
+
+
+def parallel_decode(input_path: str, output_dir: str = ".", algorithms: List[str] = None,
+                    workers: int = None, chunk_size: int = 32, noise_variance: float = 0.5,
+                    max_iterations: int = 20, convergence_threshold: float = 0.001,
+                    window_size: int = 0, warmup_length: int = 32, stopping_criteria: List[str] = None,
+                    sign_change_ratio: float = 0.0,
+                    precision: str = PRECISION_FLOAT,
+                    cache_path: Optional[str] = None,
+                    trace_path: Optional[str] = None,
+                    adaptive_noise: bool = False,
+                    hybrid_schedule: str = HYBRID_ADAPTIVE) -> Tuple[int, float, Dict[str, int]]:
+    """Decodes every frame of `input_path` across a process pool.
+
+    Results are streamed back in packet order into <ALGORITHM>_Output.csv files in
+    `output_dir`. Returns the number of decoded frames, the elapsed time in seconds and
+    the total number of decoding iterations run per algorithm. With `cache_path`, the
+    workers share a persistent decode cache, so frames decoded by an earlier run (with
+    the same settings) are not decoded again. With `trace_path`, a trace record of every
+    frame and algorithm is written to that CSV or JSON-lines file (see decode_trace). With
+    `adaptive_noise`, every frame is decoded with its own estimated noise variance and
+    iteration budget instead of `noise_variance` (see TurboCodec.estimate_channel).
+    `hybrid_schedule` selects when HYBRID switches between MAP and SOVA (see
+    TurboCodec.set_hybrid_schedule).
+    """
+    algorithms = algorithms or ALGORITHMS
+    workers = workers or os.cpu_count() or 1
+    stopping_criteria = stopping_criteria or [STOP_THRESHOLD]
+    total_iterations = {algorithm: 0 for algorithm in algorithms}
+    output_files = {algorithm: open(os.path.join(output_dir, f"{algorithm}_Output.csv"), "w",
+                                    encoding="latin-1", newline="")
+                    for algorithm in algorithms}
+    trace_writer = TraceWriter(trace_path) if trace_path else None
+    frame_count = 0
+    start = time.perf_counter()
+    try:
+        jobs = ((chunk, algorithms) for chunk in chunked(read_frames(input_path), chunk_size))
+        with Pool(workers, initializer=_init_worker,
+                  initargs=(noise_variance, max_iterations, convergence_threshold,
+                            window_size, warmup_length, stopping_criteria, sign_change_ratio,
+                            precision, cache_path, trace_writer is not None, adaptive_noise,
+                            hybrid_schedule)) as pool:
+            # imap keeps the chunk order, so the output files stay in packet order
+            for chunk_results in pool.imap(decode_chunk, jobs):
+                for packet_id, decoded, iterations, traces in chunk_results:
+                    for algorithm in algorithms:
+                        output_files[algorithm].write(f"{packet_id},{decoded[algorithm]}\n")
+                        total_iterations[algorithm] += iterations[algorithm]
+                        if trace_writer is not None:
+                            trace_writer.write(traces[algorithm])
+                frame_count += len(chunk_results)
+    finally:
+        for output_file in output_files.values():
+            output_file.close()
+        if trace_writer is not None:
+            trace_writer.close()
+    return frame_count, time.perf_counter() - start, total_iterations
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parallel turbo decoding of a CanSat frame log.")
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT, help="encoded frames CSV file")
+    parser.add_argument("-o", "--output-dir", default=".", help="directory for the *_Output.csv files")
+    parser.add_argument("-a", "--algorithms", nargs="+", choices=ALL_ALGORITHMS, default=ALGORITHMS,
+                        help="decoding algorithms to produce")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-c", "--chunk-size", type=int, default=32, help="frames per worker task")
+    parser.add_argument("--noise-variance", type=float, default=0.5)
+    parser.add_argument("--adaptive-noise", action="store_true",
+                        help="estimate the noise variance and iteration budget of every frame")
+    parser.add_argument("--hybrid-schedule", choices=HYBRID_SCHEDULES, default=HYBRID_ADAPTIVE,
+                        help="when HYBRID switches between MAP and SOVA")
+    parser.add_argument("--max-iterations", type=int, default=20)
+    parser.add_argument("--convergence-threshold", type=float, default=0.001)
+    parser.add_argument("--stop", nargs="+", choices=STOPPING_CRITERIA, default=[STOP_THRESHOLD],
+                        help="early-termination criteria (stop when any fires)")
+    parser.add_argument("--sign-change-ratio", type=float, default=0.0,
+                        help="largest fraction of changed hard decisions accepted by SCR")
+    parser.add_argument("--precision", choices=[PRECISION_FLOAT, PRECISION_FIXED], default=PRECISION_FLOAT,
+                        help="BCJR/MAP arithmetic")
+    parser.add_argument("--window", type=int, default=0, help="sliding-window BCJR length (0 = whole frame)")
+    parser.add_argument("--warmup", type=int, default=32, help="sliding-window warm-up length")
+    parser.add_argument("--cache", metavar="PATH", default=None,
+                        help="persistent decode cache (SQLite), reused across runs")
+    parser.add_argument("--trace", metavar="PATH", default=None,
+                        help="per-frame decoder trace file (.csv, otherwise JSON lines)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.input):
+        print(f"Failed to open input file: {args.input}", file=sys.stderr)
+        return 1
+
+    frame_count, elapsed, total_iterations = parallel_decode(
+        args.input, args.output_dir, args.algorithms, args.workers, args.chunk_size, args.noise_variance,
+        args.max_iterations, args.convergence_threshold, args.window, args.warmup, args.stop,
+        args.sign_change_ratio, args.precision, args.cache, args.trace, args.adaptive_noise, args.hybrid_schedule)
+    rate = frame_count / elapsed if elapsed > 0 else 0.0
+    print(f"Decoded {frame_count} frames in {elapsed:.2f} s ({rate:.1f} frames/s)")
+    for algorithm, iterations in total_iterations.items():
+        print(f"{algorithm}: {iterations / max(frame_count, 1):.2f} iterations per frame")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
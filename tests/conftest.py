@@ -0,0 +1,38 @@
+"""Shared helpers of the turbo codec tests."""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The modules live at the repository root, next to the GUI
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from turbo_codec import ConvolutionalCode  # noqa: E402
+
+
+def constituent_code() -> ConvolutionalCode:
+    """Returns the constituent encoder used by TurboCodec."""
+    return ConvolutionalCode(2, 3, [0b1011, 0b1111])
+
+
+def channel_values(seed: int, frames: int, length: int, noise_variance: float):
+    """Encodes random bits with the constituent code and sends them over an AWGN channel.
+
+    Returns the transmitted bits and the received (systematic, parity, a-priori) values,
+    each of shape (frames, length); the a-priori values are small random extrinsic inputs.
+    """
+    rng = np.random.default_rng(seed)
+    code = constituent_code()
+    bits = rng.integers(0, 2, (frames, length)).astype(np.uint8)
+    parity_bits = np.array([code.encode_array(frame) for frame in bits])
+    noise = rng.normal(0.0, np.sqrt(noise_variance), (2, frames, length))
+    systematic = 2.0 * bits - 1.0 + noise[0]
+    parity = 2.0 * parity_bits - 1.0 + noise[1]
+    apriori = rng.normal(0.0, 0.5, (frames, length))
+    return bits, systematic, parity, apriori
+
+
+@pytest.fixture
+def code() -> ConvolutionalCode:
+    return constituent_code()
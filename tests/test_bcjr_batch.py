@@ -0,0 +1,122 @@
+"""The vectorized constituent decoders against per-frame and loop-by-loop references."""
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from conftest import channel_values
+from turbo_codec import PRECISION_FIXED
+
+NOISE_VARIANCE = 0.8
+
+
+def reference_bcjr(code, systematic, parity, extrinsic, noise_variance):
+    """Max-log BCJR of one frame with a loop over every step, state and input.
+
+    The branch metrics and path sums are formed in the same order as in
+    decode_bcjr_batch, so the LLRs must agree bit for bit.
+    """
+    length = len(systematic)
+    alpha = np.full((length + 1, code.num_states), -np.inf)
+    beta = np.zeros((length + 1, code.num_states))
+    alpha[0, 0] = 0.0
+
+    def gamma(t, state, bit):
+        inputs = (systematic[t] + extrinsic[t]) / noise_variance
+        check = parity[t] / noise_variance
+        parity_bit = code.compute_next_output(state, bit) != 0
+        return (inputs if bit else -inputs) + (check if parity_bit else -check)
+
+    for t in range(length):
+        for state in range(code.num_states):
+            for bit in (0, 1):
+                next_state = code.compute_next_state(state, bit)
+                alpha[t + 1, next_state] = max(alpha[t + 1, next_state], alpha[t, state] + gamma(t, state, bit))
+    for t in range(length - 1, -1, -1):
+        beta[t] = -np.inf
+        for state in range(code.num_states):
+            for bit in (0, 1):
+                next_state = code.compute_next_state(state, bit)
+                beta[t, state] = max(beta[t, state], beta[t + 1, next_state] + gamma(t, state, bit))
+
+    llr = np.empty(length)
+    for t in range(length):
+        probs = [-np.inf, -np.inf]
+        for state in range(code.num_states):
+            for bit in (0, 1):
+                next_state = code.compute_next_state(state, bit)
+                probs[bit] = max(probs[bit], alpha[t, state] + gamma(t, state, bit) + beta[t + 1, next_state])
+        llr[t] = (probs[1] - probs[0]) * (noise_variance / 2.0)
+    return llr
+
+
+def test_bcjr_matches_loop_reference(code):
+    _, systematic, parity, apriori = channel_values(1, 3, 40, NOISE_VARIANCE)
+    batch = code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE)
+    for frame in range(3):
+        expected = reference_bcjr(code, systematic[frame], parity[frame], apriori[frame], NOISE_VARIANCE)
+        np.testing.assert_array_equal(batch[frame], expected)
+
+
+@pytest.mark.parametrize("decoder", ["decode_bcjr", "decode_map", "decode_log_map", "decode_sova"])
+def test_batch_matches_single_frames(code, decoder):
+    _, systematic, parity, apriori = channel_values(2, 5, 96, NOISE_VARIANCE)
+    batch = getattr(code, decoder + "_batch")(systematic, parity, apriori, NOISE_VARIANCE)
+    for frame in range(5):
+        single = getattr(code, decoder)(systematic[frame].tolist(), parity[frame].tolist(), apriori[frame].tolist(),
+                                        NOISE_VARIANCE)
+        np.testing.assert_array_equal(batch[frame], single)
+
+
+# Decoder modes that take a workspace: (decoder, setup of the constituent code)
+WORKSPACE_MODES = {
+    "radix2": ("decode_bcjr_batch", lambda code: None),
+    "radix4": ("decode_bcjr_batch", lambda code: code.set_radix(4)),
+    "window": ("decode_bcjr_batch", lambda code: code.set_sliding_window(16, 8)),
+    "sub_blocks": ("decode_bcjr_batch", lambda code: code.set_sub_blocks(4)),
+    "fixed": ("decode_bcjr_batch", lambda code: code.set_precision(PRECISION_FIXED)),
+    "log_map": ("decode_log_map_batch", lambda code: None),
+    "sova": ("decode_sova_batch", lambda code: None),
+}
+
+
+@pytest.mark.parametrize("mode", list(WORKSPACE_MODES))
+def test_workspace_matches_fresh_arrays(code, mode):
+    decoder, setup = WORKSPACE_MODES[mode]
+    setup(code)
+    decode = getattr(code, decoder)
+    _, systematic, parity, apriori = channel_values(3, 4, 64, NOISE_VARIANCE)
+    workspace = {}
+    expected = decode(systematic, parity, apriori, NOISE_VARIANCE).copy()
+    decode(systematic[:, ::-1], parity, apriori, NOISE_VARIANCE, workspace=workspace)
+    reused = decode(systematic, parity, apriori, NOISE_VARIANCE, workspace=workspace)
+    np.testing.assert_array_equal(reused, expected)
+
+
+def peak_allocation(decode, length):
+    """Returns the peak allocation of a decode whose workspace already holds arrays of the frame length."""
+    _, systematic, parity, apriori = channel_values(9, 4, length, NOISE_VARIANCE)
+    workspace = {}
+    decode(systematic, parity, apriori, NOISE_VARIANCE, workspace=workspace)
+    tracemalloc.start()
+    decode(systematic, parity, apriori, NOISE_VARIANCE, workspace=workspace)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+@pytest.mark.parametrize("mode", list(WORKSPACE_MODES))
+def test_workspace_decode_allocates_no_frame_sized_arrays(code, mode):
+    decoder, setup = WORKSPACE_MODES[mode]
+    setup(code)
+    short, long = peak_allocation(getattr(code, decoder), 500), peak_allocation(getattr(code, decoder), 2000)
+    # Less than one float64 per extra symbol of the 4 frames: only fixed-size NumPy buffers remain
+    assert long - short < (2000 - 500) * 4 * np.dtype(np.float64).itemsize
+
+
+@pytest.mark.parametrize("length", [1, 2, 47, 96])
+def test_radix4_matches_radix2(code, length):
+    _, systematic, parity, apriori = channel_values(4, 3, length, NOISE_VARIANCE)
+    expected = code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE).copy()
+    code.set_radix(4)
+    np.testing.assert_array_equal(code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE), expected)
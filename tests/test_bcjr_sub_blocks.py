@@ -0,0 +1,60 @@
+"""Parallel sub-block BCJR against the full-frame decoder."""
+import numpy as np
+import pytest
+
+import turbo_codec_native
+from conftest import channel_values
+from turbo_codec import TurboCodec, bytes_to_bits
+
+NOISE_VARIANCE = 0.8
+
+
+@pytest.mark.parametrize("blocks", [2, 4, 7])
+def test_sub_block_llrs_converge_to_full_frame(code, blocks):
+    _, systematic, parity, apriori = channel_values(10, 4, 300, NOISE_VARIANCE)
+    full = code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE).copy()
+    code.set_sub_blocks(blocks)
+    boundaries = np.zeros((4, 2, blocks, code.num_states))
+
+    # First iteration: inner boundaries start equiprobable, so only the decisions mostly agree
+    first = code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE, boundaries=boundaries)
+    assert np.mean((first > 0) == (full > 0)) > 0.95
+
+    # Later iterations start from the boundary metrics of the previous one
+    for _ in range(2):
+        llrs = code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE, boundaries=boundaries)
+        np.testing.assert_allclose(llrs, full, rtol=0.0, atol=1e-9)
+        np.testing.assert_array_equal(llrs > 0, full > 0)
+
+
+def noisy_llr_frames(codec):
+    rng = np.random.default_rng(11)
+    messages = rng.integers(0, 256, (20, 32)).astype(np.uint8)
+    encoded = np.array([bytes_to_bits(codec.encode_packed(message))[:32 * 8 * 3] for message in messages])
+    noise_variance = 1.0 / (2.0 * (1.0 / 3.0) * 10.0 ** 0.3)  # Eb/N0 = 3 dB
+    return (2.0 * encoded - 1.0 + rng.normal(0.0, np.sqrt(noise_variance), encoded.shape)) / noise_variance
+
+
+@pytest.mark.parametrize("blocks", [2, 4, 8])
+def test_turbo_decode_with_sub_blocks_matches_serial(blocks):
+    codec = TurboCodec()
+    codec.max_iterations = 8
+    llrs = noisy_llr_frames(codec)
+    expected, _ = codec.decode_llr_batch(llrs, "BCJR")
+    codec.set_sub_blocks(blocks)
+    assert codec.decode_llr_batch(llrs, "BCJR")[0] == expected
+
+
+@pytest.mark.parametrize("blocks", [2, 4, 8])
+def test_native_sub_blocks_match_python_serial(blocks):
+    try:
+        native = turbo_codec_native.TurboCodec()
+    except OSError:
+        pytest.skip("the C++ TurboCodec library is not built (see turbo_codec_native)")
+    codec = TurboCodec()
+    codec.max_iterations = 8
+    native.set_max_iterations(8)
+    llrs = noisy_llr_frames(codec)
+    expected, _ = codec.decode_llr_batch(llrs, "BCJR")
+    native.set_sub_blocks(blocks)
+    assert [native.decode_llr(frame, "BCJR") for frame in llrs] == expected
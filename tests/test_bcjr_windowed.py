@@ -0,0 +1,66 @@
+"""Sliding-window BCJR against the full-frame decoder."""
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from conftest import channel_values
+
+NOISE_VARIANCE = 0.8
+LENGTH = 300
+
+
+@pytest.fixture
+def frames():
+    _, systematic, parity, apriori = channel_values(5, 8, LENGTH, NOISE_VARIANCE)
+    return systematic, parity, apriori
+
+
+@pytest.mark.parametrize("window", [16, 40, 64])
+@pytest.mark.parametrize("warmup", [16, 32, 48])
+def test_windowed_matches_full_frame(code, frames, window, warmup):
+    full = code.decode_bcjr_batch(*frames, NOISE_VARIANCE).copy()
+    code.set_sliding_window(window, warmup)
+    windowed = code.decode_bcjr_batch(*frames, NOISE_VARIANCE)
+    # Max-log LLRs are differences of path metrics, so a settled warm-up leaves only rounding
+    np.testing.assert_allclose(windowed, full, rtol=0.0, atol=1e-9)
+    np.testing.assert_array_equal(windowed > 0, full > 0)
+
+
+@pytest.mark.parametrize("window", [16, 64])
+def test_warmup_to_frame_end_is_exact(code, frames, window):
+    full = code.decode_bcjr_batch(*frames, NOISE_VARIANCE).copy()
+    code.set_sliding_window(window, LENGTH)
+    np.testing.assert_array_equal(code.decode_bcjr_batch(*frames, NOISE_VARIANCE), full)
+
+
+@pytest.mark.parametrize("window", [LENGTH, LENGTH + 1, 4 * LENGTH])
+def test_window_longer_than_frame_is_exact(code, frames, window):
+    full = code.decode_bcjr_batch(*frames, NOISE_VARIANCE).copy()
+    code.set_sliding_window(window, 32)
+    np.testing.assert_array_equal(code.decode_bcjr_batch(*frames, NOISE_VARIANCE), full)
+
+
+def test_short_warmup_keeps_most_decisions(code, frames):
+    full = code.decode_bcjr_batch(*frames, NOISE_VARIANCE).copy()
+    code.set_sliding_window(40, 0)
+    windowed = code.decode_bcjr_batch(*frames, NOISE_VARIANCE)
+    assert np.mean((windowed > 0) == (full > 0)) > 0.95
+
+
+def peak_allocation(code, length):
+    _, systematic, parity, apriori = channel_values(7, 2, length, NOISE_VARIANCE)
+    code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE)
+    tracemalloc.start()
+    code.decode_bcjr_batch(systematic, parity, apriori, NOISE_VARIANCE)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def test_window_memory_does_not_grow_with_frame_length(code):
+    code.set_sliding_window(64, 32)
+    # Only the (frames, length, 4) branch metrics and the (frames, length) LLRs scale with the frame
+    frame_sized = 2 * (4 + 1) * np.dtype(np.float64).itemsize
+    short, long = peak_allocation(code, 1000), peak_allocation(code, 4000)
+    assert long - 4000 * frame_sized <= short - 1000 * frame_sized
@@ -0,0 +1,24 @@
+"""BER simulation sanity: decoding beats the uncoded hard decisions at high Eb/N0."""
+import pytest
+
+import ber_simulation
+from ber_simulation import ALL_ALGORITHMS, CHANNEL_AWGN, CHANNEL_BSC, CODING_GAIN_MIN_EBN0
+
+
+@pytest.mark.parametrize("channel", [CHANNEL_AWGN, CHANNEL_BSC])
+def test_coded_ber_is_below_uncoded_ber(channel):
+    ebn0_values = [CODING_GAIN_MIN_EBN0, CODING_GAIN_MIN_EBN0 + 2.0]
+    rows = ber_simulation.simulate(ebn0_values, ALL_ALGORITHMS, channel, workers=1, batch_size=8,
+                                   target_frame_errors=1000, max_frames=8, seed=21, max_iterations=8)
+    assert len(rows) == len(ebn0_values) * len(ALL_ALGORITHMS)
+    for row in rows:
+        assert row["uncoded_bit_errors"] > 0
+        assert row["ber"] < row["uncoded_ber"], row
+    assert not ber_simulation.coding_gain_failures(rows)
+
+
+def test_coding_gain_failures_flags_rows_at_high_snr_only():
+    row = {"algorithm": "BCJR", "ebn0_db": CODING_GAIN_MIN_EBN0, "bit_errors": 10, "uncoded_bit_errors": 10}
+    low_snr = dict(row, ebn0_db=CODING_GAIN_MIN_EBN0 - 1.0)
+    gain = dict(row, bit_errors=2)
+    assert ber_simulation.coding_gain_failures([row, low_snr, gain]) == [row]
@@ -0,0 +1,48 @@
+"""Streaming decode over frames of varying length."""
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import turbo_codec_native
+from turbo_codec import TurboCodec
+
+NOISE_VARIANCE = 0.5
+
+
+def encoded_frames(codec, lengths):
+    rng = np.random.default_rng(16)
+    return [codec.encode(rng.integers(0, 256, length).astype(np.uint8).tobytes().decode("latin-1"))
+            for length in lengths]
+
+
+def test_stream_matches_batch_decode():
+    codec = TurboCodec()
+    frames = encoded_frames(codec, [8, 12, 8, 20, 12])
+    expected = [codec.decode_batch([frame], NOISE_VARIANCE, "BCJR") for frame in frames]
+    streamed = list(codec.decode_stream(frames, NOISE_VARIANCE, "BCJR"))
+    assert streamed == [(outputs[0], iterations[0]) for outputs, iterations in expected]
+
+
+def test_stream_memory_does_not_grow_with_frame_lengths():
+    codec = TurboCodec()
+    frames = encoded_frames(codec, [64] + list(range(4, 16)))
+    tracemalloc.start()
+    stream = codec.decode_stream(frames, NOISE_VARIANCE, "BCJR")
+    next(stream)
+    after_long_frame = tracemalloc.get_traced_memory()[0]
+    # Measured while the stream is live: its workspaces only hold arrays of the current (short) frame
+    after_short_frames = [tracemalloc.get_traced_memory()[0] for _ in stream]
+    tracemalloc.stop()
+    assert max(after_short_frames) < after_long_frame
+
+
+def test_native_stream_reuses_one_buffer_across_lengths():
+    try:
+        native = turbo_codec_native.TurboCodec()
+    except OSError:
+        pytest.skip("the C++ TurboCodec library is not built (see turbo_codec_native)")
+    frames = encoded_frames(TurboCodec(), [20, 8, 12, 8])
+    expected = [native.decode_batch([frame], NOISE_VARIANCE, "BCJR") for frame in frames]
+    streamed = list(native.decode_stream(frames, NOISE_VARIANCE, "BCJR"))
+    assert streamed == [(outputs[0], iterations[0]) for outputs, iterations in expected]
@@ -0,0 +1,57 @@
+"""Fixed-point BCJR: bounded loss against float64, and the same LLRs in Python and C++."""
+import numpy as np
+import pytest
+
+import turbo_codec_native
+from conftest import channel_values
+from turbo_codec import PRECISION_FIXED, TurboCodec, bytes_to_bits, string_to_binary
+
+# Largest accepted loss of fixed16 against float64 decoding
+MAX_BER_RATIO = 1.25  # fixed BER <= ratio * float BER + MAX_BER_OFFSET
+MAX_BER_OFFSET = 1e-3
+MAX_FER_LOSS = 0.05  # fixed FER <= float FER + loss
+
+
+def error_rates(codec, llrs, messages):
+    decoded = np.array([string_to_binary(output) for output in codec.decode_llr_batch(llrs, "BCJR")[0]])
+    errors = decoded != bytes_to_bits(messages)
+    return np.mean(errors), np.mean(np.any(errors, axis=1))
+
+
+@pytest.mark.parametrize("eb_n0", [3.0, 4.0])
+def test_fixed_point_loss_is_bounded(eb_n0):
+    rng = np.random.default_rng(8)
+    codec = TurboCodec()
+    codec.max_iterations = 8
+    messages = rng.integers(0, 256, (100, 16)).astype(np.uint8)
+    encoded = np.array([bytes_to_bits(codec.encode_packed(message))[:16 * 8 * 3] for message in messages])
+    noise_variance = 1.0 / (2.0 * (1.0 / 3.0) * 10.0 ** (eb_n0 / 10.0))
+    received = 2.0 * encoded - 1.0 + rng.normal(0.0, np.sqrt(noise_variance), encoded.shape)
+    llrs = received / noise_variance
+
+    float_ber, float_fer = error_rates(codec, llrs, messages)
+    codec.set_precision(PRECISION_FIXED)
+    fixed_ber, fixed_fer = error_rates(codec, llrs, messages)
+    assert fixed_ber <= MAX_BER_RATIO * float_ber + MAX_BER_OFFSET
+    assert fixed_fer <= float_fer + MAX_FER_LOSS
+
+
+@pytest.fixture
+def native_codec():
+    try:
+        codec = turbo_codec_native.TurboCodec()
+    except OSError:
+        pytest.skip("the C++ TurboCodec library is not built (see turbo_codec_native)")
+    codec.set_precision(PRECISION_FIXED)
+    return codec
+
+
+@pytest.mark.parametrize("noise_variance", [0.3, 0.8, 2.0])
+def test_python_and_cpp_fixed_point_agree(code, native_codec, noise_variance):
+    _, systematic, parity, apriori = channel_values(9, 4, 200, noise_variance)
+    apriori *= 8.0  # Large a-priori values saturate the int8 quantizer
+    code.set_precision(PRECISION_FIXED)
+    expected = code.decode_bcjr_batch(systematic, parity, apriori, noise_variance)
+    for frame in range(4):
+        llrs = native_codec.decode_constituent(systematic[frame], parity[frame], apriori[frame], noise_variance, "BCJR")
+        np.testing.assert_array_equal(llrs, expected[frame])
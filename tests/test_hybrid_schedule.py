@@ -0,0 +1,30 @@
+"""Both codecs schedule HYBRID the same way by default."""
+import numpy as np
+import pytest
+
+import turbo_codec_native
+from turbo_codec import HYBRID_ADAPTIVE, TurboCodec, bytes_to_bits
+
+
+def noisy_llr_frames(codec, ebn0_db):
+    rng = np.random.default_rng(25)
+    messages = rng.integers(0, 256, (12, 24)).astype(np.uint8)
+    encoded = np.array([bytes_to_bits(codec.encode_packed(message)) for message in messages])
+    noise_variance = 1.0 / (2.0 * (1.0 / 3.0) * 10.0 ** (ebn0_db / 10.0))
+    llrs = (2.0 * encoded - 1.0 + rng.normal(0.0, np.sqrt(noise_variance), encoded.shape)) / noise_variance
+    return llrs.astype(np.float32).astype(np.float64)  # The values the native binding passes on
+
+
+def test_python_default_is_adaptive():
+    assert TurboCodec().hybrid_schedule == HYBRID_ADAPTIVE
+
+
+@pytest.mark.parametrize("ebn0_db", [2.0, 4.0])
+def test_native_default_schedule_matches_python(ebn0_db):
+    try:
+        native = turbo_codec_native.TurboCodec()
+    except OSError:
+        pytest.skip("the C++ TurboCodec library is not built (see turbo_codec_native)")
+    codec = TurboCodec()
+    llrs = noisy_llr_frames(codec, ebn0_db)
+    assert native.decode_llr_batch(llrs, "HYBRID") == codec.decode_llr_batch(llrs, "HYBRID")
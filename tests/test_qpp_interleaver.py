@@ -0,0 +1,66 @@
+"""QPP interleaver: valid coefficients, and decoding without an interleaver table."""
+import numpy as np
+import pytest
+
+import turbo_codec_native
+from turbo_codec import INTERLEAVER_QPP, TurboCodec, bytes_to_bits, get_interleaver, qpp_coefficients, qpp_index
+
+
+@pytest.mark.parametrize("length", [24, 40, 520, 1584])
+def test_qpp_is_a_quadratic_permutation(length):
+    f1, f2 = qpp_coefficients(length)
+    assert 0 < f2 < length
+    positions = qpp_index(np.arange(length), length, f1, f2)
+    assert sorted(positions.tolist()) == list(range(length))
+
+
+@pytest.mark.parametrize("length", [30, 210, 2310])
+def test_squarefree_lengths_are_rejected(length):
+    with pytest.raises(ValueError):
+        qpp_coefficients(length)
+
+
+def noisy_llr_frames(codec):
+    rng = np.random.default_rng(12)
+    messages = rng.integers(0, 256, (8, 20)).astype(np.uint8)
+    encoded = np.array([bytes_to_bits(codec.encode_packed(message)) for message in messages])
+    noise_variance = 1.0 / (2.0 * (1.0 / 3.0) * 10.0 ** 0.3)  # Eb/N0 = 3 dB
+    llrs = (2.0 * encoded - 1.0 + rng.normal(0.0, np.sqrt(noise_variance), encoded.shape)) / noise_variance
+    return messages, llrs.astype(np.float32).astype(np.float64)  # The values the native binding passes on
+
+
+def qpp_codec():
+    codec = TurboCodec()
+    codec.set_interleaver(INTERLEAVER_QPP)
+    return codec
+
+
+def test_qpp_decode_builds_no_interleaver_table():
+    codec = qpp_codec()
+    messages = np.random.default_rng(12).integers(0, 256, (8, 20)).astype(np.uint8)
+    llrs = 4.0 * np.array([bytes_to_bits(codec.encode_packed(message)) for message in messages]) - 2.0
+    get_interleaver.cache_clear()
+    outputs, _ = codec.decode_llr_batch(llrs, "BCJR")
+    assert get_interleaver.cache_info().currsize == 0
+    assert outputs == [message.tobytes().decode("latin-1") for message in messages]
+
+
+def test_qpp_decode_rejects_squarefree_lengths():
+    with pytest.raises(ValueError):
+        qpp_codec().decode_llr_batch(np.ones((1, 3 * 30)), "BCJR")
+
+
+def test_native_qpp_matches_python():
+    try:
+        native = turbo_codec_native.TurboCodec()
+    except OSError:
+        pytest.skip("the C++ TurboCodec library is not built (see turbo_codec_native)")
+    native.set_interleaver(INTERLEAVER_QPP)
+    codec = qpp_codec()
+    messages, llrs = noisy_llr_frames(codec)
+    for message in messages:
+        np.testing.assert_array_equal(native.encode_packed(message), codec.encode_packed(message))
+    for algorithm in ("BCJR", "SOVA"):
+        assert native.decode_llr_batch(llrs, algorithm) == codec.decode_llr_batch(llrs, algorithm)
+    with pytest.raises(ValueError):
+        native.decode_llr_batch(np.ones((1, 3 * 30)), "BCJR")
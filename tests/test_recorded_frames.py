@@ -0,0 +1,59 @@
+"""The recorded Turbo_Codes_Data.csv log decodes to the committed clean payloads."""
+import os
+
+import pytest
+
+import turbo_codec_native
+from frame_csv import read_frames
+from turbo_codec import TurboCodec, frames_to_bits
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRAMES = 8  # Recorded frames decoded by the tests
+NOISE_VARIANCE = 0.5  # That of the decoding CLIs
+
+
+def recorded_frames():
+    frames = []
+    for packet_id, frame in read_frames(os.path.join(ROOT, "Turbo_Codes_Data.csv")):
+        frames.append((packet_id, frame))
+        if len(frames) == FRAMES:
+            return frames
+    return frames
+
+
+def clean_payloads(algorithm):
+    """Returns the payload of every packet id in the committed <ALGORITHM>_Output_clean.csv."""
+    payloads = {}
+    with open(os.path.join(ROOT, f"{algorithm}_Output_clean.csv"), encoding="latin-1") as clean_file:
+        for line in clean_file:
+            packet_id, payload = line.rstrip("\n").split(",", 1)
+            payloads.setdefault(packet_id, payload)
+    return payloads
+
+
+def test_recorded_parity_is_mismatched():
+    codec = TurboCodec()
+    for _, frame in recorded_frames():
+        received = 2.0 * frames_to_bits([frame[:len(frame) // 3 * 3]]) - 1.0
+        assert codec.mismatched_frames(received).all()
+
+
+@pytest.mark.parametrize("algorithm", ["BCJR", "MAP", "SOVA", "HYBRID"])
+def test_recorded_frames_decode_to_clean_payloads(algorithm):
+    frames = recorded_frames()
+    payloads = clean_payloads(algorithm)
+    codec = TurboCodec()
+    decoded = [codec.decode(frame, NOISE_VARIANCE, algorithm) for _, frame in frames]
+    assert decoded == [payloads[packet_id] for packet_id, _ in frames]
+
+
+@pytest.mark.parametrize("algorithm", ["BCJR", "SOVA", "HYBRID"])
+def test_native_recorded_frames_decode_to_clean_payloads(algorithm):
+    try:
+        native = turbo_codec_native.TurboCodec()
+    except OSError:
+        pytest.skip("the C++ TurboCodec library is not built (see turbo_codec_native)")
+    frames = recorded_frames()
+    payloads = clean_payloads(algorithm)
+    decoded = [native.decode(frame, NOISE_VARIANCE, algorithm) for _, frame in frames]
+    assert decoded == [payloads[packet_id] for packet_id, _ in frames]
@@ -0,0 +1,373 @@
+# turbo_codec_native.py
+"""In-process binding to the C++ TurboCodec shared library.
+
+Build the library next to this module with:
+
+    g++ -O2 -std=c++17 -shared -fPIC -o libturbocodec.so TurboCodec.cpp
+
+(libturbocodec.dylib on macOS, turbocodec.dll on Windows), or point the
+TURBO_CODEC_LIB environment variable at it.
+
+The native TurboCodec supports the encoding, decoding and settings methods of
+turbo_codec.TurboCodec: encode, encode_packed, decode, decode_batch, decode_stream,
+decode_llr, decode_llr_batch, decode_packed, decode_packed_batch and the set_*
+methods. set_decode_cache is the exception: the C++ codec has its own file-based
+decode cache (Csv_Reader_Writer --cache), so a Python cache raises NotImplementedError.
+decode_constituent runs one constituent decoder, for comparisons with
+turbo_codec.ConvolutionalCode.
+"""
+import ctypes
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from turbo_codec import (HYBRID_ADAPTIVE, HYBRID_FIXED, INTERLEAVER_QPP, INTERLEAVER_RANDOM, PRECISION_FIXED,
+                         PRECISION_FLOAT, STOP_CRC, STOP_HDA, STOP_SCR, STOP_THRESHOLD, bits_to_bytes, bytes_to_bits)
+
+ERROR_BUFFER_TOO_SMALL = -1
+ERROR_UNSUPPORTED_ALGORITHM = -2
+ERROR_NO_TRACE = -3
+ERROR_UNSUPPORTED_LENGTH = -4  # The QPP interleaver has no permutation of the frame length
+
+# Status values of TurboCodec_getLastTrace
+TRACE_CONVERGED = 1
+TRACE_CACHED = 2
+
+# StoppingCriterion flags of the C++ codec
+STOPPING_CRITERION_FLAGS = {STOP_THRESHOLD: 1, STOP_HDA: 2, STOP_SCR: 4, STOP_CRC: 8}
+
+# Precision values of the C++ codec
+PRECISION_VALUES = {PRECISION_FLOAT: 0, PRECISION_FIXED: 1}
+
+# InterleaverType values of the C++ codec
+INTERLEAVER_VALUES = {INTERLEAVER_RANDOM: 0, INTERLEAVER_QPP: 1}
+
+# HybridSchedule values of the C++ codec
+HYBRID_SCHEDULE_VALUES = {HYBRID_FIXED: 0, HYBRID_ADAPTIVE: 1}
+
+PAYLOAD_VALIDATOR = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_char), ctypes.c_size_t)
+
+
+def _library_path() -> str:
+    """Returns the path of the shared library for the current platform."""
+    if os.environ.get("TURBO_CODEC_LIB"):
+        return os.environ["TURBO_CODEC_LIB"]
+    if sys.platform.startswith("win"):
+        name = "turbocodec.dll"
+    elif sys.platform.startswith("darwin"):
+        name = "libturbocodec.dylib"
+    else:
+        name = "libturbocodec.so"
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+
+def load_library(path: str = None) -> ctypes.CDLL:
+    """Loads the TurboCodec shared library and declares its C signatures."""
+    lib = ctypes.CDLL(path or _library_path())
+    lib.TurboCodec_new.restype = ctypes.c_void_p
+    lib.TurboCodec_new.argtypes = []
+    lib.TurboCodec_delete.restype = None
+    lib.TurboCodec_delete.argtypes = [ctypes.c_void_p]
+    lib.TurboCodec_encode.restype = ctypes.c_int64
+    lib.TurboCodec_encode.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t,
+                                      ctypes.c_char_p, ctypes.c_size_t]
+    lib.TurboCodec_decode.restype = ctypes.c_int64
+    lib.TurboCodec_decode.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t,
+                                      ctypes.c_char_p, ctypes.c_size_t, ctypes.c_double, ctypes.c_char_p]
+    lib.TurboCodec_decodeLLR.restype = ctypes.c_int64
+    lib.TurboCodec_decodeLLR.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_float), ctypes.c_size_t,
+                                         ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p]
+    lib.TurboCodec_decodeConstituent.restype = ctypes.c_int64
+    lib.TurboCodec_decodeConstituent.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_double),
+                                                 ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double),
+                                                 ctypes.c_size_t, ctypes.c_double, ctypes.c_char_p,
+                                                 ctypes.POINTER(ctypes.c_double)]
+    lib.TurboCodec_setMaxIterations.restype = None
+    lib.TurboCodec_setMaxIterations.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TurboCodec_setConvergenceThreshold.restype = None
+    lib.TurboCodec_setConvergenceThreshold.argtypes = [ctypes.c_void_p, ctypes.c_double]
+    lib.TurboCodec_setStoppingCriteria.restype = None
+    lib.TurboCodec_setStoppingCriteria.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_double]
+    lib.TurboCodec_setPayloadValidator.restype = None
+    lib.TurboCodec_setPayloadValidator.argtypes = [ctypes.c_void_p, PAYLOAD_VALIDATOR]
+    lib.TurboCodec_setSlidingWindow.restype = None
+    lib.TurboCodec_setSlidingWindow.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_size_t]
+    lib.TurboCodec_setPrecision.restype = None
+    lib.TurboCodec_setPrecision.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TurboCodec_setInterleaver.restype = None
+    lib.TurboCodec_setInterleaver.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TurboCodec_setSubBlocks.restype = None
+    lib.TurboCodec_setSubBlocks.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    lib.TurboCodec_setRadix.restype = None
+    lib.TurboCodec_setRadix.argtypes = [ctypes.c_void_p, ctypes.c_uint]
+    lib.TurboCodec_setSovaDepth.restype = None
+    lib.TurboCodec_setSovaDepth.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    lib.TurboCodec_getLastIterations.restype = ctypes.c_int
+    lib.TurboCodec_getLastIterations.argtypes = [ctypes.c_void_p]
+    lib.TurboCodec_setTracing.restype = None
+    lib.TurboCodec_setTracing.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TurboCodec_setAdaptiveNoise.restype = None
+    lib.TurboCodec_setAdaptiveNoise.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TurboCodec_setHybridSchedule.restype = None
+    lib.TurboCodec_setHybridSchedule.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.TurboCodec_getLastTrace.restype = ctypes.c_int64
+    lib.TurboCodec_getLastTrace.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_double),
+                                            ctypes.POINTER(ctypes.c_double), ctypes.c_size_t,
+                                            ctypes.POINTER(ctypes.c_int)]
+    return lib
+
+
+_lib = None
+
+
+def _get_library() -> ctypes.CDLL:
+    global _lib
+    if _lib is None:
+        _lib = load_library()
+    return _lib
+
+
+# TurboCodec class
+class TurboCodec:
+    """Native TurboCodec with the interface of turbo_codec.TurboCodec, except set_decode_cache (see above)."""
+
+    def __init__(self):
+        self._lib = _get_library()
+        self._handle = self._lib.TurboCodec_new()
+        self.max_iterations = 20
+        self.convergence_threshold = 0.001
+        self._payload_validator = None  # Keeps the ctypes callback alive
+        self.trace_sink: Optional[Callable[[Dict[str, object]], None]] = None
+        self.traced_frames = 0
+
+    def __del__(self):
+        if getattr(self, "_handle", None):
+            self._lib.TurboCodec_delete(self._handle)
+            self._handle = None
+
+    def encode(self, input_str: str) -> str:
+        """Encodes an input string into a turbo-encoded string."""
+        data = input_str.encode("latin-1")
+        output = ctypes.create_string_buffer(len(data) * 24)
+        written = self._lib.TurboCodec_encode(self._handle, data, len(data), output, len(output))
+        if written == ERROR_UNSUPPORTED_LENGTH:
+            raise ValueError("The QPP interleaver needs a frame length with a repeated prime factor.")
+        if written < 0:
+            raise RuntimeError(f"TurboCodec_encode failed with error {written}.")
+        return output.raw[:written].decode("ascii")
+
+    def encode_packed(self, data) -> np.ndarray:
+        """Turbo-encodes bytes (or a uint8 array) into a bit-packed uint8 frame (see turbo_codec.TurboCodec.encode_packed)."""
+        data = np.asarray(np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray, memoryview))
+                          else data, dtype=np.uint8)
+        encoded = self.encode(data.tobytes().decode("latin-1"))
+        return bits_to_bytes(np.frombuffer(encoded.encode("ascii"), dtype=np.uint8) - ord("0"))
+
+    def _decode(self, input_str: str, noise_variance: float, algorithm: str,
+                output: Optional[ctypes.Array] = None) -> Tuple[str, int]:
+        data = input_str.encode("ascii")
+        if output is None:
+            output = ctypes.create_string_buffer((len(data) // 3 + 7) // 8)
+        written = self._lib.TurboCodec_decode(self._handle, data, len(data), output, len(output),
+                                              noise_variance, algorithm.encode("ascii"))
+        if written == ERROR_UNSUPPORTED_ALGORITHM:
+            raise ValueError("Unsupported algorithm.")
+        if written == ERROR_UNSUPPORTED_LENGTH:
+            raise ValueError("The QPP interleaver needs a frame length with a repeated prime factor.")
+        if written < 0:
+            raise RuntimeError(f"TurboCodec_decode failed with error {written}.")
+        iterations = self._lib.TurboCodec_getLastIterations(self._handle)
+        if self.trace_sink is not None:
+            self._emit_trace(algorithm, len(data) // 3, iterations)
+        return output.raw[:written].decode("latin-1"), iterations
+
+    def _emit_trace(self, algorithm: str, symbols: int, iterations: int):
+        """Passes the trace of the last decoded frame to the trace sink (see decode_trace)."""
+        capacity = max(2 * self.max_iterations, 1)
+        seconds = (ctypes.c_double * capacity)()
+        peaks = (ctypes.c_double * capacity)()
+        status = ctypes.c_int()
+        count = self._lib.TurboCodec_getLastTrace(self._handle, seconds, peaks, capacity, ctypes.byref(status))
+        if count < 0:
+            raise RuntimeError(f"TurboCodec_getLastTrace failed with error {count}.")
+        self.trace_sink({"frame": self.traced_frames, "algorithm": algorithm, "symbols": symbols,
+                         "iterations": iterations, "converged": status.value == TRACE_CONVERGED,
+                         "cached": status.value == TRACE_CACHED, "seconds": sum(seconds[:count]),
+                         "half_iteration_seconds": seconds[:count], "max_abs_llr": peaks[:count]})
+        self.traced_frames += 1
+
+    def decode_batch(self, frames, noise_variance: float, algorithm: str) -> Tuple[List[str], List[int]]:
+        """Decodes a batch of turbo-encoded strings, returning the outputs and iteration counts."""
+        outputs, iterations = [], []
+        for frame in frames:
+            decoded, frame_iterations = self._decode(frame, noise_variance, algorithm)
+            outputs.append(decoded)
+            iterations.append(frame_iterations)
+        return outputs, iterations
+
+    def decode_stream(self, frames: Iterable[str], noise_variance: float, algorithm: str) -> Iterator[Tuple[str, int]]:
+        """Decodes turbo-encoded frames one at a time, yielding (decoded string, iterations).
+
+        One output buffer is reused, grown whenever a frame needs more room than it has.
+        """
+        buffer = ctypes.create_string_buffer(0)
+        for frame in frames:
+            size = (len(frame) // 3 + 7) // 8
+            if size > len(buffer):
+                buffer = ctypes.create_string_buffer(size)
+            yield self._decode(frame, noise_variance, algorithm, buffer)
+
+    def decode_llr_batch(self, llrs, algorithm: str) -> Tuple[List[str], List[int]]:
+        """Decodes an N x L array of soft channel LLRs (see turbo_codec.TurboCodec.decode_llr_batch)."""
+        outputs, iterations = [], []
+        for frame in np.atleast_2d(np.asarray(llrs, dtype=np.float32)):
+            frame = np.ascontiguousarray(frame)
+            output = ctypes.create_string_buffer((len(frame) // 3 + 7) // 8)
+            written = self._lib.TurboCodec_decodeLLR(self._handle, frame.ctypes.data_as(ctypes.POINTER(ctypes.c_float)),
+                                                     len(frame), output, len(output), algorithm.encode("ascii"))
+            if written == ERROR_UNSUPPORTED_ALGORITHM:
+                raise ValueError("Unsupported algorithm.")
+            if written == ERROR_UNSUPPORTED_LENGTH:
+                raise ValueError("The QPP interleaver needs a frame length with a repeated prime factor.")
+            if written < 0:
+                raise RuntimeError(f"TurboCodec_decodeLLR failed with error {written}.")
+            outputs.append(output.raw[:written].decode("latin-1"))
+            iterations.append(self._lib.TurboCodec_getLastIterations(self._handle))
+            if self.trace_sink is not None:
+                self._emit_trace(algorithm, len(frame) // 3, iterations[-1])
+        return outputs, iterations
+
+    def decode_llr(self, llrs, algorithm: str) -> str:
+        """Decodes one frame of soft channel LLRs."""
+        return self.decode_llr_batch(llrs, algorithm)[0][0]
+
+    def decode_constituent(self, systematic, parity, extrinsic, noise_variance: float, algorithm: str) -> np.ndarray:
+        """Runs the constituent decoder of the first encoder once on a frame, with the current settings.
+
+        Returns its a-posteriori LLRs, like the ConvolutionalCode decoders of turbo_codec
+        ("BCJR", "MAP", "LOGMAP" or "SOVA").
+        """
+        values = [np.ascontiguousarray(np.asarray(array, dtype=np.float64).reshape(-1))
+                  for array in (systematic, parity, extrinsic)]
+        length = len(values[0])
+        if any(len(array) != length for array in values):
+            raise ValueError("The systematic, parity and extrinsic values must have the same length.")
+        llrs = np.empty(length, dtype=np.float64)
+        pointer = ctypes.POINTER(ctypes.c_double)
+        written = self._lib.TurboCodec_decodeConstituent(self._handle, *(array.ctypes.data_as(pointer) for array in values),
+                                                         length, noise_variance, algorithm.encode("ascii"),
+                                                         llrs.ctypes.data_as(pointer))
+        if written == ERROR_UNSUPPORTED_ALGORITHM:
+            raise ValueError("Unsupported algorithm.")
+        if written < 0:
+            raise RuntimeError(f"TurboCodec_decodeConstituent failed with error {written}.")
+        return llrs
+
+    def decode_packed_batch(self, frames: np.ndarray, noise_variance: float, algorithm: str,
+                            num_bits: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Decodes an N x B array of bit-packed frames (see turbo_codec.TurboCodec.decode_packed_batch)."""
+        bits = bytes_to_bits(np.atleast_2d(np.asarray(frames, dtype=np.uint8)))
+        if num_bits is not None:
+            bits = bits[:, :num_bits]
+        payload_bits = bits.shape[1] // 3
+        decoded = np.zeros((len(bits), (payload_bits + 7) // 8), dtype=np.uint8)
+        iterations = np.zeros(len(bits), dtype=np.int64)
+        for i, row in enumerate(bits):
+            text, iterations[i] = self._decode((row + ord("0")).tobytes().decode("ascii"), noise_variance, algorithm)
+            decoded[i] = np.frombuffer(text.encode("latin-1"), dtype=np.uint8)
+        if payload_bits % 8:
+            # The C++ codec keeps a trailing partial byte right-aligned; packed payloads are zero-padded on the right
+            decoded[:, -1] <<= 8 - payload_bits % 8
+        return decoded, iterations
+
+    def decode_packed(self, frame, noise_variance: float, algorithm: str, num_bits: Optional[int] = None) -> bytes:
+        """Decodes one bit-packed frame (bytes or uint8 array) into the payload bytes."""
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            frame = np.frombuffer(frame, dtype=np.uint8)
+        decoded, _ = self.decode_packed_batch(frame, noise_variance, algorithm, num_bits)
+        return decoded[0].tobytes()
+
+    def decode(self, input_str: str, noise_variance: float, algorithm: str) -> str:
+        """Decodes a turbo-encoded string using the specified algorithm."""
+        return self._decode(input_str, noise_variance, algorithm)[0]
+
+    def set_decode_cache(self, cache):
+        """Accepts only None: the C++ codec has its own decode cache, used through Csv_Reader_Writer --cache."""
+        if cache is not None:
+            raise NotImplementedError("The native TurboCodec cannot use a Python decode cache; use "
+                                      "Csv_Reader_Writer --cache or turbo_codec.TurboCodec instead.")
+
+    def set_max_iterations(self, iterations: int):
+        """Sets the maximum number of decoding iterations."""
+        self.max_iterations = iterations
+        self._lib.TurboCodec_setMaxIterations(self._handle, iterations)
+
+    def set_convergence_threshold(self, threshold: float):
+        """Sets the convergence threshold for decoding."""
+        self.convergence_threshold = threshold
+        self._lib.TurboCodec_setConvergenceThreshold(self._handle, threshold)
+
+    def set_sliding_window(self, window_size: int, warmup_length: int = 32):
+        """Enables sliding-window BCJR decoding in both constituent decoders."""
+        self._lib.TurboCodec_setSlidingWindow(self._handle, window_size, warmup_length)
+
+    def set_precision(self, precision: str):
+        """Selects float64 or fixed-point BCJR/MAP decoding in both constituent decoders."""
+        if precision not in PRECISION_VALUES:
+            raise ValueError(f"Unsupported precision: {precision}")
+        self._lib.TurboCodec_setPrecision(self._handle, PRECISION_VALUES[precision])
+
+    def set_radix(self, radix: int):
+        """Selects radix-2 or radix-4 BCJR/MAP recursions in both constituent decoders."""
+        if radix not in (2, 4):
+            raise ValueError(f"Unsupported radix: {radix}")
+        self._lib.TurboCodec_setRadix(self._handle, radix)
+
+    def set_sova_depth(self, depth: int):
+        """Sets the SOVA register-exchange depth of both constituent decoders."""
+        if depth < 1:
+            raise ValueError("The SOVA depth must be positive.")
+        self._lib.TurboCodec_setSovaDepth(self._handle, depth)
+
+    def set_sub_blocks(self, sub_blocks: int):
+        """Enables parallel sub-block BCJR/MAP decoding of each frame in both constituent decoders."""
+        self._lib.TurboCodec_setSubBlocks(self._handle, sub_blocks)
+
+    def set_interleaver(self, interleaver_type: str):
+        """Selects the interleaver of the second encoder (INTERLEAVER_RANDOM or INTERLEAVER_QPP)."""
+        if interleaver_type not in INTERLEAVER_VALUES:
+            raise ValueError(f"Unsupported interleaver: {interleaver_type}")
+        self._lib.TurboCodec_setInterleaver(self._handle, INTERLEAVER_VALUES[interleaver_type])
+
+    def set_trace_sink(self, sink: Optional[Callable[[Dict[str, object]], None]]):
+        """Passes a trace record of every decoded frame to `sink` (see turbo_codec.TurboCodec.set_trace_sink)."""
+        self.trace_sink = sink
+        self.traced_frames = 0
+        self._lib.TurboCodec_setTracing(self._handle, int(sink is not None))
+
+    def set_adaptive_noise(self, enabled: bool):
+        """Estimates the noise variance and iteration budget of every frame (see turbo_codec.TurboCodec.estimate_channel)."""
+        self._lib.TurboCodec_setAdaptiveNoise(self._handle, int(enabled))
+
+    def set_hybrid_schedule(self, schedule: str):
+        """Selects when HYBRID switches between MAP and SOVA (see turbo_codec.TurboCodec.set_hybrid_schedule)."""
+        if schedule not in HYBRID_SCHEDULE_VALUES:
+            raise ValueError(f"Unsupported HYBRID schedule: {schedule}")
+        self._lib.TurboCodec_setHybridSchedule(self._handle, HYBRID_SCHEDULE_VALUES[schedule])
+
+    def set_stopping_criteria(self, criteria: Iterable[str], sign_change_ratio: float = 0.0,
+                              payload_validator: Optional[Callable[[str], bool]] = None):
+        """Selects the early-termination criteria; decoding stops when any of them fires."""
+        flags = 0
+        for criterion in criteria:
+            if criterion not in STOPPING_CRITERION_FLAGS:
+                raise ValueError(f"Unsupported stopping criterion: {criterion}")
+            flags |= STOPPING_CRITERION_FLAGS[criterion]
+        self._lib.TurboCodec_setStoppingCriteria(self._handle, flags, sign_change_ratio)
+        if payload_validator is not None:
+            def validate(payload, length):
+                return int(bool(payload_validator(ctypes.string_at(payload, length).decode("latin-1"))))
+            self._payload_validator = PAYLOAD_VALIDATOR(validate)
+            self._lib.TurboCodec_setPayloadValidator(self._handle, self._payload_validator)